@@ -8,10 +8,7 @@ coherence_factor = epsilon ** (-n), epsilon = 1 + (rs / r)**2, r ≈ a
 
 import numpy as np
 
-# MASTER TGU Constants
-K = 0.0881                  # Universal Informational Coupling (Matuchaki Parameter)
-N = 12                      # Coherence Exponent (Harmonic Structure)
-RS_INFORMATIONAL = 0.02391625  # Solar Coherence Radius (AU)
+from tgu.core import correction
 
 exoplanets = [
     {"name": "WASP-12b", "a": 0.0229, "e": 0.0486},
@@ -26,18 +23,13 @@ exoplanets = [
     {"name": "WASP-33b", "a": 0.0256, "e": 0.0}
 ]
 
+# Single vectorized pass over the whole catalog
+a_vals = np.array([exo["a"] for exo in exoplanets])
+e_vals = np.array([exo["e"] for exo in exoplanets])
+alpha, coherence_factor, total_correction = correction(a_vals, e_vals)
+e_a = e_vals / a_vals
+
 print("Exoplaneta           |  a (UA)  |  e       |  e/a     |  alpha   | Coherence Factor | Total Correction")
 print("---------------------|----------|----------|----------|----------|------------------|------------------")
-for exo in exoplanets:
-    a = exo["a"]
-    e = exo["e"]
-    e_a = e / a
-    alpha = 1 + K * e_a
-    
-    # MASTER TGU Coherence Factor
-    epsilon = 1.0 + (RS_INFORMATIONAL / a) ** 2
-    coherence_factor = epsilon ** (-N)
-    
-    total_correction = alpha * coherence_factor
-    
-    print(f"{exo['name']:<20} | {a:<8.4f} | {e:<8.4f} | {e_a:<8.4f} | {alpha:.6f} | {coherence_factor:.6f}         | {total_correction:.6f}")
+for i, exo in enumerate(exoplanets):
+    print(f"{exo['name']:<20} | {a_vals[i]:<8.4f} | {e_vals[i]:<8.4f} | {e_a[i]:<8.4f} | {alpha[i]:.6f} | {coherence_factor[i]:.6f}         | {total_correction[i]:.6f}")
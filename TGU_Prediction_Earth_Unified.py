@@ -4,23 +4,18 @@ Author: Henry Matuchaki (@MatuchakiSilva)
 Versão Refinada: Inclui fator de resistência à coerência para convergência com GR
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-
-# Constantes MASTER TGU
-K = 0.0881                  # Matuchaki Parameter
-N = 12                      # Expoente harmônico de coerência
-RS_INFORMATIONAL = 0.02391625  # Raio de coerência solar (AU)
+from tgu.core import N
+from tgu.render import renderizar_precessao
+from tgu.solar import precession_table
 
 # Parâmetros da Terra
 e = 0.0167                  # Excentricidade
 a = 1.000                   # Semi-eixo maior (AU)
-precessao_rg = 3.84         # Precessão GR (arcsec/século)
+tabela = precession_table(a, e)  # RG + TGU (reaproveitada do tgu.cache com TGU_CACHE_DIR)
+precessao_rg = float(tabela["gr"])  # Precessão GR (arcsec/século)
 
 # Cálculo MASTER TGU
-alpha = 1 + K * (e / a)
-epsilon = 1.0 + (RS_INFORMATIONAL / a) ** 2
-coherence_factor = epsilon ** (-N)
+alpha, coherence_factor = float(tabela["alpha"]), float(tabela["coherence_factor"])
 precessao_tgu = precessao_rg * alpha * coherence_factor
 
 print(f"Fator alpha (ganho informacional): {alpha:.6f}")
@@ -32,16 +27,9 @@ print(f"Convergência com GR: {precessao_tgu / precessao_rg * 100:.2f}%")
 labels = ['Relatividade Geral', 'TGU (Alpha sozinho)', 'TGU MASTER (Refinada)']
 valores = [precessao_rg, precessao_rg * alpha, precessao_tgu]
 
-plt.figure(figsize=(10, 6))
-plt.bar(labels, valores, color=['gray', 'lightblue', 'darkblue'])
-plt.title('Precessão do Periélio da Terra: RG vs. TGU (Alpha) vs. TGU MASTER')
-plt.ylabel('Precessão (arcsec/século)')
-plt.grid(axis='y', linestyle='--', alpha=0.7)
-
-# Linha de referência GR
-plt.axhline(precessao_rg, color='gray', linestyle='--', alpha=0.7, label='Valor RG')
-
-plt.legend()
-plt.tight_layout()
-plt.savefig("TGU_Prediction_Earth_Precession_MASTER.png")
-plt.show()
+renderizar_precessao(
+    "TGU_Prediction_Earth_Precession_MASTER.png", labels, valores,
+    titulo='Precessão do Periélio da Terra: RG vs. TGU (Alpha) vs. TGU MASTER',
+    ylabel='Precessão (arcsec/século)',
+    referencia=precessao_rg, rotulo_referencia='Valor RG',
+)
@@ -0,0 +1,23 @@
+import json
+
+from tgu import bench
+
+
+def test_quick_run_records_and_compares(tmp_path):
+    history = tmp_path / "history.jsonl"
+    baseline = tmp_path / "baseline.json"
+    argv = ["--quick", "--repeats", "1", "--only", "correction", "velocidade_tgu",
+            "--history", str(history), "--baseline", str(baseline)]
+    assert bench.main(argv) == 0                          # no baseline yet
+    assert bench.main(argv + ["--save-baseline"]) == 0
+    assert bench.main(argv + ["--tolerance", "1"]) == 0
+    entries = [json.loads(line) for line in history.read_text().splitlines()]
+    assert len(entries) == 3
+    assert set(json.loads(baseline.read_text())) == set(entries[-1]["results"])
+
+
+def test_compare_flags_regressions():
+    baseline = {"x": {"throughput_per_s": 100.0}, "y": {"throughput_per_s": 100.0}}
+    results = {"x": {"throughput_per_s": 95.0}, "y": {"throughput_per_s": 50.0},
+               "z": {"throughput_per_s": 1.0}}
+    assert [r["case"] for r in bench.compare(results, baseline, 0.10)] == ["y"]
@@ -0,0 +1,82 @@
+import os
+import time
+
+import numpy as np
+
+from tgu import cache
+from tgu.cache import CACHE_ENV, ResultCache, memoize
+
+
+def test_memoize_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    calls = []
+
+    @memoize("test.nested", ignore=("processos",))
+    def nested(x, escala=2.0, processos=None):
+        calls.append(processos)
+        return {"y": x * escala, "par": (x.sum(), [1, 2]), "percentis": {2.5: 0.1}, "forma": (3,)}
+
+    x = np.arange(3.0)
+    first = nested(x, processos=1)
+    second = nested(x, 2.0, processos=4)
+    assert len(calls) == 1
+    assert isinstance(second["y"], np.memmap)
+    np.testing.assert_array_equal(second["y"], first["y"])
+    assert second["par"] == first["par"] and second["percentis"] == {2.5: 0.1}
+    assert second["forma"] == (3,)
+    nested(x, escala=3.0)
+    assert len(calls) == 2
+
+
+def test_memoize_disabled_without_env(monkeypatch):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    calls = []
+
+    @memoize("test.off")
+    def f(x):
+        calls.append(x)
+        return x
+
+    f(1), f(1)
+    assert calls == [1, 1]
+
+
+def test_stale_temporaries(tmp_path, monkeypatch):
+    rc = ResultCache(str(tmp_path), max_bytes=10**9)
+    stale = tmp_path / ".tmp-crashed"
+    live = tmp_path / ".tmp-writing"
+    for d in (stale, live):
+        d.mkdir()
+        (d / "a.npy").write_bytes(b"x" * 1000)
+    old = time.time() - 2 * cache.STALE_TMP_S
+    os.utime(stale, (old, old))
+
+    assert rc.size() == 2000                  # in-flight writes count toward the bound
+    rc.put("ab" * 32, {"v": np.zeros(10)})   # put runs evict
+    assert not stale.exists() and live.exists()
+    assert rc.size() >= 1000 + 80
+
+
+def _entries(root):
+    return [p for p in root.glob("*/*") if p.is_dir()]
+
+
+def test_only_entry_points_are_cached(tmp_path, monkeypatch):
+    from tgu import galaxy, hercrb, sgra
+
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    sgra.calcular_precessao_sgr_a(4.1e6, np.array([1031.0, 1178.0]), np.array([0.88, 0.82]))
+    galaxy.curvas_rotacao_lote(np.linspace(0.2, 30.0, 50), [5e10, 1e10], [3.0, 2.0])
+    assert _entries(tmp_path) == []
+
+    sgra.monte_carlo_precessao(4.1e6, 1031.0, 0.8839, 0.034e6, 8.0, 0.0019,
+                               n_amostras=4000, tamanho_lote=1000, processos=1, bins=64)
+    hercrb.ensemble_campos(3, (16, 16), processos=1)
+    assert len(_entries(tmp_path)) == 2                # no per-batch or per-member entries
+
+
+def test_disabled_restores_env(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    with cache.disabled():
+        assert cache.default_cache() is None
+    assert cache.default_cache().root == str(tmp_path)
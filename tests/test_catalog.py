@@ -0,0 +1,99 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from tgu import catalog
+from tgu.core import OUTPUT_FIELDS, correction
+
+A = np.array([0.387098, 0.723332, 1.000001, 1.523679, 1.077926, 2.7675, 5.2026])
+E = np.array([0.205630, 0.006772, 0.016711, 0.093400, 0.826958, 0.0758, 0.0489])
+NAMES = ["mercury", "venus", "earth", "mars", "icarus", "ceres", "jupiter"]
+
+
+def _collect(chunks):
+    chunks = list(chunks)
+    return chunks, {c: np.concatenate([ch[c] for ch in chunks]) for c in chunks[0]}
+
+
+def _mpcorb_line(name, a, e):
+    line = [" "] * 110
+    for (start, stop), text in ((catalog.MPCORB_COLSPECS["name"], f"{name:<7}"),
+                                (catalog.MPCORB_COLSPECS["e"], f"{e:9.7f}"),
+                                (catalog.MPCORB_COLSPECS["a"], f"{a:11.7f}")):
+        line[start:stop] = text[:stop - start].rjust(stop - start)
+    return "".join(line).rstrip()
+
+
+def test_csv_chunks_names_and_blank_lines(tmp_path):
+    path = tmp_path / "cat.csv"
+    rows = [f"{n}, {float(a)!r}, {float(e)!r}\n" for n, a, e in zip(NAMES, A, E)]
+    # A blank line mid-file and a chunk holding only the trailing blank lines
+    path.write_text("name,a,e\n" + "".join(rows[:4]) + "\n" + "".join(rows[4:]) + "\n\n")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        chunks, cols = _collect(catalog.iter_csv(path, chunk_size=3, name_column="name"))
+    assert all(len(ch["a"]) <= 3 for ch in chunks)
+    np.testing.assert_array_equal(cols["a"], A)
+    np.testing.assert_array_equal(cols["e"], E)
+    assert [n.strip() for n in cols["name"]] == NAMES
+    with pytest.raises(KeyError):
+        next(catalog.iter_csv(path, columns=("a", "q")))
+
+
+def test_fixed_width_mpcorb_layout(tmp_path):
+    path = tmp_path / "MPCORB.DAT"
+    lines = ["MINOR PLANET CENTER ORBIT DATABASE", "Des'n     H     G   Epoch ...", "-" * 160]
+    lines += [_mpcorb_line(n[:7].upper(), a, e) for n, a, e in zip(NAMES, A, E)]
+    lines.insert(6, "")                                  # blank separators occur in MPCORB
+    path.write_text("\n".join(lines) + "\n")
+    _, cols = _collect(catalog.iter_fixed_width(path, chunk_size=2))
+    np.testing.assert_allclose(cols["a"], A, rtol=0, atol=1e-7)
+    np.testing.assert_allclose(cols["e"], E, rtol=0, atol=1e-7)
+    assert list(cols["name"]) == [n[:7].upper() for n in NAMES]
+
+
+def test_npy_plain_and_structured(tmp_path):
+    plain = tmp_path / "plain.npy"
+    np.save(plain, np.column_stack([A, E]))
+    structured = tmp_path / "structured.npy"
+    rec = np.zeros(A.size, dtype=[("e", "f8"), ("a", "f8"), ("i", "f8")])
+    rec["a"], rec["e"] = A, E
+    np.save(structured, rec)
+    for path in (plain, structured):
+        chunks, cols = _collect(catalog.iter_npy(path, chunk_size=4))
+        assert [len(ch["a"]) for ch in chunks] == [4, 3]
+        np.testing.assert_array_equal(cols["a"], A)
+        np.testing.assert_array_equal(cols["e"], E)
+
+
+def test_npz_columns_and_structured(tmp_path):
+    columns = tmp_path / "columns.npz"
+    np.savez_compressed(columns, a=A, e=E)
+    structured = tmp_path / "structured.npz"
+    rec = np.zeros(A.size, dtype=[("a", "f8"), ("e", "f8")])
+    rec["a"], rec["e"] = A, E
+    np.savez_compressed(structured, elements=rec)
+    for path in (columns, structured):
+        chunks, cols = _collect(catalog.iter_npz(path, chunk_size=5))
+        assert [len(ch["a"]) for ch in chunks] == [5, 2]
+        np.testing.assert_array_equal(cols["a"], A)
+        np.testing.assert_array_equal(cols["e"], E)
+
+    mismatched = tmp_path / "mismatched.npz"
+    np.savez(mismatched, a=A, e=E[:-1])
+    with pytest.raises(ValueError):
+        list(catalog.iter_npz(mismatched))
+
+
+def test_score_catalog_round_trip(tmp_path):
+    src = tmp_path / "cat.npz"
+    np.savez(src, a=A, e=E)
+    out = tmp_path / "scored.csv"
+    assert catalog.score_catalog(src, out, chunk_size=3) == A.size
+
+    with open(out, encoding="utf-8") as fh:
+        assert fh.readline().strip().split(",") == ["a", "e"] + list(OUTPUT_FIELDS)
+    scored = np.loadtxt(out, delimiter=",", skiprows=1)
+    np.testing.assert_allclose(scored[:, :2], np.column_stack([A, E]), rtol=1e-9)
+    np.testing.assert_allclose(scored[:, 2:], np.column_stack(correction(A, E)), rtol=1e-9)
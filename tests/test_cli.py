@@ -0,0 +1,72 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from tgu import cli, sgra, solar
+from tgu.core import correction
+from tgu.galaxy import curvas_rotacao_lote
+
+
+def _run(tmp_path, *argv, fmt="json"):
+    out = tmp_path / f"out.{fmt}"
+    assert cli.main([*argv, "--format", fmt, "-o", str(out)]) == 0
+    if fmt == "csv":
+        with open(out, encoding="utf-8") as fh:
+            return list(csv.DictReader(fh))
+    return json.loads(out.read_text())
+
+
+def test_planet(tmp_path):
+    rows = _run(tmp_path, "planet", "mercury", "venus")
+    ref = solar.solar_system(["mercury", "venus"])
+    assert [r["name"] for r in rows] == ["mercury", "venus"]
+    np.testing.assert_allclose([r["tgu"] for r in rows], ref["tgu"])
+    with pytest.raises(SystemExit):
+        cli.main(["planet", "pluto", "-o", str(tmp_path / "x.json")])
+
+
+def test_exoplanets_builtin_and_catalog(tmp_path):
+    rows = _run(tmp_path, "exoplanets", "--batch-size", "3", fmt="csv")
+    a = np.array([p["a"] for p in cli.EXOPLANETS])
+    e = np.array([p["e"] for p in cli.EXOPLANETS])
+    assert [r["name"] for r in rows] == [p["name"] for p in cli.EXOPLANETS]
+    np.testing.assert_allclose([float(r["total_correction"]) for r in rows], correction(a, e)[2],
+                               rtol=1e-9)
+
+    src = tmp_path / "cat.npy"
+    np.save(src, np.column_stack([a, e]))
+    rows = _run(tmp_path, "exoplanets", "--input", str(src), "--batch-size", "4")
+    np.testing.assert_array_equal([r["total_correction"] for r in rows], correction(a, e)[2])
+
+
+def test_galaxy(tmp_path):
+    rows = _run(tmp_path, "galaxy", "--M-disk", "5e10", "1e10", "--R-d", "3.0", "2.0",
+                "--points", "20", "--batch-size", "1")
+    _, _, v_tgu = curvas_rotacao_lote(np.linspace(0.2, 30.0, 20), [5e10, 1e10], [3.0, 2.0])
+    assert [r["galaxy"] for r in rows] == [0] * 20 + [1] * 20
+    np.testing.assert_allclose([r["v_tgu"] for r in rows], v_tgu.ravel(), rtol=1e-12)
+
+
+def test_hercrb(tmp_path):
+    single = _run(tmp_path, "hercrb", "--grid", "16")
+    assert single["forma"] == [16, 16] and single["gradiente_medio"] > 0
+    ensemble = _run(tmp_path, "hercrb", "--grid", "16", "--ensemble", "2", "--processes", "1")
+    assert ensemble["n_realizacoes"] == 2
+    structures = _run(tmp_path, "hercrb", "--grid", "16", "--structures", fmt="csv")
+    assert len(structures) > 0 and "massa" in structures[0]
+
+
+def test_sgra(tmp_path):
+    rows = _run(tmp_path, "sgra")
+    ref = sgra.calcular_precessao_sgr_a(4.1e6, 1031.0, 0.8839)
+    assert len(rows) == 1
+    assert rows[0]["tgu_arcmin"] == pytest.approx(float(ref["tgu_arcmin"]), rel=1e-12)
+    cluster = _run(tmp_path, "sgra", "--cluster", fmt="csv")
+    assert [r["name"] for r in cluster] == [s["nome"] for s in sgra.ESTRELAS_S]
+
+
+def test_passthrough(tmp_path):
+    assert cli.main(["precision", "--size", "1000", "--grid", "16", "--repeats", "1",
+                     "--only", "correction", "--json", str(tmp_path / "p.json")]) == 0
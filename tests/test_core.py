@@ -0,0 +1,71 @@
+"""Equivalence of the tgu kernels with the formulas of the original scripts."""
+
+import numpy as np
+import pytest
+
+from tgu.cli import EXOPLANETS
+from tgu.core import K, N, RS_INFORMATIONAL, correction, correction_scalar
+from tgu.galaxy import massa_disco_exponencial, velocidade_newtoniana, velocidade_tgu
+from tgu.sgra import calcular_precessao_sgr_a
+from tgu.solar import BODIES, gr_precession_century, precession_table
+
+# Hand-entered GR baselines of the original planet scripts, and the values
+# computed from the orbital elements since user-020 (arcsec/century)
+GR_SCRIPTS = {"mercury": 42.98, "venus": 8.6247, "earth": 3.84, "mars": 1.35, "icarus": 10.05}
+GR_COMPUTED = {"mercury": 43.017, "venus": 8.635, "earth": 3.839, "mars": 1.351, "icarus": 10.087}
+
+
+def _script_correction(a, e):
+    alpha = 1 + K * (e / a)
+    epsilon = 1.0 + (RS_INFORMATIONAL / a) ** 2
+    coherence_factor = epsilon ** (-N)
+    return alpha, coherence_factor, alpha * coherence_factor
+
+
+def test_correction_matches_scripts():
+    rows = list(BODIES.values()) + EXOPLANETS
+    a = np.array([r["a"] for r in rows])
+    e = np.array([r["e"] for r in rows])
+    for got, ref in zip(correction(a, e), _script_correction(a, e)):
+        np.testing.assert_allclose(got, ref, rtol=1e-13)
+    for r in rows:
+        np.testing.assert_allclose(correction_scalar(r["a"], r["e"]),
+                                   _script_correction(r["a"], r["e"]), rtol=1e-13)
+
+
+@pytest.mark.parametrize("name", sorted(BODIES))
+def test_gr_baselines(name):
+    a, e = BODIES[name]["a"], BODIES[name]["e"]
+    gr = gr_precession_century(a, e)
+    assert round(float(gr), 3) == GR_COMPUTED[name]
+    np.testing.assert_allclose(gr, GR_SCRIPTS[name], rtol=4e-3)
+
+    table = precession_table(a, e)
+    _, _, total = _script_correction(a, e)
+    np.testing.assert_allclose(table["tgu"], gr * total, rtol=1e-13)
+
+
+def test_sgra_matches_script():
+    G, c, M_SUN, AU = 6.67430e-11, 299792458, 1.98847e30, 1.495978707e11
+    massa, a, e = 4.1e6, 1031.0, 0.8839
+    phi_gr = (6 * np.pi * G * massa * M_SUN) / (c**2 * a * AU * (1 - e**2))
+    alpha, coherence_factor, _ = _script_correction(a, e)
+    res = calcular_precessao_sgr_a(massa, a, e)
+    to_arcmin = (180 / np.pi) * 60
+    np.testing.assert_allclose(res["gr_arcmin"], phi_gr * to_arcmin, rtol=1e-13)
+    np.testing.assert_allclose(res["tgu_arcmin"], phi_gr * alpha * coherence_factor * to_arcmin,
+                               rtol=1e-13)
+
+
+def test_galaxy_matches_script():
+    G, M_SUN, KPC = 6.67430e-11, 1.98847e30, 3.085677581e19
+    r = np.linspace(0.2, 30.0, 400)
+    M_disk, R_d = 5.0e10, 3.0
+    M_ref = M_disk * (1.0 - (1.0 + r / R_d) * np.exp(-r / R_d))
+    v_newton_ref = np.sqrt(G * M_ref * M_SUN / (r * KPC)) / 1000.0
+    v_tgu_ref = v_newton_ref * np.sqrt(1.0 + K * r / R_d)    # R_S_INFO = 0 in galaxies
+
+    M_r = massa_disco_exponencial(r, M_disk, R_d)
+    np.testing.assert_allclose(M_r, M_ref, rtol=1e-12)
+    np.testing.assert_allclose(velocidade_newtoniana(r, M_r), v_newton_ref, rtol=1e-12)
+    np.testing.assert_allclose(velocidade_tgu(r, M_r, R_d), v_tgu_ref, rtol=1e-12)
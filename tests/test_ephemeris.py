@@ -0,0 +1,28 @@
+import numpy as np
+
+from tgu import ephemeris
+from tgu.ephemeris import Ephemeris, build_ephemeris, exact_positions
+
+
+def test_fit_error_bounds_and_round_trip(tmp_path):
+    bodies = ephemeris.planet_bodies() + ephemeris.s_star_bodies()
+    eph = build_ephemeris(bodies, path=str(tmp_path / "eph"))
+    for b in eph.meta["bodies"]:
+        assert b["max_error"] <= ephemeris.TOLERANCE * b["a"]
+
+    loaded = Ephemeris.load(str(tmp_path / "eph"))
+    assert isinstance(loaded.coef, np.memmap)
+    t = np.linspace(1990.0, 2050.0, 20001)
+    for b in eph.meta["bodies"]:
+        got = np.stack(loaded.position(b["name"], t))
+        ref = np.stack(exact_positions(loaded, b["name"], t))
+        # Off the check points the error stays within a few times the fit tolerance
+        assert np.abs(got - ref).max() <= 10 * ephemeris.TOLERANCE * b["a"]
+
+
+def test_positions_match_position():
+    eph = build_ephemeris(ephemeris.planet_bodies(["mercury", "icarus"]))
+    t = np.linspace(2000.0, 2001.0, 101)
+    for name in ("mercury", "icarus"):
+        np.testing.assert_array_equal(np.stack(eph.positions(np.full(t.size, eph.index(name)), t)),
+                                      np.stack(eph.position(name, t)))
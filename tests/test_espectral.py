@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from tgu import espectral
+
+
+@pytest.mark.parametrize("forma", [(12, 10), (8, 6, 10)])
+def test_blocos_colunas_cobrem_o_espectro(forma):
+    visto = np.zeros(forma, dtype=int)
+    for orcamento in (1, 8 * 16 * 5, 10**9):
+        visto[:] = 0
+        for indice in espectral._blocos_colunas(forma, 16, orcamento):
+            assert visto[indice].nbytes // visto.itemsize * 16 <= max(orcamento, forma[0] * 16)
+            visto[indice] += 1
+        assert (visto == 1).all()
+
+
+@pytest.mark.parametrize("forma", [(16, 12), (8, 6, 10)])
+def test_fora_da_memoria_igual_em_memoria(forma, monkeypatch, tmp_path):
+    campo = np.random.default_rng(1).standard_normal(forma)
+    ref = espectral.gradiente_espectral(campo)
+    _, p_ref, _ = espectral.espectro_potencia(campo)
+    # Orçamento de poucas colunas: força blocos que cortam os dois eixos finais
+    monkeypatch.setattr(espectral, "BYTES_POR_BLOCO", forma[0] * 16 * 3)
+    grad = espectral.gradiente_espectral(campo, linhas_por_bloco=3, trabalho=str(tmp_path))
+    _, p, _ = espectral.espectro_potencia(campo, linhas_por_bloco=0)
+    np.testing.assert_allclose(grad, ref, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(p, p_ref, rtol=1e-10)
+
+
+def _campo_periodico(forma, espacamento):
+    """I = Σ sin(2π m_a x_a / L_a) on a periodic grid, and its exact |∇I|."""
+    eixos = np.meshgrid(*[np.arange(n) * espacamento for n in forma], indexing="ij")
+    campo = np.zeros(forma)
+    quadrado = np.zeros(forma)
+    for modo, (x, n) in enumerate(zip(eixos, forma), start=1):
+        k = 2 * np.pi * modo / (n * espacamento)
+        campo += np.sin(k * x)
+        quadrado += (k * np.cos(k * x)) ** 2
+    return campo, np.sqrt(quadrado)
+
+
+@pytest.mark.parametrize("forma", [(32, 24), (16, 12, 20)])
+def test_gradiente_espectral_analitico(forma, monkeypatch):
+    campo, exato = _campo_periodico(forma, 0.25)
+    np.testing.assert_allclose(espectral.gradiente_espectral(campo, 0.25), exato, atol=1e-12)
+    monkeypatch.setattr(espectral, "BYTES_POR_BLOCO", forma[0] * 16 * 2)
+    fora = espectral.gradiente_espectral(campo, 0.25, linhas_por_bloco=5)
+    np.testing.assert_allclose(fora, exato, atol=1e-12)
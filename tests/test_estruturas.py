@@ -0,0 +1,48 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from tgu import estruturas
+
+
+def _bfs(mascara):
+    """Reference labelling: face-neighbour BFS in flat-index order."""
+    rotulos = np.full(mascara.shape, -1, dtype=np.int64)
+    n = 0
+    for inicio in zip(*np.nonzero(mascara)):
+        if rotulos[inicio] >= 0:
+            continue
+        rotulos[inicio] = n
+        fila = deque([inicio])
+        while fila:
+            celula = fila.popleft()
+            for eixo in range(mascara.ndim):
+                for passo in (-1, 1):
+                    viz = list(celula)
+                    viz[eixo] += passo
+                    viz = tuple(viz)
+                    if 0 <= viz[eixo] < mascara.shape[eixo] and mascara[viz] and rotulos[viz] < 0:
+                        rotulos[viz] = n
+                        fila.append(viz)
+        n += 1
+    return rotulos, n
+
+
+@pytest.mark.parametrize("forma", [(40, 37), (12, 11, 13)])
+@pytest.mark.parametrize("densidade", [0.3, 0.55, 0.8])
+def test_union_find_matches_bfs(forma, densidade):
+    mascara = np.random.default_rng(7).random(forma) < densidade
+    rotulos, n = estruturas.rotular(mascara)
+    ref, n_ref = _bfs(mascara)
+    assert n == n_ref
+    np.testing.assert_array_equal(rotulos, ref)
+
+
+def test_blocks_match_whole_field():
+    campo = np.random.default_rng(3).random((30, 25))
+    inteiro = estruturas.extrair_estruturas(campo, limiar=0.6, linhas_por_bloco=30)
+    blocos = estruturas.extrair_estruturas(campo, limiar=0.6, linhas_por_bloco=4)
+    assert inteiro["n_estruturas"] == blocos["n_estruturas"] == _bfs(campo >= 0.6)[1]
+    for chave in inteiro:
+        np.testing.assert_allclose(blocos[chave], inteiro[chave], rtol=1e-12)
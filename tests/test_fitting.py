@@ -0,0 +1,74 @@
+import numpy as np
+
+from tgu import fitting
+from tgu.galaxy import massa_disco_exponencial, velocidade_tgu
+from tgu.massa import BojoHernquist, DiscoExponencial, ModeloMassa, PerfilTabelado
+
+R = np.linspace(0.5, 25.0, 40)
+
+
+def _curva(v, **extra):
+    return dict({"r_kpc": R, "v_obs": v, "sigma_v": 0.01 * v}, **extra)
+
+
+def test_disco_exponencial_recupera_parametros():
+    v = velocidade_tgu(R, massa_disco_exponencial(R, 4e10, 3.5), 3.5, 0.09, 12, 0.0)
+    ajuste = fitting.ajustar_galaxia(_curva(v))
+    assert ajuste["convergiu"]
+    np.testing.assert_allclose([ajuste["M_disk"], ajuste["R_d"], ajuste["k"]],
+                               [4e10, 3.5, 0.09], rtol=1e-6)
+
+
+def test_jacobiano_do_modelo_bate_com_diferencas_finitas():
+    modelo = ModeloMassa(DiscoExponencial(5e10, 3.0), BojoHernquist(1e10, 0.5))
+    theta = np.array([np.log(0.8), np.log(1.3), 0.09, 12.0])
+    v, J = fitting.modelo_massa_e_jacobiano(R, modelo, theta[:2], theta[2], theta[3], 0.5)
+    for j in range(theta.size):
+        h = 1e-6 * max(abs(theta[j]), 1.0)
+        mais, menos = theta.copy(), theta.copy()
+        mais[j] += h
+        menos[j] -= h
+        v_mais, _ = fitting.modelo_massa_e_jacobiano(R, modelo, mais[:2], mais[2], mais[3], 0.5)
+        v_menos, _ = fitting.modelo_massa_e_jacobiano(R, modelo, menos[:2], menos[2], menos[3], 0.5)
+        np.testing.assert_allclose(J[:, j], (v_mais - v_menos) / (2 * h), rtol=1e-5, atol=1e-8)
+
+
+def test_modelo_massa_e_tabela_usam_o_cache():
+    modelo = ModeloMassa(DiscoExponencial(5e10, 3.0), BojoHernquist(1e10, 0.5))
+    v = modelo.velocidade(R, k=0.09, escalas=[0.8, 1.3])
+    ajuste = fitting.ajustar_galaxia(_curva(v, modelo=modelo))
+    np.testing.assert_allclose(ajuste["escalas"] + [ajuste["k"]], [0.8, 1.3, 0.09], rtol=1e-6)
+    assert modelo.integracoes == 1
+
+    M_r = modelo.massa(R, [0.8, 1.3])
+    tabelada = fitting.ajustar_galaxia(_curva(v, M_r=M_r, R_d=3.0))
+    np.testing.assert_allclose([tabelada["escalas"][0], tabelada["k"]], [1.0, 0.09], rtol=1e-6)
+
+
+def test_k_global_com_galaxias_mistas():
+    modelo = ModeloMassa(DiscoExponencial(5e10, 3.0), BojoHernquist(1e10, 0.5))
+    galaxias = [
+        _curva(velocidade_tgu(R, massa_disco_exponencial(R, 2e10, 2.5), 2.5, 0.09, 12, 0.0)),
+        _curva(modelo.velocidade(R, k=0.09, escalas=[0.7, 1.2]), modelo=modelo),
+    ]
+    ajuste = fitting.ajustar_k_global(galaxias)
+    assert ajuste["convergiu"]
+    np.testing.assert_allclose(ajuste["k"], 0.09, rtol=1e-6)
+    np.testing.assert_allclose(ajuste["galaxias"][0]["M_disk"], 2e10, rtol=1e-6)
+    np.testing.assert_allclose(ajuste["galaxias"][1]["escalas"], [0.7, 1.2], rtol=1e-6)
+
+
+def test_k_global_com_tamanhos_diferentes_e_perfil_tabelado():
+    r_gas = np.linspace(0.1, 30.0, 300)
+    modelo = ModeloMassa(DiscoExponencial(5e10, 3.0),
+                         PerfilTabelado(r_gas, 5e7 * np.exp(-r_gas / 6.0)), R_d=3.0)
+    curto = R[:25]
+    galaxias = [
+        _curva(velocidade_tgu(R, massa_disco_exponencial(R, 2e10, 2.5), 2.5, 0.09, 12, 0.0)),
+        {"r_kpc": curto, "v_obs": modelo.velocidade(curto, k=0.09, escalas=[0.7, 1.2]),
+         "modelo": modelo},               # curva mais curta: o preenchimento não entra no perfil
+    ]
+    ajuste = fitting.ajustar_k_global(galaxias)
+    assert ajuste["convergiu"]
+    np.testing.assert_allclose(ajuste["k"], 0.09, rtol=1e-6)
+    np.testing.assert_allclose(ajuste["galaxias"][1]["escalas"], [0.7, 1.2], rtol=1e-6)
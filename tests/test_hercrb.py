@@ -0,0 +1,27 @@
+import numpy as np
+
+from tgu import hercrb
+
+
+def test_linhas_por_bloco_padrao_by_bytes():
+    assert hercrb.linhas_por_bloco_padrao((8192, 8192), np.float64) == 256
+    assert hercrb.linhas_por_bloco_padrao((512, 512, 512), np.float64) == 8
+    assert hercrb.linhas_por_bloco_padrao((512, 512, 512), np.float32) == 16
+    assert hercrb.linhas_por_bloco_padrao((4, 10**5, 10**5), np.float64) == 1
+
+
+def test_blocos_independentes_do_tamanho():
+    forma = (17, 9, 11)
+    ref = hercrb.gerar_campo_em_blocos(forma, 3)
+    for linhas in (1, 4, 17):
+        campo, grad = hercrb.gerar_campo_em_blocos(forma, 3, linhas_por_bloco=linhas)
+        np.testing.assert_array_equal(campo, ref[0])
+        np.testing.assert_array_equal(grad, ref[1])
+
+
+def test_ensemble_identico_para_qualquer_pool():
+    ref = hercrb.ensemble_campos(5, (24, 16), semente=7, processos=1)
+    for processos, chunksize in ((3, 1), (2, 2)):
+        assert hercrb.ensemble_campos(5, (24, 16), semente=7, processos=processos,
+                                      chunksize=chunksize) == ref
+    assert hercrb.ensemble_campos(5, (24, 16), semente=8, processos=1) != ref
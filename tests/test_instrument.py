@@ -0,0 +1,27 @@
+import numpy as np
+
+from tgu import instrument
+
+
+def test_elements_from_result_and_broadcast():
+    a = np.ones(5)
+    grid = np.ones((3, 5))
+    assert instrument._count_elements((a, grid), {}, grid * a) == 15
+    assert instrument._count_elements((a,), {}, (np.ones(4), np.ones(7))) == 7
+    assert instrument._count_elements((a,), {}, {"x": np.ones(2), "y": 1.0}) == 2
+    assert instrument._count_elements((np.ones((4, 1)),), {"b": np.ones(6)}, "fig.png") == 24
+    assert instrument._count_elements((np.ones(3), np.ones(4)), {}, None) == 4
+
+
+def test_wrapper_records_only_while_enabled():
+    from tgu import core
+
+    with instrument.session() as stats:
+        wrapped = core.correction
+        wrapped(np.array([0.387, 0.723]), np.array(0.2056))
+    assert stats["core.correction"]["calls"] == 1
+    assert stats["core.correction"]["elements"] == 2
+    assert core.correction is not wrapped
+
+    wrapped(np.array([0.387]), np.array([0.2]))      # stale reference after disable()
+    assert instrument.report()["core.correction"]["calls"] == 1
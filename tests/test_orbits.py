@@ -0,0 +1,18 @@
+import numpy as np
+
+from tgu import orbits
+
+
+def test_integrate_scalar_input():
+    res = orbits.integrate(0.387, 0.206, 1.0, n_orbits=4, steps_per_orbit=400)
+    assert np.ndim(res["precession_rad_per_orbit"]) == 0
+    assert res["n_perihelia"] == 4
+    batch = orbits.integrate([0.387], [0.206], [1.0], n_orbits=4, steps_per_orbit=400)
+    assert res["precession_rad_per_orbit"] == batch["precession_rad_per_orbit"][0]
+
+
+def test_integrate_broadcasts_inputs():
+    batch = orbits.integrate([[0.387], [1.0]], [0.206, 0.0167], 1.0, n_orbits=3, steps_per_orbit=300)
+    assert batch["precession_rad_per_orbit"].shape == (2, 2)
+    single = orbits.integrate(1.0, 0.0167, 1.0, n_orbits=3, steps_per_orbit=300)
+    assert batch["precession_rad_per_orbit"][1, 1] == single["precession_rad_per_orbit"]
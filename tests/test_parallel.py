@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from tgu.core import OUTPUT_FIELDS, correction
+from tgu.parallel import SharedExecutor
+from tgu.sgra import calcular_precessao_sgr_a
+
+
+def _inputs(size=200_001, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.01, 5.0, size), rng.uniform(0.0, 0.9, size)
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+def test_matches_serial_kernels(processes):
+    a, e = _inputs()
+    massa = np.full(a.size, 4.1e6)
+    with SharedExecutor(processes, block=10_000) as ex:
+        out = ex.correction(a, e)
+        pre = ex.precession(massa, a * 1000.0, e)
+    for field, ref in zip(OUTPUT_FIELDS, correction(a, e)):
+        np.testing.assert_array_equal(out[field], ref)
+    ref = calcular_precessao_sgr_a(massa, a * 1000.0, e)
+    for key, value in pre.items():
+        np.testing.assert_array_equal(value, ref[key])
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/<pid>/maps")
+def test_workers_keep_no_deleted_blocks_mapped():
+    a, e = _inputs(500_000)
+    with SharedExecutor(2) as ex:
+        for _ in range(5):
+            ex.correction(a, e)
+            ex.precession(np.full(a.size, 4.1e6), a * 1000.0, e)
+        for pid in list(ex._pool._processes):
+            with open(f"/proc/{pid}/maps") as fh:
+                stale = [line for line in fh if "psm_" in line and "(deleted)" in line]
+            assert stale == []
+    if os.path.isdir("/dev/shm"):
+        assert not [n for n in os.listdir("/dev/shm") if n.startswith("psm_")]
@@ -0,0 +1,21 @@
+import json
+
+from tgu import precision
+
+BOUND = 1e-4
+
+
+def test_float32_error_bounds():
+    rows = precision.validate(size=20000, grid=64, repeats=1, log=None)
+    assert {r["case"] for r in rows} == set(precision.CASES)
+    for r in rows:
+        assert r["max_scaled_error"] <= BOUND, r
+        if r["case"] in ("correction", "galaxy", "rotation_batch"):
+            assert r["max_rel_error"] <= BOUND, r
+
+
+def test_main_quick(tmp_path):
+    path = tmp_path / "precision.json"
+    argv = ["--size", "10000", "--grid", "32", "--repeats", "1", "--max-rel", "1", "--json", str(path)]
+    assert precision.main(argv) == 0
+    assert len(json.loads(path.read_text())) > 0
@@ -0,0 +1,44 @@
+import numpy as np
+
+from tgu import render
+from tgu.cache import CACHE_ENV
+
+R = np.linspace(0.2, 30.0, 50)
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def _curva(caminho, escala=1.0):
+    return ("curva_rotacao", {"caminho": str(caminho), "r_vals": R,
+                              "v_newton": escala * np.sqrt(R), "v_tgu": escala * np.sqrt(R + 1)})
+
+
+def test_renderizar_lote_headless(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    tarefas = [_curva(tmp_path / "a.png"), _curva(tmp_path / "b.png", 2.0),
+               ("precessao", {"caminho": str(tmp_path / "c.png"), "labels": ["RG", "TGU"],
+                              "valores": [43.0, 43.1], "titulo": "t", "ylabel": "y",
+                              "referencia": 43.0, "rotulo_referencia": "RG"})]
+    for processos in (1, 2):
+        caminhos = render.renderizar_lote(tarefas, processos=processos)
+        assert caminhos == [t[1]["caminho"] for t in tarefas]
+        for caminho in caminhos:
+            with open(caminho, "rb") as fh:
+                assert fh.read(8) == PNG
+    import matplotlib
+    assert matplotlib.get_backend().lower() == "agg"
+
+
+def test_figura_reaproveitada_do_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "cache"))
+    caminho = tmp_path / "curva.png"
+    _, kwargs = _curva(caminho)
+    render.renderizar_curva_rotacao(**kwargs)
+    original = caminho.read_bytes()
+
+    def proibido():
+        raise AssertionError("figura em cache foi renderizada de novo")
+    monkeypatch.setattr(render, "_pyplot", proibido)
+    assert render.renderizar_curva_rotacao(**kwargs) == str(caminho)     # arquivo igual: nada a fazer
+    caminho.unlink()
+    render.renderizar_curva_rotacao(**kwargs)                              # copiado do cache
+    assert caminho.read_bytes() == original
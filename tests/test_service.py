@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import pytest
+
+from tgu.service import PredictionService
+
+
+async def _exchange(raw):
+    service = PredictionService(window_ms=0)
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def _post(path, payload):
+    body = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+    raw = (f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+           f"Connection: close\r\n\r\n").encode() + body
+    return asyncio.run(_exchange(raw))
+
+
+def test_correction_scalar_and_list():
+    status, body = _post("/correction", {"a": 0.387, "e": 0.2056, "gr": 42.98})
+    assert status == 200 and isinstance(body["alpha"], float) and "precession" in body
+    status, body = _post("/correction", {"a": [0.387, 1.0], "e": 0.1})
+    assert status == 200 and len(body["total_correction"]) == 2 and "precession" not in body
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_non_finite_results_are_null():
+    status, body = _post("/sgra", {"massa_msun": 4.1e6, "a_au": [1031.0, 1031.0], "e": [0.88, 1.0]})
+    assert status == 200
+    assert body["gr_arcmin"][0] > 0 and body["gr_arcmin"][1] is None
+
+
+def test_non_finite_input_rejected():
+    status, body = _post("/correction", '{"a": NaN, "e": 0.1}')
+    assert status == 400 and "NaN" in body["error"]
+
+
+def test_bad_content_length():
+    raw = b"POST /correction HTTP/1.1\r\nContent-Length: abc\r\n\r\n{}"
+    status, body = asyncio.run(_exchange(raw))
+    assert status == 400 and "Content-Length" in body["error"]
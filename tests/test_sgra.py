@@ -0,0 +1,13 @@
+from tgu import sgra
+
+S2 = (sgra.MASSA_SGR_A, 1031.0, 0.8839, sgra.SIGMA_MASSA_SGR_A, 8.0, 0.0019)
+
+
+def test_monte_carlo_identico_para_qualquer_divisao():
+    n = 3 * sgra.BLOCO_AMOSTRAS + 123
+    ref = sgra.monte_carlo_precessao(*S2, n_amostras=n, processos=1, bins=256)
+    assert ref["n_amostras"] == n
+    for processos, tamanho_lote in ((2, sgra.BLOCO_AMOSTRAS), (3, 1000), (1, 2 * sgra.BLOCO_AMOSTRAS)):
+        assert sgra.monte_carlo_precessao(*S2, n_amostras=n, tamanho_lote=tamanho_lote,
+                                          processos=processos, bins=256) == ref
+    assert sgra.monte_carlo_precessao(*S2, n_amostras=n, semente=1, processos=1, bins=256) != ref
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from tgu.cache import CACHE_ENV
+from tgu.core import correction
+from tgu.sweep import Sweep
+
+
+def _grids(rng):
+    a = rng.uniform(0.05, 5.0, 7)
+    e = rng.uniform(0.0, 0.9, 7)
+    return a, e, [0.05, 0.0881], [11.0, 12.0], [0.01, 0.02391625]
+
+
+def test_total_matches_core_correction():
+    a, e = np.array([0.387, 0.723, 1.0]), np.array([0.206, 0.0068, 0.0167])
+    s = Sweep(a, e)
+    np.testing.assert_allclose(s.total[:, 0, 0, 0], correction(a, e)[2], rtol=1e-15)
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_extend_is_exact(cached, tmp_path, monkeypatch):
+    if cached:
+        monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    rng = np.random.default_rng(0)
+    a, e, k, n, rs = _grids(rng)
+    Sweep(a[:2], e[:2], k[:1], n[:1], rs[:1])
+    s = Sweep(a[:2], e[:2], k[:1], n[:1], rs[:1])       # second build is a cache hit when enabled
+    for i in range(2, 7):
+        s.extend("body", a[i], e[i])
+    s.extend("k", k[1:]).extend("n", n[1:]).extend("rs", rs[1:])
+    s.extend("k", [0.1, 0.2, 0.3])
+
+    ref = Sweep(a, e, k + [0.1, 0.2, 0.3], n, rs)
+    assert s.shape == ref.shape == (7, 5, 2, 2)
+    for name in ("a", "e", "e_a", "k", "n", "rs", "alpha", "log_eps", "coherence", "total"):
+        np.testing.assert_array_equal(getattr(s, name), getattr(ref, name), err_msg=name)
+
+
+def test_extend_grows_geometrically():
+    s = Sweep([1.0], [0.1], k_values=np.linspace(0.05, 0.1, 4))
+    for i in range(256):
+        s.extend("body", 1.0 + i, 0.1)
+    assert s.shape[0] == 257
+    assert s._buffers["total"].shape[0] == 512     # capacity doubled 1 -> 512
@@ -0,0 +1,20 @@
+"""
+TGU – Unified Theory of Informational Spin
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Importable engine shared by the TGU_*.py prediction scripts.
+"""
+
+from .core import (
+    K,
+    N,
+    RS_INFORMATIONAL,
+    allocate_outputs,
+    coherence,
+    coherence_scalar,
+    correction,
+    correction_records,
+    correction_scalar,
+)
+
+__version__ = "0.1.0"
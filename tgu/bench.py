@@ -0,0 +1,265 @@
+"""
+TGU MASTER - Benchmark suite with regression tracking
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Times every prediction hot path at production sizes and records throughput,
+latency percentiles and peak traced memory. Each run is appended as one JSON
+line to a history file; with a stored baseline, any case whose throughput
+drops by more than the tolerance is flagged and the exit code is 1.
+
+    python -m tgu.bench                      # run, append to history
+    python -m tgu.bench --save-baseline      # run and store as baseline
+    python -m tgu.bench --quick --only correction
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+HISTORY_FILE = "bench_history.jsonl"
+BASELINE_FILE = "bench_baseline.json"
+TOLERANCE = 0.10
+REPEATS = 7
+
+
+# ============================================================
+# CASES
+# ============================================================
+# Each case maps a size to (callable, elements processed per call).
+
+def _case_correction(size):
+    from .core import allocate_outputs, correction
+    rng = np.random.default_rng(0)
+    a = rng.uniform(0.005, 50.0, size)
+    e = rng.uniform(0.0, 0.95, size)
+    out = allocate_outputs(size)
+    return (lambda: correction(a, e, out=out)), size
+
+
+def _case_velocidade_tgu(size):
+    from .galaxy import massa_disco_exponencial, velocidade_tgu
+    r = np.linspace(0.2, 30.0, size)
+    M_r = massa_disco_exponencial(r, 5.0e10, 3.0)
+    return (lambda: velocidade_tgu(r, M_r, 3.0)), size
+
+
+def _case_rotation_batch(size):
+    from .galaxy import curvas_rotacao_lote
+    rng = np.random.default_rng(0)
+    r = np.linspace(0.2, 30.0, 400)
+    M_disk = 10 ** rng.uniform(9.0, 11.5, size)
+    R_d = rng.uniform(1.0, 6.0, size)
+    return (lambda: curvas_rotacao_lote(r, M_disk, R_d)), size * r.size
+
+
+def _case_campo_gradiente(size):
+    from .hercrb import gerar_campo_informacional
+    eixo = np.linspace(-2, 2, size)
+    X, Y = np.meshgrid(eixo, eixo)
+    rng = np.random.default_rng(0)
+
+    def run():
+        campo_I = gerar_campo_informacional(X, Y, rng=rng)
+        dy, dx = np.gradient(campo_I)
+        return np.sqrt(dx**2 + dy**2)
+    return run, size * size
+
+
+def _case_sgra(size):
+    from .sgra import calcular_precessao_sgr_a
+    rng = np.random.default_rng(0)
+    massa = rng.normal(4.1e6, 0.034e6, size)
+    a = rng.normal(1031.0, 8.0, size)
+    e = rng.normal(0.8839, 0.0019, size)
+    return (lambda: calcular_precessao_sgr_a(massa, a, e)), size
+
+
+def _case_ephemeris(size):
+    from .ephemeris import build_ephemeris, planet_bodies, s_star_bodies
+    eph = build_ephemeris(planet_bodies() + s_star_bodies())
+    rng = np.random.default_rng(0)
+    idx = rng.integers(0, len(eph), size)
+    t = rng.uniform(1900.0, 2100.0, size)
+    return (lambda: eph.positions(idx, t)), size
+
+
+def _case_cli_cold_start(size):
+    # Whole-process latency of `python -m tgu sgra`; size = invocations per call
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    cmd = [sys.executable, "-m", "tgu", "sgra"]
+
+    def run():
+        for _ in range(size):
+            subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, check=True)
+    return run, size
+
+
+CASES = {
+    "correction": (_case_correction, (10**5, 10**6, 4 * 10**6)),
+    "velocidade_tgu": (_case_velocidade_tgu, (10**5, 10**6, 4 * 10**6)),
+    "rotation_batch": (_case_rotation_batch, (100, 1000, 4000)),
+    "campo_gradiente": (_case_campo_gradiente, (256, 1024, 2048)),
+    "sgra": (_case_sgra, (10**5, 10**6, 4 * 10**6)),
+    "ephemeris": (_case_ephemeris, (10**5, 10**6, 4 * 10**6)),
+    "cli_cold_start": (_case_cli_cold_start, (1,)),
+}
+QUICK_SIZES = {
+    "correction": (10**5,),
+    "velocidade_tgu": (10**5,),
+    "rotation_batch": (100,),
+    "campo_gradiente": (256,),
+    "sgra": (10**5,),
+    "ephemeris": (10**5,),
+    "cli_cold_start": (1,),
+}
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def measure(fn, elements, repeats=REPEATS):
+    """
+    Runs `fn` once to warm up, `repeats` times for timing and once more
+    under tracemalloc. Returns latency percentiles (ms), median throughput
+    (elements/s) and peak traced memory (MB).
+    """
+    fn()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    times = np.array(times)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(times, (50, 90, 99)) * 1e3
+    return {
+        "elements": int(elements),
+        "repeats": repeats,
+        "latency_ms": {"p50": p50, "p90": p90, "p99": p99, "min": times.min() * 1e3},
+        "throughput_per_s": elements / np.median(times),
+        "peak_mb": peak / 1e6,
+    }
+
+
+def run_suite(only=None, quick=False, repeats=REPEATS, log=print):
+    """
+    Runs the selected cases with the result cache off (TGU_CACHE_DIR
+    unset), so hits never stand in for compute. Returns
+    {"case@size": measurement}.
+    """
+    from .cache import disabled
+
+    results = {}
+    with disabled():
+        for name, (setup, sizes) in CASES.items():
+            if only and name not in only:
+                continue
+            for size in (QUICK_SIZES[name] if quick else sizes):
+                fn, elements = setup(size)
+                key = f"{name}@{size}"
+                results[key] = measure(fn, elements, repeats)
+                if log:
+                    r = results[key]
+                    log(f"{key:<28} p50 {r['latency_ms']['p50']:10.3f} ms | "
+                        f"{r['throughput_per_s']:12.4g} el/s | peak {r['peak_mb']:8.1f} MB")
+    return results
+
+
+# ============================================================
+# HISTORY AND REGRESSIONS
+# ============================================================
+
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, timeout=5, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def record(results, history_file=HISTORY_FILE):
+    """Appends one run (with environment metadata) to the JSONL history."""
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    with open(history_file, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Returns the list of regressions: cases whose throughput fell below
+    (1 - tolerance) x baseline. Cases missing from either side are skipped.
+    """
+    regressions = []
+    for key, r in results.items():
+        if key not in baseline:
+            continue
+        ref = baseline[key]["throughput_per_s"]
+        ratio = r["throughput_per_s"] / ref
+        if ratio < 1.0 - tolerance:
+            regressions.append({"case": key, "ratio": ratio,
+                                "throughput_per_s": r["throughput_per_s"], "baseline": ref})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TGU benchmark suite")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), help="cases to run")
+    parser.add_argument("--quick", action="store_true", help="smallest size of each case only")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.only, args.quick, args.repeats)
+    record(results, args.history)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    regressions = compare(results, baseline, args.tolerance)
+    for reg in regressions:
+        print(f"REGRESSION {reg['case']}: {reg['ratio']:.2%} of baseline throughput")
+    if not regressions:
+        print("No regressions against baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
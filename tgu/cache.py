@@ -0,0 +1,349 @@
+"""
+TGU MASTER - Content-addressed on-disk result cache
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Entries are keyed by a SHA-256 of the inputs, the MASTER TGU constants and
+the code version (package version + digest of the tgu sources), so any
+change to data, parameters or code yields a new key.
+
+Layout: <root>/<key[:2]>/<key>/ holding one .npy per array (read back
+memory-mapped), optional blob.bin (figures or a pickled result skeleton)
+and meta.json. An entry is written to a private .tmp- directory and
+published with a single atomic rename, so concurrent writers never expose
+partial entries; the loser of a race simply discards its copy. Reads bump
+the entry mtime, and `evict` trims the oldest entries until the cache fits
+in `max_bytes`. In-flight .tmp- directories count toward that bound, and
+those older than STALE_TMP_S (left behind by a crashed writer) are removed.
+
+Set TGU_CACHE_DIR to enable `default_cache()`. `memoize` wraps the
+top-level entry points (solar.precession_table, catalog.score_chunks, the
+hercrb / estruturas fields and ensembles, sgra.precessao_aglomerado and
+the Monte Carlo, sweep.Sweep) so that the scripts and every `python -m tgu`
+subcommand reuse results across runs; tgu.render skips re-rendering
+unchanged figures. Kernels called per batch (sgra.calcular_precessao_sgr_a,
+galaxy.curvas_rotacao_lote) and ensemble members are not cached, and
+`disabled()` turns the cache off for timing runs (tgu.bench,
+tgu.precision).
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+from . import __version__
+from .core import K, N, RS_INFORMATIONAL
+
+CACHE_ENV = "TGU_CACHE_DIR"
+MAX_BYTES = 2 * 1024**3
+BLOB_NAME = "blob.bin"
+META_NAME = "meta.json"
+TMP_PREFIX = ".tmp-"
+STALE_TMP_S = 3600.0
+
+_code_digest = None
+
+
+def code_version():
+    """Package version plus a digest of every tgu source file."""
+    global _code_digest
+    if _code_digest is None:
+        h = hashlib.sha256(__version__.encode())
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(here)):
+            if name.endswith(".py"):
+                with open(os.path.join(here, name), "rb") as fh:
+                    h.update(name.encode())
+                    h.update(fh.read())
+        _code_digest = h.hexdigest()[:16]
+    return _code_digest
+
+
+def _feed(h, value):
+    """Canonical, type-tagged encoding of a key component."""
+    if isinstance(value, (np.dtype, type)):
+        h.update(b"T" + np.dtype(value).str.encode())
+    elif isinstance(value, np.ndarray) or isinstance(value, np.generic):
+        arr = np.ascontiguousarray(value)
+        h.update(b"A" + arr.dtype.str.encode() + repr(arr.shape).encode())
+        h.update(arr.tobytes())
+    elif isinstance(value, (bool, int, float, str, type(None))):
+        h.update(b"S" + type(value).__name__.encode() + repr(value).encode())
+    elif isinstance(value, bytes):
+        h.update(b"B" + len(value).to_bytes(8, "little") + value)
+    elif isinstance(value, (list, tuple)):
+        h.update(b"L" + str(len(value)).encode())
+        for item in value:
+            _feed(h, item)
+    elif isinstance(value, dict):
+        h.update(b"D" + str(len(value)).encode())
+        for k in sorted(value, key=str):
+            _feed(h, str(k))
+            _feed(h, value[k])
+    else:
+        raise TypeError(f"cannot build a cache key from {type(value).__name__}")
+
+
+def make_key(namespace, *parts, **named):
+    """Cache key for `namespace` with the given inputs."""
+    h = hashlib.sha256()
+    _feed(h, (namespace, code_version(), {"K": K, "N": N, "RS": RS_INFORMATIONAL},
+              list(parts), named))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded, content-addressed store of arrays and blobs."""
+
+    def __init__(self, root=None, max_bytes=MAX_BYTES):
+        self.root = os.path.abspath(root or os.environ.get(CACHE_ENV)
+                                    or os.path.join(os.path.expanduser("~"), ".cache", "tgu"))
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    # --- read ---
+    def get(self, key):
+        """Returns (arrays, meta) for a hit, or None. Arrays are memory-mapped."""
+        path = self._path(key)
+        try:
+            names = os.listdir(path)
+            arrays = {n[:-4]: np.load(os.path.join(path, n), mmap_mode="r")
+                      for n in names if n.endswith(".npy")}
+            with open(os.path.join(path, META_NAME), encoding="utf-8") as fh:
+                meta = json.load(fh)
+            os.utime(path)
+        except (FileNotFoundError, NotADirectoryError):
+            # Missing, or evicted by another process mid-read
+            return None
+        return arrays, meta
+
+    def get_bytes(self, key):
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, BLOB_NAME), "rb") as fh:
+                data = fh.read()
+            os.utime(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return data
+
+    # --- write ---
+    def put(self, key, arrays=None, meta=None, blob=None):
+        """Publishes an entry atomically; an existing entry is kept as is."""
+        final = self._path(key)
+        if os.path.isdir(final):
+            return final
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=TMP_PREFIX, dir=self.root)
+        try:
+            for name, value in (arrays or {}).items():
+                np.save(os.path.join(tmp, f"{name}.npy"), np.asarray(value))
+            if blob is not None:
+                with open(os.path.join(tmp, BLOB_NAME), "wb") as fh:
+                    fh.write(blob)
+            with open(os.path.join(tmp, META_NAME), "w", encoding="utf-8") as fh:
+                json.dump(dict(meta or {}, created=time.time()), fh)
+            try:
+                os.rename(tmp, final)
+            except OSError:
+                # Another writer published the same key first
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+        return final
+
+    # --- eviction ---
+    def _entries(self):
+        """(mtime, bytes, path, published) of every entry and .tmp- directory."""
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            if shard.name.startswith(TMP_PREFIX):
+                try:
+                    yield shard.stat().st_mtime, _dir_size(shard.path), shard.path, False
+                except FileNotFoundError:
+                    pass
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    yield entry.stat().st_mtime, _dir_size(entry.path), entry.path, True
+                except FileNotFoundError:
+                    continue
+
+    def size(self):
+        return sum(size for _, size, _, _ in self._entries())
+
+    def evict(self, max_bytes=None):
+        """
+        Removes stale .tmp- directories, then least-recently-used entries
+        until the cache (including in-flight writes) fits.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        stale = time.time() - STALE_TMP_S
+        entries = []
+        total = 0
+        for mtime, size, path, published in self._entries():
+            if not published and mtime < stale:
+                # Left behind by a writer that died before its rename
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            total += size
+            if published:
+                entries.append((mtime, size, path))
+        entries.sort()
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+        return total
+
+    def clear(self):
+        self.evict(max_bytes=0)
+
+    # --- helpers ---
+    def cached(self, namespace, fn, *args, **kwargs):
+        """
+        get-or-compute for functions returning an array or a dict of
+        arrays/scalars. Scalars are kept in meta.json.
+        """
+        key = make_key(namespace, *args, **kwargs)
+        hit = self.get(key)
+        if hit is not None:
+            arrays, meta = hit
+            if meta.get("single"):
+                return arrays["value"]
+            return dict(arrays, **meta.get("scalars", {}))
+
+        result = fn(*args, **kwargs)
+        if isinstance(result, np.ndarray):
+            self.put(key, {"value": result}, {"namespace": namespace, "single": True})
+            return result
+        arrays = {k: v for k, v in result.items() if isinstance(v, np.ndarray)}
+        scalars = {k: v for k, v in result.items() if k not in arrays}
+        self.put(key, arrays, {"namespace": namespace, "scalars": scalars})
+        return result
+
+    def get_result(self, key):
+        """Result stored by `put_result`, with its arrays memory-mapped, or None."""
+        hit = self.get(key)
+        skeleton = self.get_bytes(key) if hit is not None else None
+        if skeleton is None:
+            return None
+        arrays = hit[0]
+        return _fill(pickle.loads(skeleton), arrays)
+
+    def put_result(self, key, result, namespace=None):
+        """
+        Stores a nested dict / tuple / list result: every ndarray becomes
+        its own .npy and the rest of the structure is pickled into the blob.
+        """
+        arrays = {}
+        skeleton = _strip(result, arrays)
+        return self.put(key, arrays, {"namespace": namespace}, blob=pickle.dumps(skeleton))
+
+
+def _dir_size(path):
+    return sum(f.stat().st_size for f in os.scandir(path))
+
+
+class _ArrayRef:
+    """Placeholder for an array stored as <name>.npy beside the skeleton."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+def _strip(value, arrays):
+    if isinstance(value, np.ndarray):
+        name = f"a{len(arrays)}"
+        arrays[name] = value
+        return _ArrayRef(name)
+    if isinstance(value, dict):
+        return {k: _strip(v, arrays) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return type(value)(_strip(v, arrays) for v in value)
+    return value
+
+
+def _fill(value, arrays):
+    if isinstance(value, _ArrayRef):
+        return arrays[value.name]
+    if isinstance(value, dict):
+        return {k: _fill(v, arrays) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return type(value)(_fill(v, arrays) for v in value)
+    return value
+
+
+def default_cache():
+    """ResultCache at $TGU_CACHE_DIR, or None when the variable is unset."""
+    root = os.environ.get(CACHE_ENV)
+    return ResultCache(root) if root else None
+
+
+@contextmanager
+def disabled():
+    """Unsets TGU_CACHE_DIR for the duration of the block."""
+    saved = os.environ.pop(CACHE_ENV, None)
+    try:
+        yield
+    finally:
+        if saved is not None:
+            os.environ[CACHE_ENV] = saved
+
+
+def memoize(namespace, ignore=(), when=None):
+    """
+    Decorator: with TGU_CACHE_DIR set, the function's result is looked up
+    by (namespace, bound arguments, constants, code version) and computed
+    only on a miss. Hits return read-only memory-mapped arrays.
+
+    ignore : parameters that do not change the result (pool sizes, block
+        sizes of block-size-independent generators)
+    when : predicate on the bound arguments; False bypasses the cache
+        (e.g. when the caller asked for memory-mapped output files)
+
+    Arguments that cannot be keyed (generators, open files) also bypass it.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = default_cache()
+            if cache is None:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if when is not None and not when(bound.arguments):
+                return fn(*args, **kwargs)
+            try:
+                key = make_key(namespace, **{name: value for name, value in bound.arguments.items()
+                                             if name not in ignore})
+            except TypeError:
+                return fn(*args, **kwargs)
+
+            hit = cache.get_result(key)
+            if hit is not None:
+                return hit
+            result = fn(*args, **kwargs)
+            cache.put_result(key, result, namespace)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,380 @@
+"""
+TGU MASTER - Command-line dispatcher
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+One entry point for every prediction, importing only what the chosen
+subcommand needs (matplotlib only with --plot):
+
+    python -m tgu planet mercury venus --format csv
+    python -m tgu exoplanets --input catalog.npy --batch-size 262144 -o out.csv
+    python -m tgu galaxy --M-disk 5e10 --R-d 3.0 --points 400
+    python -m tgu hercrb --grid 2048 --ensemble 32 --processes 8
+    python -m tgu sgra --cluster
+    python -m tgu serve --port 8765          # tgu.service
+    python -m tgu bench --quick              # tgu.bench
+    python -m tgu scaling --processes 1 2 4  # tgu.parallel
+    python -m tgu ephemeris tables/eph       # tgu.ephemeris
+    python -m tgu precision --grid 1024      # tgu.precision
+
+Results are written as JSON (default) or CSV to stdout or --output; large
+catalogs are streamed chunk by chunk in both formats.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from .core import K, N
+
+# Built-in exoplanet list (same values as TGU_Exoplanet_Alpha_Unified.py)
+EXOPLANETS = [
+    {"name": "WASP-12b", "a": 0.0229, "e": 0.0486},
+    {"name": "HD 80606b", "a": 0.449, "e": 0.9336},
+    {"name": "Kepler-78b", "a": 0.0089, "e": 0.05},
+    {"name": "GJ 436b", "a": 0.0287, "e": 0.152},
+    {"name": "55 Cancri e", "a": 0.0156, "e": 0.05},
+    {"name": "HD 209458b", "a": 0.047, "e": 0.014},
+    {"name": "Tau Boo b", "a": 0.049, "e": 0.023},
+    {"name": "HAT-P-2b", "a": 0.0677, "e": 0.5171},
+    {"name": "Kepler-10b", "a": 0.0168, "e": 0.05},
+    {"name": "WASP-33b", "a": 0.0256, "e": 0.0},
+]
+
+PASSTHROUGH = {"serve": "tgu.service", "bench": "tgu.bench", "scaling": "tgu.parallel",
+               "ephemeris": "tgu.ephemeris", "precision": "tgu.precision"}
+DEFAULT_BATCH = 65536
+
+
+# ============================================================
+# OUTPUT
+# ============================================================
+
+def _plain(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class Emitter:
+    """
+    Writes column batches ({field: sequence}) as one JSON array or one CSV
+    table, incrementally, so memory stays bounded by one batch.
+    """
+
+    def __init__(self, fmt, stream):
+        self.fmt = fmt
+        self.stream = stream
+        self.fields = None
+        self.rows = 0
+        self.summary = False
+        self._csv = csv.writer(stream, lineterminator="\n") if fmt == "csv" else None
+
+    def write(self, columns):
+        if self.fields is None:
+            self.fields = list(columns)
+            if self._csv:
+                self._csv.writerow(self.fields)
+            else:
+                self.stream.write("[")
+        cols = [columns[f] for f in self.fields]
+        n = len(cols[0])
+        if self._csv:
+            cols = [np.asarray(c) for c in cols]
+            cols = [c if c.dtype.kind in "OSU" else np.char.mod("%.10g", c) for c in cols]
+            self._csv.writerows(zip(*cols))
+        else:
+            cols = [c.tolist() if isinstance(c, np.ndarray) else list(c) for c in cols]
+            for i in range(n):
+                record = {f: _plain(col[i]) for f, col in zip(self.fields, cols)}
+                self.stream.write(("," if self.rows + i else "") + "\n  " + json.dumps(record))
+        self.rows += n
+
+    def write_record(self, record):
+        """A single summary object (not a table)."""
+        if self.fmt == "csv":
+            self.write({k: [v] for k, v in _flatten(record).items()})
+        else:
+            json.dump(record, self.stream, indent=2, default=_plain)
+            self.stream.write("\n")
+            self.summary = True
+
+    def close(self):
+        if self.fmt != "json" or self.summary:
+            return
+        self.stream.write("[]\n" if self.fields is None else "\n]\n")
+
+
+def _flatten(record, prefix=""):
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (list, tuple)):
+            flat[name] = ";".join(str(v) for v in value)
+        else:
+            flat[name] = value
+    return flat
+
+
+def _has_column(path, name):
+    with open(path, encoding="utf-8") as fh:
+        return name in [h.strip() for h in fh.readline().split(",")]
+
+
+# ============================================================
+# SUBCOMMANDS
+# ============================================================
+
+def cmd_planet(args, emitter):
+    from . import solar
+
+    if args.input:
+        kwargs = {}
+        if args.input.lower().endswith((".csv", ".txt")) and _has_column(args.input, "name"):
+            kwargs["name_column"] = "name"
+        tables = solar.precession_chunks(args.input, args.batch_size, args.mass, **kwargs)
+    else:
+        try:
+            tables = [solar.solar_system(args.bodies or None, mass_msun=args.mass)]
+        except KeyError as exc:
+            raise SystemExit(exc.args[0])
+
+    for table in tables:
+        emitter.write(table)
+        if args.plot:
+            _plot_planets(args.plot, table)
+
+
+def _plot_planets(directory, columns):
+    from .render import renderizar_precessao
+    os.makedirs(directory, exist_ok=True)
+    names = columns.get("name", [f"body{i}" for i in range(len(columns["a"]))])
+    for i, name in enumerate(names):
+        gr = float(columns["gr"][i])
+        values = [gr, gr * float(columns["alpha"][i]), float(columns["tgu"][i])]
+        renderizar_precessao(
+            os.path.join(directory, f"TGU_Prediction_{name.title()}_MASTER.png"),
+            ["RG (Einstein)", "TGU (Alpha only)", "TGU MASTER (Refined)"], values,
+            titulo=f"Perihelion Precession of {name.title()}: GR vs. TGU vs. TGU MASTER",
+            ylabel="Precession (arcsec/century)", referencia=gr, rotulo_referencia="GR Value",
+            formato_valor="{:.3f}", deslocamento=0.01 * gr,
+            fontsize_titulo=14, fontsize_ylabel=12,
+        )
+
+
+def cmd_exoplanets(args, emitter):
+    from .catalog import iter_catalog, score_chunks
+
+    if args.input:
+        kwargs = {}
+        if args.input.lower().endswith((".csv", ".txt")) and _has_column(args.input, "name"):
+            kwargs["name_column"] = "name"
+        chunks = iter_catalog(args.input, chunk_size=args.batch_size, **kwargs)
+    else:
+        chunks = [{"name": np.array([p["name"] for p in EXOPLANETS]),
+                   "a": np.array([p["a"] for p in EXOPLANETS]),
+                   "e": np.array([p["e"] for p in EXOPLANETS])}]
+
+    for chunk, result in score_chunks(chunks, chunk_size=args.batch_size):
+        columns = {"name": chunk["name"]} if chunk.get("name") is not None else {}
+        columns.update(a=chunk["a"], e=chunk["e"], e_a=chunk["e"] / chunk["a"], **result)
+        emitter.write(columns)
+
+
+def cmd_galaxy(args, emitter):
+    from .galaxy import curvas_rotacao_lote
+
+    r = np.linspace(args.r_min, args.r_max, args.points)
+    if args.input:
+        from .catalog import iter_csv
+        name = "name" if _has_column(args.input, "name") else None
+        galaxies = iter_csv(args.input, columns=("M_disk", "R_d"),
+                            chunk_size=args.batch_size, name_column=name)
+    else:
+        M_disk = np.atleast_1d(np.asarray(args.M_disk, dtype=np.float64))
+        R_d = np.broadcast_to(np.asarray(args.R_d, dtype=np.float64), M_disk.shape)
+        galaxies = ({"M_disk": M_disk[i:i + args.batch_size], "R_d": R_d[i:i + args.batch_size]}
+                    for i in range(0, M_disk.size, args.batch_size))
+
+    first = None
+    offset = 0
+    for batch in galaxies:
+        M_r, v_newton, v_tgu = curvas_rotacao_lote(r, batch["M_disk"], batch["R_d"],
+                                                   k=args.k, n=args.n, dtype=args.precision)
+        n_gal = M_r.shape[0]
+        names = batch.get("name")
+        ids = (np.repeat(names, r.size) if names is not None
+               else np.repeat(np.arange(offset, offset + n_gal), r.size))
+        emitter.write({"galaxy": ids, "r_kpc": np.tile(r, n_gal), "M_r": M_r.ravel(),
+                       "v_newton": v_newton.ravel(), "v_tgu": v_tgu.ravel()})
+        if first is None:
+            first = (v_newton[0], v_tgu[0])
+        offset += n_gal
+
+    if args.plot and first is not None:
+        from .render import renderizar_curva_rotacao
+        renderizar_curva_rotacao(args.plot, r, *first)
+
+
+def cmd_hercrb(args, emitter):
+    from . import hercrb
+
+    forma = (args.grid,) * args.dim
+    dtype = np.dtype(args.precision)
+    if args.structures:
+        from . import estruturas
+        if args.ensemble:
+            result = estruturas.ensemble_estruturas(
+                args.ensemble, forma, args.seed, processos=args.processes, dtype=dtype,
+                min_celulas=args.min_cells, linhas_por_bloco=args.rows_per_block)
+        else:
+            res = estruturas.estruturas_realizacao(forma, args.seed, None, dtype,
+                                                   min_celulas=args.min_cells,
+                                                   linhas_por_bloco=args.rows_per_block)
+            emitter.write({k: v if v.ndim == 1 else [";".join(map(str, row)) for row in v]
+                           for k, v in res.items() if k != "n_estruturas"})
+            result = None
+    elif args.ensemble:
+        result = hercrb.ensemble_campos(args.ensemble, forma, args.seed, processos=args.processes,
+                                        dtype=dtype, linhas_por_bloco=args.rows_per_block)
+    else:
+        medio, filamento = hercrb.estatisticas_realizacao(forma, args.seed, None, dtype,
+                                                          linhas_por_bloco=args.rows_per_block)
+        result = {"forma": forma, "semente": args.seed,
+                  "gradiente_medio": medio, "gradiente_filamento": filamento}
+    if result is not None:
+        emitter.write_record({k: v.tolist() if isinstance(v, np.ndarray) else v
+                              for k, v in result.items()})
+
+    if args.plot:
+        if args.dim != 2:
+            raise SystemExit("--plot is only available for 2-D grids")
+        from .render import renderizar_hercrb
+        campo_I, _ = hercrb.gerar_campo_em_blocos(forma, args.seed, dtype,
+                                                  linhas_por_bloco=args.rows_per_block)
+        eixo = np.linspace(*hercrb.EXTENSAO, args.grid)
+        z_escala = np.linspace(0, 15, 100)
+        renderizar_hercrb(args.plot, eixo, eixo, campo_I, z_escala,
+                          1.0 / (1 + z_escala), 0.8 * np.exp(-0.05 * z_escala) + 0.2)
+
+
+def cmd_sgra(args, emitter):
+    from . import sgra
+
+    if args.cluster:
+        stars = sgra.ESTRELAS_S
+        res = sgra.precessao_aglomerado(stars, args.mass)
+        emitter.write({"name": [s["nome"] for s in stars], "massa_msun": np.full(len(stars), args.mass),
+                       "a_au": [s["a_au"] for s in stars], "e": [s["e"] for s in stars], **res})
+        return
+
+    if args.input:
+        from .catalog import iter_csv
+        chunks = iter_csv(args.input, columns=("massa_msun", "a_au", "e"), chunk_size=args.batch_size)
+    else:
+        chunks = [{"massa_msun": np.array([args.mass]), "a_au": np.array([args.a]),
+                   "e": np.array([args.e])}]
+    for chunk in chunks:
+        res = sgra.calcular_precessao_sgr_a(chunk["massa_msun"], chunk["a_au"], chunk["e"])
+        emitter.write(dict(chunk, **{k: np.broadcast_to(v, chunk["a_au"].shape)
+                                     for k, v in res.items()}))
+
+
+# ============================================================
+# PARSER
+# ============================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m tgu", description="TGU MASTER predictions")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", choices=("json", "csv"), default="json")
+    common.add_argument("-o", "--output", help="output file (default: stdout)")
+    common.add_argument("--batch-size", type=int, default=DEFAULT_BATCH,
+                        help="rows (or galaxies) processed per vectorized batch")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    p = sub.add_parser("planet", parents=[common], help="perihelion precession, GR vs. TGU")
+    p.add_argument("bodies", nargs="*", help="built-in bodies (mercury, venus, earth, mars, "
+                                             "icarus); default all")
+    p.add_argument("--input", help="catalog with a, e columns (.csv, .npy, .npz or MPCORB)")
+    p.add_argument("--mass", type=float, default=1.0, help="central mass (Msun)")
+    p.add_argument("--plot", metavar="DIR", help="render one bar chart per body into DIR")
+    p.set_defaults(func=cmd_planet)
+
+    p = sub.add_parser("exoplanets", parents=[common], help="alpha x coherence correction of a catalog")
+    p.add_argument("--input", help="catalog (.csv, .npy, .npz or MPCORB fixed width); "
+                                   "default: built-in exoplanet list")
+    p.set_defaults(func=cmd_exoplanets)
+
+    p = sub.add_parser("galaxy", parents=[common], help="rotation curves, Newton vs. TGU")
+    p.add_argument("--M-disk", type=float, nargs="+", default=[5.0e10], help="disk masses (Msun)")
+    p.add_argument("--R-d", type=float, nargs="+", default=[3.0], help="disk scale lengths (kpc)")
+    p.add_argument("--input", help="CSV with M_disk, R_d columns (optional name)")
+    p.add_argument("--r-min", type=float, default=0.2)
+    p.add_argument("--r-max", type=float, default=30.0)
+    p.add_argument("--points", type=int, default=400)
+    p.add_argument("--k", type=float, default=K)
+    p.add_argument("--n", type=float, default=N)
+    p.add_argument("--precision", choices=("float64", "float32"), default="float64")
+    p.add_argument("--plot", metavar="PNG", help="render the first galaxy's curve")
+    p.set_defaults(func=cmd_galaxy, batch_size=1024)
+
+    p = sub.add_parser("hercrb", parents=[common], help="Her-CrB coherence field statistics")
+    p.add_argument("--grid", type=int, default=100, help="cells per axis")
+    p.add_argument("--dim", type=int, choices=(2, 3), default=2)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--ensemble", type=int, default=0, help="number of realizations")
+    p.add_argument("--processes", type=int, default=None)
+    p.add_argument("--rows-per-block", type=int, default=None,
+                   help="axis-0 planes per block (default: from a 16 MiB per-block budget)")
+    p.add_argument("--precision", choices=("float64", "float32"), default="float64")
+    p.add_argument("--float32", dest="precision", action="store_const", const="float32",
+                   help="same as --precision float32")
+    p.add_argument("--structures", action="store_true",
+                   help="extract thresholded structures (one row each, or counts per realization)")
+    p.add_argument("--min-cells", type=int, default=1, help="smallest structure reported")
+    p.add_argument("--plot", metavar="PNG", help="render the field (2-D only)")
+    p.set_defaults(func=cmd_hercrb)
+
+    p = sub.add_parser("sgra", parents=[common], help="S-star precession around Sgr A*")
+    p.add_argument("--mass", type=float, default=4.1e6, help="black hole mass (Msun)")
+    p.add_argument("--a", type=float, default=1031.0, help="semi-major axis (AU)")
+    p.add_argument("--e", type=float, default=0.8839)
+    p.add_argument("--cluster", action="store_true", help="all built-in S stars")
+    p.add_argument("--input", help="CSV with massa_msun, a_au, e columns")
+    p.set_defaults(func=cmd_sgra)
+
+    for name, module in PASSTHROUGH.items():
+        sub.add_parser(name, help=f"run {module} (remaining arguments are passed on)", add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in PASSTHROUGH:
+        import importlib
+        return importlib.import_module(PASSTHROUGH[argv[0]]).main(argv[1:])
+
+    args = build_parser().parse_args(argv)
+    stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        emitter = Emitter(args.format, stream)
+        args.func(args, emitter)
+        emitter.close()
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`): stop quietly, as shell tools do
+        sys.stdout = None
+        os.dup2(os.open(os.devnull, os.O_WRONLY), 1)
+        return 1
+    finally:
+        if args.output:
+            stream.close()
+    return 0
@@ -0,0 +1,133 @@
+"""
+TGU MASTER - Vectorized alpha x coherence correction
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+total_correction = alpha * coherence_factor
+where alpha = 1 + k * (e / a)
+coherence_factor = epsilon ** (-n), epsilon = 1 + (rs / a)**2
+
+Every array function works on whole NumPy columns at once, so a catalog
+with millions of rows is corrected in a single pass. Callers that score
+many batches can hand in preallocated output buffers and allocate nothing.
+The *_scalar variants serve single lookups and are memoized.
+
+The coherence factor is evaluated in log space, exp(-n * log1p((rs/a)^2)),
+which keeps full precision when rs/a is tiny (S2 at 1031 AU gives
+(rs/a)^2 ~ 5e-10, where 1 + x already loses half of its digits).
+
+`gr_precession` is the Schwarzschild baseline the correction multiplies,
+shared by the solar-system and Sgr A* runs.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# MASTER TGU Constants
+K = 0.0881                  # Universal Informational Coupling (Matuchaki Parameter)
+N = 12                      # Coherence Exponent (Harmonic Structure)
+RS_INFORMATIONAL = 0.02391625  # Solar Coherence Radius (AU)
+
+# Physical constants (SI)
+G = 6.67430e-11             # Gravitational constant (m^3 kg^-1 s^-2)
+C = 299792458               # Speed of light (m/s)
+M_SUN = 1.98847e30          # Solar mass (kg)
+AU = 1.495978707e11         # Astronomical unit (m)
+
+OUTPUT_FIELDS = ("alpha", "coherence_factor", "total_correction")
+
+SCALAR_CACHE_SIZE = 4096
+
+
+def allocate_outputs(size, dtype=np.float64):
+    """
+    Preallocates the (alpha, coherence_factor, total_correction) buffers
+    for `size` bodies, to be reused across calls to `correction`.
+    """
+    return tuple(np.empty(size, dtype=dtype) for _ in OUTPUT_FIELDS)
+
+
+def correction(a, e, k=K, n=N, rs=RS_INFORMATIONAL, out=None, dtype=np.float64):
+    """
+    Computes alpha, the coherence factor and the total correction for
+    arrays of semi-major axes `a` (AU) and eccentricities `e`.
+
+    out : optional (alpha, coherence_factor, total_correction) tuple of
+          preallocated arrays with the broadcast shape of `a` and `e`;
+          their dtype takes precedence over `dtype`.
+    dtype : np.float64 (reference) or np.float32 (see tgu.precision)
+    Returns the same three arrays.
+    """
+    if out is not None:
+        dtype = out[0].dtype
+    a = np.asarray(a, dtype=dtype)
+    e = np.asarray(e, dtype=dtype)
+    if out is None:
+        out = allocate_outputs(np.broadcast(a, e).shape, dtype)
+    alpha, coherence_factor, total_correction = out
+
+    # alpha = 1 + k * e/a
+    np.divide(e, a, out=alpha)
+    alpha *= k
+    alpha += 1.0
+
+    coherence(a, rs=rs, n=n, out=coherence_factor)
+
+    np.multiply(alpha, coherence_factor, out=total_correction)
+    return alpha, coherence_factor, total_correction
+
+
+def coherence(a, rs=RS_INFORMATIONAL, n=N, out=None, dtype=np.float64):
+    """
+    Coherence resistance factor epsilon^(-n), epsilon = 1 + (rs/a)^2,
+    for an array of distances `a` (same unit as `rs`), computed in the
+    dtype of `out` if given, else `dtype`.
+    """
+    if out is not None:
+        dtype = out.dtype
+    a = np.asarray(a, dtype=dtype)
+    scalar = out is None and a.ndim == 0
+    if out is None:
+        out = np.empty(a.shape, dtype=dtype)
+    np.divide(rs, a, out=out)
+    np.square(out, out=out)
+    np.log1p(out, out=out)
+    out *= -n
+    np.exp(out, out=out)
+    return out[()] if scalar else out
+
+
+@lru_cache(maxsize=SCALAR_CACHE_SIZE)
+def coherence_scalar(a, rs=RS_INFORMATIONAL, n=N):
+    """Scalar, memoized version of `coherence` for repeated (a, rs, n) lookups."""
+    return math.exp(-n * math.log1p((rs / a) ** 2))
+
+
+def correction_scalar(a, e, k=K, n=N, rs=RS_INFORMATIONAL):
+    """
+    Scalar version of `correction` for a single body.
+    Returns (alpha, coherence_factor, total_correction) as floats.
+    """
+    alpha = 1.0 + k * (e / a)
+    coherence_factor = coherence_scalar(a, rs, n)
+    return alpha, coherence_factor, alpha * coherence_factor
+
+
+def gr_precession(mass_msun, a_au, e):
+    """
+    Schwarzschild perihelion advance per orbit (rad),
+    Delta_Phi = 6 pi G M / (c^2 a (1 - e^2)), for a central mass in solar
+    masses and semi-major axes in AU. Works on scalars or arrays.
+    """
+    mass_kg = mass_msun * M_SUN
+    a_m = a_au * AU
+    return (6 * np.pi * G * mass_kg) / (C**2 * a_m * (1 - e**2))
+
+
+def correction_records(records, k=K, n=N, rs=RS_INFORMATIONAL, out=None):
+    """
+    Same as `correction`, for a structured/record array with `a` and `e`
+    fields (e.g. a catalog loaded with np.genfromtxt(..., names=True)).
+    """
+    return correction(records["a"], records["e"], k=k, n=n, rs=rs, out=out)
@@ -0,0 +1,394 @@
+"""
+TGU MASTER - Piecewise-Chebyshev ephemeris tables on TGU-precessing orbits
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Each body moves on a Keplerian ellipse whose periapsis advances at the
+TGU-corrected rate
+
+    omega_dot = gr_precession(M, a, e) * total_correction(a, e) / P   (rad/yr)
+
+so the perifocal position is periodic in the mean anomaly and one orbit
+is tabulated once: Kepler's equation is solved (vectorized) only at the
+Chebyshev nodes of each segment, and a query at any epoch is a segment
+lookup, a Clenshaw recurrence of fixed degree and three rotations
+(omega(t), inclination, node). Segment breakpoints are uniform in the
+eccentric anomaly, which packs them around periapsis where e ~ 0.9 orbits
+(S2, Icarus) turn fastest.
+
+Units: AU, years, solar masses; angles in the body dicts are degrees.
+
+    eph = build_ephemeris(planet_bodies() + s_star_bodies(), path="tables/eph")
+    eph = Ephemeris.load("tables/eph")       # coefficients memory-mapped
+    x, y, z = eph.position("s2", np.linspace(2000.0, 2040.0, 10**6))
+
+The table is `<path>.npy` (coefficients, shape (degree + 1, 2, segments),
+so a batch of queries gathers contiguous rows per degree) plus
+`<path>.json` (per-body elements, rates and segment offsets).
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from .core import K, N, RS_INFORMATIONAL, correction, gr_precession
+from .instrument import stage
+
+DEGREE = 12
+TOLERANCE = 1e-10          # max position error, in units of a
+MIN_SEGMENTS = 8
+MAX_SEGMENTS = 1 << 16
+CHECKS_PER_SEGMENT = 7
+BLOCK = 16384              # queries per evaluation step
+TWO_PI = 2.0 * np.pi
+ARCSEC_PER_RAD = 180.0 / np.pi * 3600.0
+FORMAT_VERSION = 1
+
+
+# ============================================================
+# BODIES
+# ============================================================
+
+def planet_bodies(names=None):
+    """Bodies from tgu.solar.BODIES, around the Sun."""
+    from .solar import BODIES
+    names = list(BODIES) if names is None else [name.lower() for name in names]
+    return [{"name": name, "a": BODIES[name]["a"], "e": BODIES[name]["e"], "mass_msun": 1.0}
+            for name in names]
+
+
+def s_star_bodies(estrelas=None):
+    """Bodies from tgu.sgra.ESTRELAS_S, around Sgr A*."""
+    from .sgra import ESTRELAS_S, MASSA_SGR_A
+    estrelas = ESTRELAS_S if estrelas is None else estrelas
+    return [{"name": s["nome"].lower(), "a": s["a_au"], "e": s["e"], "mass_msun": MASSA_SGR_A}
+            for s in estrelas]
+
+
+def orbital_elements(bodies, k=K, n=N, rs=RS_INFORMATIONAL):
+    """
+    Columns of the body dicts (name, a, e, mass_msun and optional tp in
+    years, omega, inc, node in degrees) plus period_yr and the TGU
+    periapsis rate omega_dot (rad/yr).
+    """
+    col = {"name": [str(b["name"]).lower() for b in bodies]}
+    for key, default in (("a", None), ("e", None), ("mass_msun", 1.0), ("tp", 0.0),
+                         ("omega", 0.0), ("inc", 0.0), ("node", 0.0)):
+        col[key] = np.array([b[key] if default is None else b.get(key, default)
+                             for b in bodies], dtype=np.float64)
+    if np.any((col["e"] < 0.0) | (col["e"] >= 1.0)) or np.any(col["a"] <= 0.0):
+        raise ValueError("ephemeris bodies need a > 0 and 0 <= e < 1")
+    col["period_yr"] = np.sqrt(col["a"]**3 / col["mass_msun"])
+    _, _, total = correction(col["a"], col["e"], k=k, n=n, rs=rs)
+    col["omega_dot"] = gr_precession(col["mass_msun"], col["a"], col["e"]) * total / col["period_yr"]
+    return col
+
+
+# ============================================================
+# KEPLER AND CHEBYSHEV FITS
+# ============================================================
+
+def solve_kepler(mean_anomaly, e, tol=1e-12, max_iter=50):
+    """
+    Eccentric anomaly E - e sin E = M, Newton iteration on whole arrays.
+    Convergence is quadratic, so once every step is below `tol` the last
+    one has already brought E to rounding level.
+    """
+    m = np.asarray(mean_anomaly, dtype=np.float64)
+    e = np.broadcast_to(np.asarray(e, dtype=np.float64), m.shape)
+    E = m + 0.85 * e * np.sign(np.sin(m))           # Danby's starting value
+    for _ in range(max_iter):
+        dE = (E - e * np.sin(E) - m) / (1.0 - e * np.cos(E))
+        E -= dE
+        if np.all(np.abs(dE) <= tol * np.maximum(1.0, np.abs(E))):
+            break
+    return E
+
+
+def perifocal(mean_anomaly, a, e):
+    """Position (x, y) in the orbital plane, periapsis on +x."""
+    E = solve_kepler(mean_anomaly, e)
+    return a * (np.cos(E) - e), a * np.sqrt(1.0 - e * e) * np.sin(E)
+
+
+def breakpoints(e, segments):
+    """Mean anomalies of `segments` + 1 breakpoints uniform in E over [0, 2 pi]."""
+    E = np.linspace(0.0, TWO_PI, segments + 1)
+    M = E - e * np.sin(E)
+    M[-1] = TWO_PI
+    return M
+
+
+def _nodes(degree):
+    return np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+
+
+def _chebyshev_matrix(degree):
+    """Values at the Chebyshev nodes -> coefficients (discrete cosine transform)."""
+    k = np.arange(degree + 1)
+    t = np.cos(np.pi * np.outer(k + 0.5, k) / (degree + 1)) * (2.0 / (degree + 1))
+    t[:, 0] *= 0.5
+    return t
+
+
+def _clenshaw(coef, u):
+    """
+    sum_j coef[j] T_j(u) for coef (degree + 1, 2, n) and u (n,); returns
+    (2, n). The recurrence runs in place on three (2, n) buffers.
+    """
+    shape = coef.shape[1:]
+    b1 = np.zeros(shape)
+    b2 = np.zeros(shape)
+    tmp = np.empty(shape)
+    u2 = 2.0 * u
+    for j in range(coef.shape[0] - 1, 0, -1):
+        np.multiply(u2, b1, out=tmp)
+        tmp -= b2
+        tmp += coef[j]
+        b1, b2, tmp = tmp, b1, b2
+    np.multiply(u, b1, out=tmp)
+    tmp -= b2
+    tmp += coef[0]
+    return tmp
+
+
+def fit_orbit(a, e, degree=DEGREE, segments=MIN_SEGMENTS):
+    """Chebyshev coefficients (degree + 1, 2, segments) of one orbit's (x, y)."""
+    M = breakpoints(e, segments)
+    lo, width = M[:-1, None], np.diff(M)[:, None]
+    nodes = lo + 0.5 * (_nodes(degree)[None, :] + 1.0) * width
+    x, y = perifocal(nodes, a, e)
+    t = _chebyshev_matrix(degree)
+    return np.stack([(x @ t).T, (y @ t).T], axis=1)
+
+
+def fit_error(coef, a, e):
+    """Max |fit - exact| (AU) on CHECKS_PER_SEGMENT interior points per segment."""
+    segments = coef.shape[2]
+    M = breakpoints(e, segments)
+    u = np.linspace(-1.0, 1.0, CHECKS_PER_SEGMENT + 2)[1:-1]
+    seg = np.repeat(np.arange(segments), u.size)
+    uu = np.tile(u, segments)
+    m = M[seg] + 0.5 * (uu + 1.0) * (M[seg + 1] - M[seg])
+    fit = _clenshaw(coef[:, :, seg], uu)
+    return float(np.abs(fit - np.stack(perifocal(m, a, e))).max())
+
+
+def fit_adaptive(a, e, degree=DEGREE, tol=TOLERANCE):
+    """Doubles the segment count until the fit error is below tol * a."""
+    segments = MIN_SEGMENTS
+    while True:
+        coef = fit_orbit(a, e, degree, segments)
+        err = fit_error(coef, a, e)
+        if err <= tol * a:
+            return coef, err
+        if segments >= MAX_SEGMENTS:
+            raise ValueError(f"a={a}, e={e}: error {err / a:.3g} a after {segments} segments "
+                             f"(raise the degree or the tolerance)")
+        segments *= 2
+
+
+# ============================================================
+# EPHEMERIS
+# ============================================================
+
+class Ephemeris:
+    """Per-body Chebyshev tables over one orbit plus the precession state."""
+
+    def __init__(self, coef, meta):
+        self.coef = coef
+        self.meta = meta
+        self.degree = meta["degree"]
+        bodies = meta["bodies"]
+        self.names = [b["name"] for b in bodies]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        col = {key: np.array([b[key] for b in bodies], dtype=np.float64)
+               for key in ("a", "e", "period_yr", "tp", "omega_dot", "max_error")}
+        col["offset"] = np.array([b["offset"] for b in bodies], dtype=np.int64)
+        col["segments"] = np.array([b["segments"] for b in bodies], dtype=np.int64)
+        self.elements = col
+        self._omega = np.radians([b["omega"] for b in bodies])
+        inc = np.radians([b["inc"] for b in bodies])
+        node = np.radians([b["node"] for b in bodies])
+        self._cos_inc, self._sin_inc = np.cos(inc), np.sin(inc)
+        self._cos_node, self._sin_node = np.cos(node), np.sin(node)
+        # Breakpoints of all bodies in one sorted array: body i occupies
+        # [i * 2 TWO_PI, i * 2 TWO_PI + TWO_PI], so one searchsorted finds
+        # the segment of mixed-body queries
+        self._shift = 2.0 * TWO_PI
+        self._bounds = np.concatenate([
+            i * self._shift + breakpoints(e, s)[:-1]
+            for i, (e, s) in enumerate(zip(col["e"], col["segments"]))])
+        self._widths = np.concatenate([
+            np.diff(breakpoints(e, s)) for e, s in zip(col["e"], col["segments"])])
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, body):
+        """Row of `body` (name or integer index)."""
+        if isinstance(body, (int, np.integer)):
+            return int(body)
+        try:
+            return self._index[str(body).lower()]
+        except KeyError:
+            raise KeyError(f"unknown body: {body} (known: {', '.join(self.names)})") from None
+
+    # ------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------
+
+    def _evaluate(self, idx, t, x, y, z):
+        el = self.elements
+        phase = (t - el["tp"][idx]) / el["period_yr"][idx]
+        orbits = np.floor(phase)
+        m = (phase - orbits) * TWO_PI
+        key = idx * self._shift + m
+        seg = np.searchsorted(self._bounds, key, side="right") - 1
+        u = 2.0 * (key - self._bounds[seg]) / self._widths[seg] - 1.0
+        np.clip(u, -1.0, 1.0, out=u)
+        xp, yp = _clenshaw(np.take(self.coef, seg, axis=2), u)
+
+        w = self._omega[idx] + el["omega_dot"][idx] * (t - el["tp"][idx])
+        cw, sw = np.cos(w), np.sin(w)
+        x1 = xp * cw - yp * sw
+        y1 = xp * sw + yp * cw
+        cn, sn, ci = self._cos_node[idx], self._sin_node[idx], self._cos_inc[idx]
+        x[...] = x1 * cn - y1 * ci * sn
+        y[...] = x1 * sn + y1 * ci * cn
+        z[...] = y1 * self._sin_inc[idx]
+
+    def positions(self, bodies, t, block=BLOCK):
+        """
+        Positions (x, y, z) in AU of bodies[i] at epoch t[i] (years);
+        `bodies` is an array of indices, a name or an index, broadcast
+        against `t`. Queries are evaluated `block` at a time.
+        """
+        if isinstance(bodies, str):
+            bodies = self.index(bodies)
+        idx, t = np.broadcast_arrays(np.asarray(bodies, dtype=np.int64),
+                                     np.asarray(t, dtype=np.float64))
+        shape = t.shape
+        idx, t = idx.ravel(), t.ravel()
+        if idx.size and (idx.min() < 0 or idx.max() >= len(self)):
+            raise IndexError(f"body index out of range for {len(self)} bodies")
+        x, y, z = (np.empty(t.size) for _ in range(3))
+        with stage("ephemeris.evaluate", t.size):
+            for lo in range(0, t.size, block):
+                s = slice(lo, lo + block)
+                self._evaluate(idx[s], t[s], x[s], y[s], z[s])
+        return x.reshape(shape), y.reshape(shape), z.reshape(shape)
+
+    def position(self, body, t, block=BLOCK):
+        """Positions (x, y, z) in AU of one body at epochs t (years)."""
+        return self.positions(self.index(body), t, block)
+
+    # ------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------
+
+    def save(self, path):
+        """Writes <path>.npy and <path>.json."""
+        stem = _stem(path)
+        directory = os.path.dirname(stem)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.save(stem + ".npy", np.ascontiguousarray(self.coef))
+        with open(stem + ".json", "w", encoding="utf-8") as fh:
+            json.dump(self.meta, fh, indent=2)
+        return stem
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Reads a table written by `save`, memory-mapping the coefficients."""
+        stem = _stem(path)
+        with open(stem + ".json", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{stem}.json: unsupported ephemeris version {meta.get('version')}")
+        coef = np.load(stem + ".npy", mmap_mode="r" if mmap else None)
+        if coef.shape[:2] != (meta["degree"] + 1, 2):
+            raise ValueError(f"{stem}.npy: shape {coef.shape} does not match degree {meta['degree']}")
+        return cls(coef, meta)
+
+
+def _stem(path):
+    path = os.fspath(path)
+    for ext in (".npy", ".json"):
+        if path.endswith(ext):
+            return path[:-len(ext)]
+    return path
+
+
+def build_ephemeris(bodies, path=None, degree=DEGREE, tol=TOLERANCE, **correction_kwargs):
+    """
+    Fits one Chebyshev table per body (see `fit_adaptive`) and returns the
+    Ephemeris; with `path`, also writes it for `Ephemeris.load`.
+    """
+    col = orbital_elements(bodies, **correction_kwargs)
+    tables = []
+    records = []
+    offset = 0
+    with stage("ephemeris.fit", len(col["name"])):
+        for i, name in enumerate(col["name"]):
+            coef, err = fit_adaptive(col["a"][i], col["e"][i], degree, tol)
+            tables.append(coef)
+            record = {key: float(col[key][i]) for key in
+                      ("a", "e", "mass_msun", "tp", "omega", "inc", "node", "period_yr", "omega_dot")}
+            record.update(name=name, offset=offset, segments=coef.shape[2], max_error=err)
+            records.append(record)
+            offset += coef.shape[2]
+    if len(set(col["name"])) != len(col["name"]):
+        raise ValueError("ephemeris body names must be unique")
+    meta = {"version": FORMAT_VERSION, "degree": degree, "tolerance": tol, "bodies": records}
+    coef = np.concatenate(tables, axis=2) if tables else np.empty((degree + 1, 2, 0))
+    eph = Ephemeris(coef, meta)
+    if path is not None:
+        eph.save(path)
+    return eph
+
+
+def exact_positions(eph, body, t):
+    """Reference positions from Kepler's equation at every epoch (for checks)."""
+    i = eph.index(body)
+    b = eph.meta["bodies"][i]
+    phase = (np.asarray(t, dtype=np.float64) - b["tp"]) / b["period_yr"]
+    m = (phase - np.floor(phase)) * TWO_PI
+    xp, yp = perifocal(m, b["a"], b["e"])
+    w = np.radians(b["omega"]) + b["omega_dot"] * (np.asarray(t) - b["tp"])
+    x1 = xp * np.cos(w) - yp * np.sin(w)
+    y1 = xp * np.sin(w) + yp * np.cos(w)
+    inc, node = np.radians(b["inc"]), np.radians(b["node"])
+    return (x1 * np.cos(node) - y1 * np.cos(inc) * np.sin(node),
+            x1 * np.sin(node) + y1 * np.cos(inc) * np.cos(node),
+            y1 * np.sin(inc))
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+SETS = {"planets": planet_bodies, "sstars": s_star_bodies}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build TGU Chebyshev ephemeris tables")
+    parser.add_argument("output", help="table path (writes <output>.npy and <output>.json)")
+    parser.add_argument("--bodies", nargs="+", choices=sorted(SETS), default=sorted(SETS))
+    parser.add_argument("--degree", type=int, default=DEGREE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="max position error in units of a")
+    args = parser.parse_args(argv)
+
+    bodies = [b for name in args.bodies for b in SETS[name]()]
+    eph = build_ephemeris(bodies, args.output, args.degree, args.tolerance)
+    for b in eph.meta["bodies"]:
+        print(f"{b['name']:>8}: {b['segments']:5d} segments | max error {b['max_error']:.2e} AU | "
+              f"omega_dot {b['omega_dot'] * ARCSEC_PER_RAD * 100:10.4f} arcsec/century")
+    print(f"{eph.coef.nbytes / 1024:.1f} KiB -> {_stem(args.output)}.npy")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
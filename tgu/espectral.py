@@ -0,0 +1,260 @@
+"""
+TGU - Análise espectral (FFT) do campo de coerência Her-CrB
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Para malhas periódicas, o gradiente espectral é exato até a frequência de
+Nyquist, ao contrário das diferenças centrais de segunda ordem de
+`np.gradient`:
+
+    ∂I/∂x_a = irfftn( i k_a · rfftn(I) )
+
+e o espectro de potência isotrópico P(|k|) sai da mesma transformada, em
+O(N log N). As transformadas usam entrada real (rfftn, meio espectro) e
+preservam a precisão: float32 → complex64, float64 → complex128.
+
+Com `linhas_por_bloco` (ou entrada memory-mapped) a transformada é feita
+fora da memória, em duas passagens: rfftn nos eixos finais de cada fatia
+do eixo 0, depois FFT ao longo do eixo 0 em blocos de colunas. Fatias e
+blocos de colunas têm no máximo hercrb.BYTES_POR_BLOCO bytes de espectro;
+em 3-D os blocos de colunas cortam os dois eixos finais. O espectro e os
+buffers de trabalho ficam em arquivos temporários sob `trabalho`, então o
+campo completo nunca precisa caber na RAM.
+
+O campo de `gerar_campo_informacional` não é periódico nas bordas; lá o
+gradiente espectral sofre fenômeno de Gibbs e as diferenças finitas
+continuam sendo a referência.
+"""
+
+import contextlib
+import os
+import tempfile
+
+import numpy as np
+
+from .hercrb import BYTES_POR_BLOCO, linhas_por_bloco_padrao
+from .instrument import stage
+
+
+# ============================================================
+# NÚMEROS DE ONDA
+# ============================================================
+
+def numeros_de_onda(forma, espacamento=1.0, dtype=np.float64):
+    """
+    Eixos de k (rad por unidade de comprimento) do espectro de rfftn:
+    fftfreq nos eixos completos e rfftfreq no último.
+    """
+    d = len(forma)
+    ks = [2 * np.pi * np.fft.fftfreq(n, espacamento) for n in forma[:-1]]
+    ks.append(2 * np.pi * np.fft.rfftfreq(forma[-1], espacamento))
+    return [k.astype(dtype).reshape((-1,) + (1,) * (d - 1 - i)) for i, k in enumerate(ks)]
+
+
+def _derivada(k, n):
+    """i·k com o modo de Nyquist zerado (derivada ímpar de sinal real)."""
+    ik = 1j * k
+    if n % 2 == 0:
+        ik[np.abs(k) == np.abs(k).max()] = 0
+    return ik
+
+
+def _complexo(dtype):
+    return np.result_type(dtype, np.complex64)
+
+
+# ============================================================
+# TRANSFORMADAS FORA DA MEMÓRIA
+# ============================================================
+
+def _alocar(forma, dtype, diretorio):
+    if diretorio is None:
+        return np.empty(forma, dtype=dtype)
+    fd, caminho = tempfile.mkstemp(suffix=".npy", dir=diretorio)
+    os.close(fd)
+    return np.lib.format.open_memmap(caminho, mode="w+", dtype=dtype, shape=forma)
+
+
+def _fatias(n, passo):
+    for inicio in range(0, n, passo):
+        yield slice(inicio, min(inicio + passo, n))
+
+
+def _blocos_colunas(forma, itemsize, orcamento=None):
+    """
+    Índices de blocos de colunas inteiras do eixo 0 com no máximo
+    `orcamento` bytes: corta o primeiro eixo final cujo resto cabe no
+    bloco e percorre, um a um, os eixos finais anteriores a ele.
+    """
+    colunas = max(1, (orcamento or BYTES_POR_BLOCO) // (forma[0] * itemsize))
+    finais = forma[1:]
+    for eixo in range(len(finais)):
+        resto = int(np.prod(finais[eixo + 1:], dtype=np.int64))
+        if resto <= colunas:
+            break
+    passo = max(1, colunas // resto)
+    for externo in np.ndindex(*finais[:eixo]):
+        fixos = tuple(slice(i, i + 1) for i in externo)
+        for s in _fatias(finais[eixo], passo):
+            yield (slice(None),) + fixos + (s,)
+
+
+def _linhas(forma_espectro, dtype, linhas_por_bloco):
+    return linhas_por_bloco or linhas_por_bloco_padrao(forma_espectro, _complexo(dtype))
+
+
+def _rfftn_em_fatias(campo, espectro, linhas):
+    """espectro = rfftn(campo), fatia a fatia do eixo 0 e bloco a bloco de colunas."""
+    eixos_finais = tuple(range(1, campo.ndim))
+    with stage("espectral.rfftn", campo.size):
+        for s in _fatias(campo.shape[0], linhas):
+            espectro[s] = np.fft.rfftn(np.asarray(campo[s]), axes=eixos_finais)
+        for indice in _blocos_colunas(espectro.shape, espectro.itemsize):
+            espectro[indice] = np.fft.fft(espectro[indice], axis=0)
+    return espectro
+
+
+def _usar_fatias(campo, linhas_por_bloco):
+    return linhas_por_bloco is not None or isinstance(campo, np.memmap)
+
+
+def _diretorio_trabalho(trabalho):
+    """Diretório temporário para os buffers, ou None (em memória)."""
+    if trabalho is None:
+        return contextlib.nullcontext()
+    return tempfile.TemporaryDirectory(dir=trabalho)
+
+
+# ============================================================
+# GRADIENTE ESPECTRAL
+# ============================================================
+
+def gradiente_espectral(campo, espacamento=1.0, saida=None, linhas_por_bloco=None,
+                        trabalho=None):
+    """
+    Magnitude |∇I| do campo 2-D ou 3-D, derivando no espaço de Fourier.
+
+    espacamento : distância entre células (1.0 = mesma escala de np.gradient)
+    saida : array (ou memmap) float de mesma forma para o resultado
+    linhas_por_bloco : ativa o caminho fora da memória (planos do eixo 0
+                       por fatia; 0 usa o orçamento BYTES_POR_BLOCO)
+    trabalho : diretório para os buffers complexos desse caminho;
+               None os mantém em memória
+    """
+    campo_arr = campo if isinstance(campo, np.ndarray) else np.asarray(campo)
+    forma = campo_arr.shape
+    dtype = np.result_type(campo_arr.dtype, np.float32)
+    if saida is None:
+        saida = np.empty(forma, dtype=dtype)
+    ks = numeros_de_onda(forma, espacamento, dtype)
+    iks = [_derivada(k, n) for k, n in zip(ks, forma)]
+
+    if not _usar_fatias(campo_arr, linhas_por_bloco):
+        espectro = np.fft.rfftn(campo_arr)
+        tmp = np.empty_like(espectro)
+        componente = np.empty(forma, dtype=dtype)
+        with stage("espectral.gradiente", campo_arr.size):
+            for a, ik in enumerate(iks):
+                np.multiply(espectro, ik, out=tmp)
+                np.fft.irfftn(tmp, s=forma, axes=tuple(range(len(forma))), out=componente)
+                if a == 0:
+                    np.square(componente, out=saida)
+                else:
+                    componente *= componente
+                    saida += componente
+            np.sqrt(saida, out=saida)
+        return saida
+
+    forma_espectro = forma[:-1] + (forma[-1] // 2 + 1,)
+    linhas = _linhas(forma_espectro, dtype, linhas_por_bloco)
+    with _diretorio_trabalho(trabalho) as tmpdir:
+        espectro = _alocar(forma_espectro, _complexo(dtype), tmpdir)
+        deriv0 = _alocar(forma_espectro, _complexo(dtype), tmpdir)
+        _rfftn_em_fatias(campo_arr, espectro, linhas)
+
+        # Volta do eixo 0, por blocos de colunas: deriv0 com i·k_0 e o
+        # próprio espectro sem (a derivada nos demais eixos comuta com ela)
+        eixos_finais = tuple(range(1, len(forma)))
+        with stage("espectral.gradiente", campo_arr.size):
+            for indice in _blocos_colunas(forma_espectro, espectro.itemsize):
+                bloco = np.asarray(espectro[indice])
+                deriv0[indice] = np.fft.ifft(bloco * iks[0], axis=0)
+                espectro[indice] = np.fft.ifft(bloco, axis=0)
+
+            for s in _fatias(forma[0], linhas):
+                parcial = np.fft.irfftn(deriv0[s], s=forma[1:], axes=eixos_finais)
+                soma = np.square(parcial, out=parcial)
+                meio = espectro[s]
+                for ik in iks[1:]:
+                    d = np.fft.irfftn(meio * ik, s=forma[1:], axes=eixos_finais)
+                    d *= d
+                    soma += d
+                saida[s] = np.sqrt(soma, out=soma)
+        del espectro, deriv0
+    if isinstance(saida, np.memmap):
+        saida.flush()
+    return saida
+
+
+# ============================================================
+# ESPECTRO DE POTÊNCIA ISOTRÓPICO
+# ============================================================
+
+def espectro_potencia(campo, n_bins=None, espacamento=1.0, linhas_por_bloco=None,
+                      trabalho=None):
+    """
+    Espectro de potência isotrópico P(|k|) = <|F(k)|²> · Δx^d / N, com a
+    média em cascas de largura Δk = 2π / (n_min Δx) centradas em j·Δk,
+    j = 1 .. n_bins (padrão: até o Nyquist do menor eixo). O modo k = 0
+    (a média do campo) fica de fora.
+
+    Retorna (k_centros, potencia, modos); `modos` conta os modos de Fourier
+    de cada casca (os do meio espectro de rfftn contam duas vezes).
+    """
+    campo_arr = campo if isinstance(campo, np.ndarray) else np.asarray(campo)
+    forma = campo_arr.shape
+    dtype = np.result_type(campo_arr.dtype, np.float32)
+    n_total = campo_arr.size
+    if n_bins is None:
+        n_bins = min(forma) // 2
+    dk = 2 * np.pi / (min(forma) * espacamento)
+    bordas = (np.arange(n_bins + 1) + 0.5) * dk
+    ks = numeros_de_onda(forma, espacamento, np.float64)
+
+    # Peso 2 para os modos com par conjugado omitido pelo meio espectro
+    n_ult = forma[-1]
+    peso_ult = np.full(n_ult // 2 + 1, 2.0)
+    peso_ult[0] = 1.0
+    if n_ult % 2 == 0:
+        peso_ult[-1] = 1.0
+
+    potencia = np.zeros(n_bins + 2)
+    modos = np.zeros(n_bins + 2)
+
+    def acumular(bloco, k0):
+        kmag = k0 * k0
+        for k in ks[1:]:
+            kmag = kmag + k * k
+        np.sqrt(kmag, out=kmag)
+        idx = np.digitize(kmag, bordas)        # 0 = modo k=0, n_bins+1 = fora
+        pesos = np.broadcast_to(peso_ult, bloco.shape)
+        p = np.abs(bloco) ** 2
+        potencia[:] += np.bincount(idx.ravel(), (p * pesos).ravel(), minlength=n_bins + 2)
+        modos[:] += np.bincount(idx.ravel(), pesos.ravel(), minlength=n_bins + 2)
+
+    with stage("espectral.potencia", n_total):
+        if not _usar_fatias(campo_arr, linhas_por_bloco):
+            acumular(np.fft.rfftn(campo_arr), ks[0])
+        else:
+            forma_espectro = forma[:-1] + (forma[-1] // 2 + 1,)
+            linhas = _linhas(forma_espectro, dtype, linhas_por_bloco)
+            with _diretorio_trabalho(trabalho) as tmpdir:
+                espectro = _alocar(forma_espectro, _complexo(dtype), tmpdir)
+                _rfftn_em_fatias(campo_arr, espectro, linhas)
+                for s in _fatias(forma[0], linhas):
+                    acumular(np.asarray(espectro[s]), ks[0][s])
+                del espectro
+
+    fator = espacamento ** len(forma) / n_total
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = potencia[1:-1] / modos[1:-1] * fator
+    return np.arange(1, n_bins + 1) * dk, media, modos[1:-1]
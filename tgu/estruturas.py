@@ -0,0 +1,303 @@
+"""
+TGU - Extração de filamentos e estruturas no campo de coerência
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Limiariza campo_I (I ≥ limiar), rotula as regiões conexas (vizinhança por
+faces: 4 em 2-D, 6 em 3-D) e mede, para cada estrutura:
+
+    celulas      número de células
+    massa        Σ I nas células
+    bbox_min/max caixa envolvente, em índices da malha
+    centro       centroide das células × espaçamento (origem na célula 0)
+    extensao     tamanho da caixa por eixo × espaçamento
+    comprimento  eixo principal: √(12 λ_max + Δ²), com λ_max o maior
+                 autovalor da covariância das posições e Δ o espaçamento
+                 (exato para uma barra reta de células)
+
+O rótulo é um union-find vetorizado: cada rodada pendura a raiz maior de
+cada aresta na menor (np.minimum.at) e comprime os ponteiros por saltos
+(parent = parent[parent]) até todas as células apontarem para a raiz, com
+as arestas já resolvidas descartadas a cada rodada.
+
+A malha é percorrida em fatias do eixo 0. Só a fatia atual e o último
+plano da anterior ficam em memória: as estatísticas de cada rótulo local
+são somas (contagem, massa, momentos) ou extremos (caixa), e os rótulos
+que se tocam através da fronteira entre fatias são unidos num segundo
+union-find global, pequeno, ao final.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import memoize
+from .hercrb import (
+    EXTENSAO,
+    LIMIAR_FILAMENTO,
+    _coordenadas,
+    _fatia_campo,
+    _validar_forma,
+    linhas_por_bloco_padrao,
+)
+from .instrument import stage
+
+
+# ============================================================
+# UNION-FIND VETORIZADO
+# ============================================================
+
+def _unir(n, u, v):
+    """
+    Componentes de um grafo com n nós e arestas (u, v). Retorna, para
+    cada nó, a menor raiz do seu componente.
+    """
+    pai = np.arange(n, dtype=np.int64)
+    while u.size:
+        pu = pai[u]
+        pv = pai[v]
+        pendentes = pu != pv
+        if not pendentes.any():
+            break
+        u, v, pu, pv = u[pendentes], v[pendentes], pu[pendentes], pv[pendentes]
+        # Gancho: raiz maior → menor raiz vizinha (sem ciclos, pois menor < maior)
+        np.minimum.at(pai, np.maximum(pu, pv), np.minimum(pu, pv))
+        # Saltos de ponteiro até compressão total
+        while True:
+            avo = pai[pai]
+            if np.array_equal(avo, pai):
+                break
+            pai = avo
+    return pai
+
+
+def rotular(mascara):
+    """
+    Rótulos conexos (vizinhança por faces) de uma máscara 2-D ou 3-D.
+    Retorna (rotulos, n): rotulos vale -1 fora da máscara e 0..n-1 dentro,
+    numerados na ordem da primeira célula de cada componente.
+    """
+    mascara = np.asarray(mascara, dtype=bool)
+    celulas = np.flatnonzero(mascara)
+    indice = np.full(mascara.shape, -1, dtype=np.int64)
+    indice.flat[celulas] = np.arange(celulas.size)
+
+    us, vs = [], []
+    for eixo in range(mascara.ndim):
+        n = mascara.shape[eixo]
+        a = np.take(indice, np.arange(n - 1), axis=eixo)
+        b = np.take(indice, np.arange(1, n), axis=eixo)
+        ligados = (a >= 0) & (b >= 0)
+        us.append(a[ligados])
+        vs.append(b[ligados])
+
+    raiz = _unir(celulas.size, np.concatenate(us), np.concatenate(vs))
+    # Raízes são as menores células de cada componente: já vêm em ordem
+    _, compacto = np.unique(raiz, return_inverse=True)
+    indice.flat[celulas] = compacto
+    return indice, int(compacto.max()) + 1 if compacto.size else 0
+
+
+# ============================================================
+# ESTATÍSTICAS POR RÓTULO
+# ============================================================
+
+def _momentos_vazios(d):
+    return {
+        "celulas": np.zeros(0, dtype=np.int64),
+        "massa": np.zeros(0),
+        "soma": np.zeros((0, d)),
+        "soma2": np.zeros((0, d, d)),
+        "bbox_min": np.zeros((0, d), dtype=np.int64),
+        "bbox_max": np.zeros((0, d), dtype=np.int64),
+    }
+
+
+def _momentos_fatia(rotulos, n, campo, inicio):
+    """Somas e extremos por rótulo de uma fatia que começa no plano `inicio`."""
+    d = rotulos.ndim
+    dentro = np.flatnonzero(rotulos >= 0)
+    lab = rotulos.ravel()[dentro]
+    coords = np.stack(np.unravel_index(dentro, rotulos.shape), axis=1)
+    coords[:, 0] += inicio
+    x = coords.astype(np.float64)
+
+    m = {
+        "celulas": np.bincount(lab, minlength=n),
+        "massa": np.bincount(lab, np.asarray(campo, dtype=np.float64).ravel()[dentro], minlength=n),
+        "soma": np.stack([np.bincount(lab, x[:, i], minlength=n) for i in range(d)], axis=1),
+        "soma2": np.empty((n, d, d)),
+        "bbox_min": np.full((n, d), np.iinfo(np.int64).max, dtype=np.int64),
+        "bbox_max": np.full((n, d), -1, dtype=np.int64),
+    }
+    for i in range(d):
+        for j in range(i, d):
+            m["soma2"][:, i, j] = m["soma2"][:, j, i] = np.bincount(lab, x[:, i] * x[:, j], minlength=n)
+        np.minimum.at(m["bbox_min"][:, i], lab, coords[:, i])
+        np.maximum.at(m["bbox_max"][:, i], lab, coords[:, i])
+    return m
+
+
+def _reduzir(momentos, grupo, n_grupos):
+    """Combina as linhas de `momentos` que caem no mesmo grupo."""
+    d = momentos["soma"].shape[1]
+    out = {
+        "celulas": np.bincount(grupo, momentos["celulas"], minlength=n_grupos).astype(np.int64),
+        "massa": np.bincount(grupo, momentos["massa"], minlength=n_grupos),
+        "soma": np.zeros((n_grupos, d)),
+        "soma2": np.zeros((n_grupos, d, d)),
+        "bbox_min": np.full((n_grupos, d), np.iinfo(np.int64).max, dtype=np.int64),
+        "bbox_max": np.full((n_grupos, d), -1, dtype=np.int64),
+    }
+    np.add.at(out["soma"], grupo, momentos["soma"])
+    np.add.at(out["soma2"], grupo, momentos["soma2"])
+    np.minimum.at(out["bbox_min"], grupo, momentos["bbox_min"])
+    np.maximum.at(out["bbox_max"], grupo, momentos["bbox_max"])
+    return out
+
+
+def _medidas(m, espacamento, min_celulas):
+    """Estatísticas finais, ordenadas por massa decrescente."""
+    manter = m["celulas"] >= min_celulas
+    m = {k: v[manter] for k, v in m.items()}
+    n = m["celulas"].astype(np.float64)
+    media = m["soma"] / n[:, None]
+    espacamento = np.broadcast_to(np.asarray(espacamento, dtype=np.float64), media.shape[1:])
+    cov = m["soma2"] / n[:, None, None] - media[:, :, None] * media[:, None, :]
+    cov *= np.multiply.outer(espacamento, espacamento)
+    lam = np.linalg.eigvalsh(cov)[:, -1] if len(n) else np.zeros(0)
+    ordem = np.argsort(-m["massa"], kind="stable")
+
+    return {
+        "n_estruturas": int(len(n)),
+        "celulas": m["celulas"][ordem],
+        "massa": m["massa"][ordem],
+        "centro": (media * espacamento)[ordem],
+        "bbox_min": m["bbox_min"][ordem],
+        "bbox_max": m["bbox_max"][ordem],
+        "extensao": ((m["bbox_max"] - m["bbox_min"] + 1) * espacamento)[ordem],
+        "comprimento": np.sqrt(12.0 * np.maximum(lam, 0.0) + espacamento.max() ** 2)[ordem],
+    }
+
+
+# ============================================================
+# EXTRAÇÃO EM FATIAS
+# ============================================================
+
+def extrair_estruturas_blocos(blocos, limiar=LIMIAR_FILAMENTO, espacamento=1.0, min_celulas=1):
+    """
+    Estruturas de um campo dado como sequência de fatias consecutivas do
+    eixo 0, (inicio, fim, campo_fatia). Só uma fatia fica em memória.
+
+    Retorna o dict descrito no cabeçalho do módulo (arrays por estrutura,
+    ordenados por massa decrescente) mais "n_estruturas".
+    """
+    partes = []
+    arestas_u, arestas_v = [], []
+    plano_anterior = None
+    proximo = 0
+    fim_anterior = None
+    d = None
+
+    for inicio, fim, campo in blocos:
+        if fim_anterior is not None and inicio != fim_anterior:
+            raise ValueError("as fatias devem ser consecutivas ao longo do eixo 0")
+        d = campo.ndim
+        with stage("estruturas.rotular", campo.size):
+            rotulos, n = rotular(np.asarray(campo) >= limiar)
+        with stage("estruturas.momentos", campo.size):
+            partes.append(_momentos_fatia(rotulos, n, campo, inicio))
+
+        # Rótulos globais e uniões através da fronteira com a fatia anterior
+        globais = np.where(rotulos >= 0, rotulos + proximo, -1)
+        if plano_anterior is not None:
+            tocam = (plano_anterior >= 0) & (globais[0] >= 0)
+            arestas_u.append(plano_anterior[tocam])
+            arestas_v.append(globais[0][tocam])
+        plano_anterior = globais[-1].copy()
+        proximo += n
+        fim_anterior = fim
+
+    if d is None:
+        raise ValueError("nenhuma fatia recebida")
+    momentos = {k: np.concatenate([p[k] for p in partes]) if partes else v
+                for k, v in _momentos_vazios(d).items()}
+
+    u = np.concatenate(arestas_u) if arestas_u else np.zeros(0, dtype=np.int64)
+    v = np.concatenate(arestas_v) if arestas_v else np.zeros(0, dtype=np.int64)
+    raiz = _unir(proximo, u, v)
+    _, grupo = np.unique(raiz, return_inverse=True)
+    n_grupos = int(grupo.max()) + 1 if grupo.size else 0
+    return _medidas(_reduzir(momentos, grupo, n_grupos), espacamento, min_celulas)
+
+
+def extrair_estruturas(campo, limiar=LIMIAR_FILAMENTO, espacamento=1.0, min_celulas=1,
+                       linhas_por_bloco=None):
+    """
+    Estruturas de um campo 2-D ou 3-D já existente (array ou memmap .npy),
+    lido em fatias de `linhas_por_bloco` planos do eixo 0 (None:
+    `linhas_por_bloco_padrao`).
+    """
+    n0 = campo.shape[0]
+    linhas_por_bloco = linhas_por_bloco or linhas_por_bloco_padrao(campo.shape, campo.dtype)
+    blocos = ((i, min(i + linhas_por_bloco, n0), campo[i:i + linhas_por_bloco])
+              for i in range(0, n0, linhas_por_bloco))
+    return extrair_estruturas_blocos(blocos, limiar, espacamento, min_celulas)
+
+
+@memoize("estruturas.estruturas_realizacao")
+def estruturas_realizacao(forma, semente=0, realizacao=None, dtype=np.float64,
+                          limiar=LIMIAR_FILAMENTO, min_celulas=1, extensao=EXTENSAO,
+                          linhas_por_bloco=None):
+    """
+    Gera uma realização do campo Her-CrB fatia a fatia (mesmos fluxos de
+    `gerar_campo_em_blocos`) e extrai suas estruturas sem guardar a malha.
+    O espaçamento é o da malha em unidades de `extensao`.
+    """
+    forma = _validar_forma(forma)
+    dtype = np.dtype(dtype)
+    linhas_por_bloco = linhas_por_bloco or linhas_por_bloco_padrao(forma, dtype)
+    eixos = _coordenadas(forma, extensao, dtype)
+    espacamento = [(extensao[1] - extensao[0]) / max(n - 1, 1) for n in forma]
+    blocos = ((i, min(i + linhas_por_bloco, forma[0]),
+               _fatia_campo(eixos, i, min(i + linhas_por_bloco, forma[0]), semente, realizacao, dtype))
+              for i in range(0, forma[0], linhas_por_bloco))
+    return extrair_estruturas_blocos(blocos, limiar, espacamento, min_celulas)
+
+
+def _resumo_tarefa(args):
+    forma, semente, j, dtype, limiar, min_celulas, linhas_por_bloco = args
+    # Sem cache por realização: só o ensemble inteiro é guardado
+    res = estruturas_realizacao.__wrapped__(forma, semente, j, dtype, limiar, min_celulas,
+                                            linhas_por_bloco=linhas_por_bloco)
+    if res["n_estruturas"] == 0:
+        return 0, 0.0, 0.0
+    return res["n_estruturas"], float(res["massa"][0]), float(res["comprimento"][0])
+
+
+@memoize("estruturas.ensemble_estruturas", ignore=("processos",))
+def ensemble_estruturas(n_realizacoes, forma, semente=0, processos=None, dtype=np.float64,
+                        limiar=LIMIAR_FILAMENTO, min_celulas=1,
+                        linhas_por_bloco=None):
+    """
+    Contagem de estruturas e massa/comprimento da maior em cada realização
+    de um ensemble, num pool de processos (processos=1 roda no processo
+    atual). As realizações usam os mesmos fluxos de `ensemble_campos`.
+    """
+    forma = _validar_forma(forma)
+    tarefas = [(forma, semente, j, dtype, limiar, min_celulas, linhas_por_bloco)
+               for j in range(n_realizacoes)]
+    if processos == 1:
+        resumos = list(map(_resumo_tarefa, tarefas))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            resumos = list(pool.map(_resumo_tarefa, tarefas))
+
+    resumos = np.array(resumos, dtype=np.float64).reshape(-1, 3)
+    return {
+        "n_realizacoes": n_realizacoes,
+        "forma": forma,
+        "semente": semente,
+        "n_estruturas": resumos[:, 0].astype(np.int64),
+        "massa_maior": resumos[:, 1],
+        "comprimento_maior": resumos[:, 2],
+    }
@@ -0,0 +1,382 @@
+"""
+TGU - Ajuste de curvas de rotação (M_disk, R_d, K_TGU, N_COHERENCE)
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Levenberg-Marquardt com Jacobianos analíticos, construído sobre
+`massa_disco_exponencial` e `velocidade_tgu`:
+
+    v(r) = v_newton(r, M(r)) * sqrt(I(r)/I0) * sqrt(ε^-n)
+
+Parâmetros livres por galáxia: log M_disk, log R_d, k e (opcionalmente) n.
+Os ajustes independentes rodam em paralelo num pool de processos; o ajuste
+global compartilha um único k entre todas as galáxias e resolve o sistema
+em forma de seta (blocos por galáxia + coluna de k) de uma vez, vetorizado.
+
+Cada galáxia é um dict no mesmo estilo da lista `exoplanets`:
+    {"nome": "NGC 3198", "r_kpc": array, "v_obs": array, "sigma_v": array}
+
+Com "modelo" (um `massa.ModeloMassa`) ou "M_r" (massa encerrada tabelada
+em r_kpc, com "R_d" fixo para o gradiente informacional) a massa vem da
+tabela M_i(r) em cache do modelo, e os parâmetros livres passam a ser o
+log da escala (razão massa-luz) de cada componente, k e n. Sem eles vale o
+disco exponencial fechado, com o Jacobiano analítico acima.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .galaxy import (
+    K_TGU,
+    N_COHERENCE,
+    R_S_INFO,
+    massa_disco_exponencial,
+    velocidade_tgu,
+)
+from .massa import MassaTabelada, ModeloMassa
+
+PARAMETROS = ("log_M_disk", "log_R_d", "k", "n")
+
+MAX_ITER = 200
+TOL = 1e-10
+
+
+# ============================================================
+# MODELO E JACOBIANO ANALÍTICO
+# ============================================================
+
+def modelo_e_jacobiano(r_kpc, log_M_disk, log_R_d, k, n=N_COHERENCE, rs=R_S_INFO):
+    """
+    Velocidade TGU e suas derivadas em relação a (log M_disk, log R_d, k, n).
+
+    Com log v = ½ log(G M / r) + ½ log(1 + k x) - ½ n log ε e x = r / R_d:
+        ∂v/∂log M_disk = v / 2
+        ∂v/∂log R_d    = v / 2 * (-x² e^-x / (M/M_disk) - k x / (1 + k x))
+        ∂v/∂k          = v / 2 * x / (1 + k x)
+        ∂v/∂n          = -v / 2 * log ε
+
+    Retorna (v, J) com J de forma v.shape + (4,).
+    """
+    M_disk = np.exp(log_M_disk)
+    R_d = np.exp(log_R_d)
+    x = r_kpc / R_d
+
+    M_r = massa_disco_exponencial(r_kpc, M_disk, R_d)
+    v = velocidade_tgu(r_kpc, M_r, R_d, k, n, rs)
+
+    fracao_massa = -np.expm1(-x) - x * np.exp(-x)     # M(r) / M_disk
+    g = 1.0 + k * x
+    log_eps = np.log1p((rs / np.maximum(r_kpc, 1e-6))**2)
+
+    meio_v = 0.5 * v
+    J = np.empty(np.shape(v) + (len(PARAMETROS),))
+    J[..., 0] = meio_v
+    J[..., 1] = meio_v * (-x**2 * np.exp(-x) / fracao_massa - k * x / g)
+    J[..., 2] = meio_v * x / g
+    J[..., 3] = -meio_v * log_eps
+    return v, J
+
+
+def modelo_massa_e_jacobiano(r_kpc, modelo, log_escalas, k, n=N_COHERENCE, rs=R_S_INFO):
+    """
+    Velocidade TGU de um `ModeloMassa` e suas derivadas em relação a
+    (log escala_0, ..., log escala_{c-1}, k, n), a partir da tabela
+    M_i(r) em cache do modelo (sem refazer a integração):
+        ∂v/∂log escala_i = v / 2 * escala_i M_i(r) / M(r)
+    e ∂v/∂k, ∂v/∂n como em `modelo_e_jacobiano`, com x = r / modelo.R_d.
+
+    Retorna (v, J) com J de forma r.shape + (c + 2,).
+    """
+    r = np.asarray(r_kpc, dtype=np.float64)
+    tabela = modelo.tabela(r)                                   # (c,) + r.shape
+    parcelas = np.exp(np.asarray(log_escalas, dtype=np.float64)).reshape(
+        (-1,) + (1,) * r.ndim) * tabela
+    M_r = parcelas.sum(axis=0)
+    v = velocidade_tgu(r, M_r, modelo.R_d, k, n, rs)
+
+    x = r / modelo.R_d
+    g = 1.0 + k * x
+    log_eps = np.log1p((rs / np.maximum(r, 1e-6))**2)
+
+    c = tabela.shape[0]
+    meio_v = 0.5 * v
+    J = np.empty(r.shape + (c + 2,))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        J[..., :c] = np.moveaxis(meio_v * parcelas / M_r, 0, -1)
+    J[..., c] = meio_v * x / g
+    J[..., c + 1] = -meio_v * log_eps
+    return v, J
+
+
+def _modelo_da_galaxia(galaxia):
+    """ModeloMassa da galáxia ("modelo" ou "M_r" tabelada), ou None (disco exponencial)."""
+    modelo = galaxia.get("modelo")
+    if modelo is None and "M_r" in galaxia:
+        if "R_d" not in galaxia:
+            raise ValueError("M_r tabelada precisa de R_d (escala do gradiente informacional)")
+        modelo = ModeloMassa(MassaTabelada(galaxia["r_kpc"], galaxia["M_r"]), R_d=galaxia["R_d"])
+    return modelo
+
+
+# ============================================================
+# AJUSTE DE UMA GALÁXIA
+# ============================================================
+
+def _chute_inicial(galaxia):
+    """M_disk pelo ponto mais externo (Kepler) e R_d ≈ r_max / 5."""
+    r = np.asarray(galaxia["r_kpc"], dtype=np.float64)
+    v = np.asarray(galaxia["v_obs"], dtype=np.float64)
+    i = np.argmax(r)
+    # v² = G M / r  →  M = v² r / G em unidades de massas solares
+    M = (v[i] * 1e3)**2 * (r[i] * 3.085677581e19) / (6.67430e-11 * 1.98847e30)
+    return np.log(max(M, 1e6)), np.log(max(r[i] / 5.0, 1e-3))
+
+
+def ajustar_galaxia(galaxia, k=K_TGU, n=N_COHERENCE, rs=R_S_INFO,
+                    ajustar_k=True, ajustar_n=False, max_iter=MAX_ITER, tol=TOL, modelo=None):
+    """
+    Ajusta M_disk, R_d e os parâmetros TGU a uma curva de rotação.
+
+    ajustar_k / ajustar_n : libera k e n; com rs = 0 (padrão galáctico) o
+                            fator de coerência é 1 e n não é identificável.
+    modelo : `ModeloMassa` (padrão: galaxia["modelo"] ou galaxia["M_r"]);
+             ajusta as escalas dos componentes no lugar de M_disk e R_d.
+    Retorna um dict com os parâmetros, erros (1σ), χ² e χ²_red.
+    """
+    r = np.asarray(galaxia["r_kpc"], dtype=np.float64)
+    v_obs = np.asarray(galaxia["v_obs"], dtype=np.float64)
+    sigma = np.asarray(galaxia.get("sigma_v", np.ones_like(v_obs)), dtype=np.float64)
+
+    modelo = _modelo_da_galaxia(galaxia) if modelo is None else modelo
+    if modelo is None:
+        log_M, log_Rd = _chute_inicial(galaxia)
+        if "M_disk" in galaxia:
+            log_M = np.log(galaxia["M_disk"])
+        if "R_d" in galaxia:
+            log_Rd = np.log(galaxia["R_d"])
+        theta = np.array([log_M, log_Rd, k, n], dtype=np.float64)
+        nomes = PARAMETROS
+
+        def jacobiano(t):
+            return modelo_e_jacobiano(r, t[0], t[1], t[2], t[3], rs)
+    else:
+        c = len(modelo.componentes)
+        theta = np.concatenate([np.log(modelo.escalas), [k, n]])
+        nomes = tuple(f"log_escala_{i}" for i in range(c)) + ("k", "n")
+
+        def jacobiano(t):
+            return modelo_massa_e_jacobiano(r, modelo, t[:c], t[c], t[c + 1], rs)
+    livres = np.ones(theta.size, dtype=bool)
+    livres[-2:] = (ajustar_k, ajustar_n)
+
+    def residuos(t):
+        # Passos que levam 1 + k x < 0 viram NaN e são rejeitados pelo LM
+        with np.errstate(invalid="ignore"):
+            v, J = jacobiano(t)
+        return (v - v_obs) / sigma, J[:, livres] / sigma[:, None]
+
+    res, J = residuos(theta)
+    chi2 = res @ res
+    lam = 1e-3
+    convergiu = False
+    iteracao = 0
+    for iteracao in range(1, max_iter + 1):
+        JtJ = J.T @ J
+        grad = J.T @ res
+        passo = np.linalg.solve(JtJ + lam * np.diag(np.diag(JtJ) + 1e-12), -grad)
+        candidato = theta.copy()
+        candidato[livres] += passo
+        res_c, J_c = residuos(candidato)
+        chi2_c = res_c @ res_c
+        if np.isfinite(chi2_c) and chi2_c < chi2:
+            melhora = chi2 - chi2_c
+            theta, res, J, chi2 = candidato, res_c, J_c, chi2_c
+            lam = max(lam / 10.0, 1e-12)
+            if melhora <= tol * max(chi2, 1.0):
+                convergiu = True
+                break
+        else:
+            lam *= 10.0
+            if lam > 1e12:
+                convergiu = True
+                break
+
+    graus = max(len(r) - int(livres.sum()), 1)
+    try:
+        cov = np.linalg.inv(J.T @ J) * (chi2 / graus)
+        erros_livres = np.sqrt(np.diag(cov))
+    except np.linalg.LinAlgError:
+        erros_livres = np.full(int(livres.sum()), np.nan)
+    erros = np.zeros(theta.size)
+    erros[livres] = erros_livres
+
+    if modelo is None:
+        massa = {"M_disk": float(np.exp(theta[0])), "R_d": float(np.exp(theta[1]))}
+    else:
+        massa = {"escalas": np.exp(theta[:-2]).tolist(), "R_d": float(modelo.R_d)}
+    return {
+        "nome": galaxia.get("nome", ""),
+        **massa,
+        "k": float(theta[-2]),
+        "n": float(theta[-1]),
+        "erros": dict(zip(nomes, erros.tolist())),
+        "chi2": float(chi2),
+        "chi2_red": float(chi2 / graus),
+        "iteracoes": iteracao,
+        "convergiu": convergiu,
+    }
+
+
+def _ajustar_galaxia_kwargs(args):
+    galaxia, kwargs = args
+    return ajustar_galaxia(galaxia, **kwargs)
+
+
+def ajustar_amostra(galaxias, processos=None, chunksize=8, **kwargs):
+    """
+    Ajusta cada galáxia de forma independente, distribuindo as galáxias
+    por um pool de processos (processos=1 roda no processo atual).
+    Os resultados voltam na ordem de `galaxias`.
+    """
+    tarefas = [(g, kwargs) for g in galaxias]
+    if processos == 1:
+        return [_ajustar_galaxia_kwargs(t) for t in tarefas]
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        return list(pool.map(_ajustar_galaxia_kwargs, tarefas, chunksize=chunksize))
+
+
+# ============================================================
+# AJUSTE GLOBAL (k COMPARTILHADO)
+# ============================================================
+
+def _empilhar(galaxias):
+    """Empilha curvas de tamanhos diferentes em arrays (n_gal, n_max) com máscara."""
+    n_max = max(len(g["r_kpc"]) for g in galaxias)
+    forma = (len(galaxias), n_max)
+    r = np.ones(forma)
+    v = np.zeros(forma)
+    peso = np.zeros(forma)          # 1/σ, zero no preenchimento
+    for i, g in enumerate(galaxias):
+        m = len(g["r_kpc"])
+        r[i, :m] = g["r_kpc"]
+        v[i, :m] = g["v_obs"]
+        peso[i, :m] = 1.0 / np.asarray(g.get("sigma_v", np.ones(m)), dtype=np.float64)
+    return r, v, peso
+
+
+def ajustar_k_global(galaxias, k=K_TGU, n=N_COHERENCE, rs=R_S_INFO,
+                     iniciais=None, max_iter=MAX_ITER, tol=TOL):
+    """
+    Ajuste simultâneo dos parâmetros de massa por galáxia — (M_disk, R_d)
+    do disco exponencial, ou as escalas dos componentes de "modelo"/"M_r" —
+    e de um k global.
+
+    O sistema normal tem forma de seta: blocos P×P independentes por
+    galáxia (P = maior número de parâmetros locais; os que sobram ficam
+    fixos) mais uma linha/coluna para k. O complemento de Schur elimina os
+    blocos, então cada iteração custa O(n_gal × n_r), toda vetorizada.
+
+    iniciais : resultados de `ajustar_amostra` para usar como ponto de partida
+    Retorna um dict com k, erro_k, χ² e a lista de parâmetros por galáxia.
+    """
+    r, v_obs, peso = _empilhar(galaxias)
+    tamanhos = [len(g["r_kpc"]) for g in galaxias]
+    modelos = [_modelo_da_galaxia(g) for g in galaxias]
+    n_locais = np.array([2 if m is None else len(m.componentes) for m in modelos])
+    P = int(n_locais.max())
+    livre = np.arange(P) < n_locais[:, None]
+    exponenciais = np.flatnonzero([m is None for m in modelos])
+    com_modelo = np.flatnonzero([m is not None for m in modelos])
+
+    # log M_disk, log R_d (disco exponencial) ou log escalas (modelo)
+    locais = np.zeros((len(galaxias), P))
+    for i, (g, m) in enumerate(zip(galaxias, modelos)):
+        if iniciais is not None:
+            f = iniciais[i]
+            chute = np.log(f["escalas"] if m is not None else [f["M_disk"], f["R_d"]])
+        else:
+            chute = np.log(m.escalas) if m is not None else _chute_inicial(g)
+        locais[i, :n_locais[i]] = chute
+
+    def avaliar(lp, kk):
+        v = np.empty(r.shape)
+        J = np.zeros(r.shape + (P + 1,))            # locais..., k
+        with np.errstate(invalid="ignore"):
+            if exponenciais.size:
+                ve, Je = modelo_e_jacobiano(r[exponenciais], lp[exponenciais, 0, None],
+                                            lp[exponenciais, 1, None], kk, n, rs)
+                v[exponenciais] = ve
+                J[exponenciais, :, :2] = Je[..., :2]
+                J[exponenciais, :, P] = Je[..., 2]
+            for i in com_modelo:
+                # Só os raios reais: perfis tabelados exigem uma grade crescente
+                c, m = n_locais[i], tamanhos[i]
+                v[i, m:] = 0.0
+                v[i, :m], Jm = modelo_massa_e_jacobiano(r[i, :m], modelos[i], lp[i, :c], kk, n, rs)
+                J[i, :m, :c] = Jm[:, :c]
+                J[i, :m, P] = Jm[:, c]
+        res = (v - v_obs) * peso
+        return res, J * peso[..., None]
+
+    eye = np.eye(P)
+    fixos = eye * ~livre[:, None, :]                # 1 na diagonal dos parâmetros que sobram
+
+    res, J = avaliar(locais, k)
+    chi2 = np.sum(res**2)
+    lam = 1e-3
+    convergiu = False
+    for _ in range(max_iter):
+        Jl, Jk = J[..., :P], J[..., P]
+        A = np.einsum("gri,grj->gij", Jl, Jl) + fixos      # (n_gal, P, P)
+        B = np.einsum("gri,gr->gi", Jl, Jk)                # (n_gal, P)
+        C = np.sum(Jk**2)
+        gl = np.einsum("gri,gr->gi", Jl, res)
+        gk = np.sum(Jk * res)
+
+        A_d = A + lam * (A * eye + 1e-12 * eye)
+        C_d = C * (1.0 + lam) + 1e-12
+        Ainv_B = np.linalg.solve(A_d, B[..., None])[..., 0]
+        Ainv_g = np.linalg.solve(A_d, gl[..., None])[..., 0]
+        S = C_d - np.sum(B * Ainv_B)
+        dk = -(gk - np.sum(B * Ainv_g)) / S
+        dl = -Ainv_g - Ainv_B * dk
+
+        cand = (locais + dl, k + dk)
+        res_c, J_c = avaliar(*cand)
+        chi2_c = np.sum(res_c**2)
+        if np.isfinite(chi2_c) and chi2_c < chi2:
+            melhora = chi2 - chi2_c
+            (locais, k), res, J, chi2 = cand, res_c, J_c, chi2_c
+            lam = max(lam / 10.0, 1e-12)
+            if melhora <= tol * max(chi2, 1.0):
+                convergiu = True
+                break
+        else:
+            lam *= 10.0
+            if lam > 1e12:
+                convergiu = True
+                break
+
+    # Erro de k pelo complemento de Schur sem amortecimento
+    Jl, Jk = J[..., :P], J[..., P]
+    A = np.einsum("gri,grj->gij", Jl, Jl) + fixos
+    B = np.einsum("gri,gr->gi", Jl, Jk)
+    S = np.sum(Jk**2) - np.sum(B * np.linalg.solve(A, B[..., None])[..., 0])
+    graus = max(int(np.count_nonzero(peso)) - int(n_locais.sum()) - 1, 1)
+    erro_k = float(np.sqrt(chi2 / graus / S)) if S > 0 else float("nan")
+
+    por_galaxia = []
+    for g, m, lp, c in zip(galaxias, modelos, locais, n_locais):
+        if m is None:
+            massa = {"M_disk": float(np.exp(lp[0])), "R_d": float(np.exp(lp[1]))}
+        else:
+            massa = {"escalas": np.exp(lp[:c]).tolist(), "R_d": float(m.R_d)}
+        por_galaxia.append({"nome": g.get("nome", ""), **massa})
+    return {
+        "k": float(k),
+        "erro_k": erro_k,
+        "chi2": float(chi2),
+        "chi2_red": float(chi2 / graus),
+        "convergiu": convergiu,
+        "galaxias": por_galaxia,
+    }
@@ -0,0 +1,124 @@
+"""
+TGU - Curvas de rotação galáctica sem matéria escura
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Todas as funções aceitam escalares ou arrays de raios. `curvas_rotacao_lote`
+avalia centenas de galáxias de uma vez como uma grade 2-D
+(galáxia × raio), sem laço Python por raio.
+
+`dtype` escolhe a precisão (np.float64 de referência ou np.float32, metade
+do tráfego de memória); os erros do modo float32 são medidos por
+`tgu.precision.validate`.
+"""
+
+import numpy as np
+
+from .core import K, N, coherence
+
+# ============================================================
+# CONSTANTES FÍSICAS
+# ============================================================
+G = 6.67430e-11          # Constante gravitacional (m^3 kg^-1 s^-2)
+M_SUN = 1.98847e30       # Massa solar (kg)
+KPC = 3.085677581e19     # kiloparsec em metros
+KM_S = 1000.0            # Conversão m/s → km/s
+
+# ============================================================
+# PARÂMETROS TGU (Matuchaki, 2025)
+# ============================================================
+K_TGU = K                # Parâmetro de eficiência de coerência (0.0881)
+N_COHERENCE = N          # Expoente harmônico (12)
+R_S_INFO = 0.0           # Em galáxias pode ser negligenciado (≈ 0)
+
+# ============================================================
+# MODELOS AUXILIARES
+# ============================================================
+
+def massa_disco_exponencial(r_kpc, M_disk, R_d, dtype=np.float64):
+    """
+    Massa cumulativa de um disco exponencial:
+    M(r) = M_disk * [1 - (1 + r/R_d) * exp(-r/R_d)]
+
+    r_kpc : raio (kpc)
+    M_disk : massa total do disco (em massas solares)
+    R_d : raio de escala do disco (kpc)
+    """
+    r_kpc, M_disk, R_d = (np.asarray(v, dtype=dtype) for v in (r_kpc, M_disk, R_d))
+    # 1 - (1 + x) e^-x = -expm1(-x) - x e^-x: sem o cancelamento de 1 - (...)
+    # em r << R_d, que em float32 custava ~1e-4 de erro relativo
+    x = r_kpc / R_d
+    return M_disk * (-np.expm1(-x) - x * np.exp(-x))
+
+
+def fator_coerencia(r_kpc, rs=R_S_INFO, n=N_COHERENCE, dtype=np.float64):
+    """
+    Fator de resistência harmônica ε(r)^(-n).
+    Para galáxias, o termo rs/r é desprezível.
+    """
+    return coherence(np.maximum(np.asarray(r_kpc, dtype=dtype), 1e-6), rs, n, dtype=dtype)
+
+
+def gradiente_coerencia(r_kpc, R_d, k=K_TGU, dtype=np.float64):
+    """
+    Modelo mínimo para o gradiente informacional:
+    I(r)/I0 = 1 + k * (r / R_d)
+
+    Esse termo substitui a necessidade de matéria escura.
+    """
+    return 1.0 + k * (np.asarray(r_kpc, dtype=dtype) / np.asarray(R_d, dtype=dtype))
+
+
+# ============================================================
+# VELOCIDADES ORBITAIS
+# ============================================================
+
+def velocidade_newtoniana(r_kpc, M_r, dtype=np.float64):
+    """
+    Velocidade circular newtoniana padrão.
+    """
+    r_m = np.asarray(r_kpc, dtype=dtype) * KPC
+    return np.sqrt(G * np.asarray(M_r, dtype=dtype) * M_SUN / r_m) / KM_S
+
+
+def velocidade_tgu(r_kpc, M_r, R_d, k=K_TGU, n=N_COHERENCE, rs=R_S_INFO, dtype=np.float64):
+    """
+    Velocidade orbital segundo a TGU (Equação 15).
+    """
+    v_newt = velocidade_newtoniana(r_kpc, M_r, dtype)
+    boost_info = np.sqrt(gradiente_coerencia(r_kpc, R_d, k, dtype))
+    coh_factor = np.sqrt(fator_coerencia(r_kpc, rs, n, dtype))
+
+    return v_newt * boost_info * coh_factor
+
+
+# ============================================================
+# AVALIAÇÃO EM LOTE (GALÁXIA × RAIO)
+# ============================================================
+
+def curvas_rotacao_lote(r_kpc, M_disk, R_d, k=K_TGU, n=N_COHERENCE, rs=R_S_INFO,
+                        dtype=np.float64):
+    """
+    Curvas de rotação Newton e TGU para várias galáxias de uma vez.
+
+    r_kpc : raios (n_r,) comuns a todas as galáxias, ou (n_gal, n_r)
+    M_disk : massas dos discos (n_gal,) em massas solares
+    R_d : raios de escala (n_gal,) em kpc
+
+    Retorna (M_r, v_newton, v_tgu), cada um com forma (n_gal, n_r).
+    """
+    r = np.atleast_1d(np.asarray(r_kpc, dtype=dtype))
+    M_disk = np.asarray(M_disk, dtype=dtype).reshape(-1, 1)
+    R_d = np.asarray(R_d, dtype=dtype).reshape(-1, 1)
+    if r.ndim == 1:
+        r = r[np.newaxis, :]
+
+    M_r = massa_disco_exponencial(r, M_disk, R_d, dtype)
+    v_newton = velocidade_newtoniana(r, M_r, dtype)
+
+    # v_tgu = v_newton * sqrt(I(r)/I0 * ε^-n), reaproveitando v_newton
+    v_tgu = gradiente_coerencia(r, R_d, k, dtype)
+    v_tgu *= fator_coerencia(r, rs, n, dtype)
+    np.sqrt(v_tgu, out=v_tgu)
+    v_tgu *= v_newton
+
+    return M_r, v_newton, v_tgu
@@ -0,0 +1,254 @@
+"""
+TGU - Campo de Coerência Informacional da Grande Muralha Hércules-Corona Borealis
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+`gerar_campo_informacional` é o modelo original (malha completa em memória).
+`gerar_campo_em_blocos` gera o mesmo campo e a magnitude do seu gradiente
+fatia por fatia ao longo do eixo 0, com uma linha de halo de cada lado,
+gravando direto em arrays memory-mapped (.npy). O pico de RAM fica em
+poucas fatias, o que permite malhas de 8192² (2-D) e 512³ (3-D).
+
+O ruído de cada plano do eixo 0 vem de um fluxo Philox próprio,
+semeado por (semente, realização, índice do plano): o resultado não depende
+do tamanho das fatias, um plano de halo reproduz exatamente o plano vizinho
+e `ensemble_campos` dá o mesmo resultado com qualquer número de processos.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import memoize
+from .instrument import stage
+
+# --- CONFIGURAÇÕES DA SIMULAÇÃO ---
+# Her-CrB GW: ~3000 Mpc de extensão, Redshift z ~ 2.0
+DISTANCIA_GPC = 3.0  # Giga-parsecs
+GRID_RES = 100       # Resolução da malha
+EXTENSAO = (-2.0, 2.0)
+
+AMPLITUDE_RUIDO = 0.1 * 0.1   # 0.1 * N(0, 0.1)
+LARGURA_FILAMENTO = 0.05
+BYTES_POR_BLOCO = 16 * 1024**2  # orçamento de uma fatia do eixo 0 (campo)
+LIMIAR_FILAMENTO = 0.5        # I acima disso conta como filamento
+
+
+# --- 1. MODELAGEM DO CAMPO INFORMACIONAL (I) ---
+def gerar_campo_informacional(x, y, rng=None, dtype=np.float64):
+    """
+    Simula uma 'Bacia de Coerência' filamentar.
+    Na TGU, a matéria se acumula onde a coerência informacional é maior.
+
+    rng : np.random.Generator semeado; None usa o estado global de np.random
+    dtype : np.float64 (referência) ou np.float32 (metade da memória)
+    """
+    x = np.asarray(x, dtype=dtype)
+    y = np.asarray(y, dtype=dtype)
+    # Criação de um filamento curvo (analogia à Grande Muralha)
+    # y = 0.2 * sin(2x) define a 'espinha dorsal' da estrutura
+    filament = np.exp(-(y - 0.2 * np.sin(2 * x))**2 / LARGURA_FILAMENTO)
+
+    # Ruído de fundo (coerência cósmica residual), sorteado em float64 para
+    # que as duas precisões vejam a mesma realização
+    normal = np.random.normal if rng is None else rng.normal
+    ruido = 0.1 * normal(0, 0.1, x.shape)
+
+    filament += ruido
+    return filament
+
+
+# --- 2. GERAÇÃO EM BLOCOS (OUT-OF-CORE) ---
+def _gerador_plano(semente, plano, realizacao=None):
+    """Fluxo aleatório independente para um plano do eixo 0."""
+    chave = (plano,) if realizacao is None else (realizacao, plano)
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(semente, spawn_key=chave)))
+
+
+def _coordenadas(forma, extensao, dtype):
+    """Eixos 1-D da malha, na ordem (z, y, x) em 3-D ou (y, x) em 2-D."""
+    return [np.linspace(extensao[0], extensao[1], n, dtype=dtype) for n in forma]
+
+
+def _fatia_campo(eixos, inicio, fim, semente, realizacao, dtype):
+    """
+    Campo I nas linhas [inicio, fim) do eixo 0. Em 3-D o filamento vira um
+    tubo em torno da curva y = 0.2 sin(2x) no plano z = 0.
+    """
+    x = eixos[-1]
+    espinha = (0.2 * np.sin(2 * x)).astype(dtype, copy=False)
+    if len(eixos) == 2:
+        y = eixos[0][inicio:fim]
+        campo = y[:, None] - espinha[None, :]
+        campo *= campo
+    else:
+        z = eixos[0][inicio:fim]
+        y = eixos[1]
+        campo = np.empty((fim - inicio, len(y), len(x)), dtype=dtype)
+        np.subtract(y[None, :, None], espinha[None, None, :], out=campo)
+        campo *= campo
+        campo += (z * z)[:, None, None]
+    campo *= dtype.type(-1.0 / LARGURA_FILAMENTO)
+    np.exp(campo, out=campo)
+
+    # O ruído é sempre sorteado em float64, para que os modos float32 e
+    # float64 vejam a mesma realização
+    ruido = np.empty(campo.shape[1:], dtype=np.float64)
+    with stage("hercrb.rng", campo.size):
+        for i, plano in enumerate(range(inicio, fim)):
+            _gerador_plano(semente, plano, realizacao).standard_normal(out=ruido)
+            ruido *= AMPLITUDE_RUIDO
+            campo[i] += ruido
+    return campo
+
+
+def _alocar(caminho, forma, dtype):
+    if caminho is None:
+        return np.empty(forma, dtype=dtype)
+    return np.lib.format.open_memmap(caminho, mode="w+", dtype=dtype, shape=forma)
+
+
+def linhas_por_bloco_padrao(forma, dtype=np.float64, orcamento=BYTES_POR_BLOCO):
+    """
+    Planos do eixo 0 por fatia para que uma fatia ocupe no máximo
+    `orcamento` bytes: max(1, orcamento // (prod(forma[1:]) * itemsize)).
+    Em 8192² float64 dá 256 linhas; em 512³, 8 planos.
+    """
+    plano = int(np.prod(forma[1:], dtype=np.int64)) * np.dtype(dtype).itemsize
+    return max(1, orcamento // max(plano, 1))
+
+
+def _iterar_blocos(forma, semente, realizacao, dtype, extensao, linhas_por_bloco=None):
+    """
+    Gera (inicio, fim, campo, magnitude) para cada fatia [inicio, fim) do
+    eixo 0, já sem as linhas de halo.
+    """
+    linhas_por_bloco = linhas_por_bloco or linhas_por_bloco_padrao(forma, dtype)
+    eixos = _coordenadas(forma, extensao, dtype)
+    n0 = forma[0]
+    for inicio in range(0, n0, linhas_por_bloco):
+        fim = min(inicio + linhas_por_bloco, n0)
+        # Uma linha de halo de cada lado (exceto nas bordas globais)
+        lo, hi = max(inicio - 1, 0), min(fim + 1, n0)
+        bloco = _fatia_campo(eixos, lo, hi, semente, realizacao, dtype)
+        miolo = slice(inicio - lo, inicio - lo + (fim - inicio))
+
+        with stage("hercrb.gradient", bloco.size):
+            soma = None
+            for eixo in range(len(forma)):
+                d = np.gradient(bloco, axis=eixo)[miolo]
+                if soma is None:
+                    soma = np.square(d, out=d)
+                else:
+                    d *= d
+                    soma += d
+            np.sqrt(soma, out=soma)
+        yield inicio, fim, bloco[miolo], soma
+
+
+def _validar_forma(forma):
+    forma = tuple(int(n) for n in forma)
+    if len(forma) not in (2, 3):
+        raise ValueError(f"forma deve ser 2-D ou 3-D, recebido {forma}")
+    return forma
+
+
+@memoize("hercrb.gerar_campo_em_blocos", ignore=("linhas_por_bloco",),
+         when=lambda a: a["saida_campo"] is None and a["saida_gradiente"] is None)
+def gerar_campo_em_blocos(forma, semente=0, dtype=np.float64, extensao=EXTENSAO,
+                          linhas_por_bloco=None,
+                          saida_campo=None, saida_gradiente=None, realizacao=None):
+    """
+    Gera o campo I e |∇I| bloco a bloco.
+
+    forma : (ny, nx) ou (nz, ny, nx)
+    dtype : np.float64 (referência) ou np.float32 (metade da memória)
+    linhas_por_bloco : planos do eixo 0 por fatia (None: `linhas_por_bloco_padrao`)
+    saida_campo / saida_gradiente : caminhos .npy para memory-map;
+        None mantém o resultado em memória.
+    realizacao : índice da realização num ensemble (None = campo único)
+
+    O gradiente usa diferenças centrais com espaçamento unitário, como
+    `np.gradient(campo_I)`, e diferenças laterais nas bordas globais.
+    Retorna (campo_I, magnitude_gradiente).
+    """
+    forma = _validar_forma(forma)
+    dtype = np.dtype(dtype)
+    campo_I = _alocar(saida_campo, forma, dtype)
+    magnitude = _alocar(saida_gradiente, forma, dtype)
+
+    for inicio, fim, campo, grad in _iterar_blocos(forma, semente, realizacao, dtype,
+                                                   extensao, linhas_por_bloco):
+        campo_I[inicio:fim] = campo
+        magnitude[inicio:fim] = grad
+
+    for saida in (campo_I, magnitude):
+        if isinstance(saida, np.memmap):
+            saida.flush()
+    return campo_I, magnitude
+
+
+# --- 3. ENSEMBLES DE MONTE CARLO ---
+@memoize("hercrb.estatisticas_realizacao", ignore=("linhas_por_bloco",))
+def estatisticas_realizacao(forma, semente, realizacao, dtype=np.float64,
+                            extensao=EXTENSAO, linhas_por_bloco=None):
+    """
+    Gradiente médio de uma realização, reduzido fatia a fatia (o campo
+    completo nunca é guardado). Retorna (gradiente_medio, gradiente_filamento):
+    a média de |∇I| na malha toda e nas células com I ≥ LIMIAR_FILAMENTO.
+    """
+    soma_total = 0.0
+    soma_filamento = 0.0
+    n_filamento = 0
+    n_total = 0
+    for _, _, campo, grad in _iterar_blocos(forma, semente, realizacao, np.dtype(dtype),
+                                            extensao, linhas_por_bloco):
+        mascara = campo >= LIMIAR_FILAMENTO
+        soma_total += float(np.sum(grad, dtype=np.float64))
+        soma_filamento += float(np.sum(grad[mascara], dtype=np.float64))
+        n_filamento += int(np.count_nonzero(mascara))
+        n_total += grad.size
+    filamento = soma_filamento / n_filamento if n_filamento else float("nan")
+    return soma_total / n_total, filamento
+
+
+def _estatisticas_tarefa(args):
+    # Sem cache por realização: só o ensemble inteiro é guardado
+    return estatisticas_realizacao.__wrapped__(*args)
+
+
+@memoize("hercrb.ensemble_campos", ignore=("processos", "linhas_por_bloco", "chunksize"))
+def ensemble_campos(n_realizacoes, forma=(GRID_RES, GRID_RES), semente=0,
+                    processos=None, dtype=np.float64, linhas_por_bloco=None,
+                    chunksize=1):
+    """
+    Gera `n_realizacoes` campos independentes num pool de processos e
+    reduz a média e a variância do gradiente médio à medida que chegam.
+
+    Cada realização j tem fluxos próprios (semente, j, plano) e a redução
+    (Welford) segue a ordem de j, então o resultado é bit a bit idêntico
+    para qualquer `processos` (processos=1 roda no processo atual).
+    """
+    forma = _validar_forma(forma)
+    tarefas = ((forma, semente, j, dtype, EXTENSAO, linhas_por_bloco)
+               for j in range(n_realizacoes))
+    nomes = ("gradiente_medio", "gradiente_filamento")
+    media = np.zeros(2)
+    m2 = np.zeros(2)
+
+    def reduzir(resultados):
+        for n, valores in enumerate(resultados, start=1):
+            delta = np.asarray(valores) - media
+            media[:] += delta / n
+            m2[:] += delta * (np.asarray(valores) - media)
+
+    if processos == 1:
+        reduzir(map(_estatisticas_tarefa, tarefas))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            reduzir(pool.map(_estatisticas_tarefa, tarefas, chunksize=chunksize))
+
+    variancia = m2 / (n_realizacoes - 1) if n_realizacoes > 1 else np.full(2, np.nan)
+    resultado = {"n_realizacoes": n_realizacoes, "forma": forma, "semente": semente}
+    for i, nome in enumerate(nomes):
+        resultado[nome] = {"media": float(media[i]), "variancia": float(variancia[i])}
+    return resultado
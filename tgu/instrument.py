@@ -0,0 +1,224 @@
+"""
+TGU MASTER - Opt-in profiling and stage-timing instrumentation
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+    from tgu import instrument
+    with instrument.session(track_allocations=True) as trace:
+        ...                                   # run the scripts / engine
+    instrument.export_trace("run.json")
+
+`enable()` swaps the hot functions listed in TARGETS for timing wrappers in
+every loaded tgu module (and __main__) that holds a reference to them, and
+`disable()` puts the originals back. While disabled nothing is wrapped (a
+wrapper still held somewhere, e.g. by a module imported mid-session, just
+calls through without recording), so the only residual cost is the
+`stage()` markers inside loops, which then return a shared no-op context.
+
+Per stage the trace keeps calls, elements (size of the largest array in the
+result, or else of the broadcast shape of the array arguments),
+total/min/max wall time and, with `track_allocations`, the tracemalloc peak
+above the entry level.
+"""
+
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+from functools import wraps
+
+import numpy as np
+
+TARGETS = (
+    ("tgu.core", "correction"),
+    ("tgu.core", "coherence"),
+    ("tgu.galaxy", "massa_disco_exponencial"),
+    ("tgu.galaxy", "fator_coerencia"),
+    ("tgu.galaxy", "velocidade_tgu"),
+    ("tgu.galaxy", "curvas_rotacao_lote"),
+    ("tgu.hercrb", "gerar_campo_informacional"),
+    ("tgu.hercrb", "gerar_campo_em_blocos"),
+    ("tgu.sgra", "calcular_precessao_sgr_a"),
+    ("tgu.render", "renderizar_precessao"),
+    ("tgu.render", "renderizar_curva_rotacao"),
+    ("tgu.render", "renderizar_hercrb"),
+)
+
+_enabled = False
+_track_allocations = False
+_started_tracemalloc = False
+_originals = {}        # (module, attr) -> original function
+_stats = {}
+_alloc_stack = []
+_NULL = contextlib.nullcontext()
+
+
+def _new_stats():
+    return {"calls": 0, "elements": 0, "total_s": 0.0, "min_s": float("inf"),
+            "max_s": 0.0, "peak_alloc_mb": 0.0}
+
+
+def _count_elements(args, kwargs, result):
+    if isinstance(result, np.ndarray):
+        return result.size
+    if isinstance(result, dict):
+        result = tuple(result.values())
+    if isinstance(result, (tuple, list)):
+        sizes = [v.size for v in result if isinstance(v, np.ndarray)]
+        if sizes:
+            return max(sizes)
+    shapes = [v.shape for v in (*args, *kwargs.values()) if isinstance(v, np.ndarray)]
+    if not shapes:
+        return 0
+    try:
+        return int(np.prod(np.broadcast_shapes(*shapes)))
+    except ValueError:
+        # Arguments that do not broadcast together (e.g. axes and a grid)
+        return max(int(np.prod(s)) for s in shapes)
+
+
+class _Stage:
+    """Timer (and optional allocation tracker) for one named stage."""
+
+    __slots__ = ("name", "elements", "t0", "base", "outer_peak", "inner_peak")
+
+    def __init__(self, name, elements=0):
+        self.name = name
+        self.elements = elements
+
+    def __enter__(self):
+        if _track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            self.base = current
+            self.outer_peak = peak
+            self.inner_peak = 0
+            tracemalloc.reset_peak()
+            _alloc_stack.append(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        st = _stats.get(self.name)
+        if st is None:
+            st = _stats[self.name] = _new_stats()
+        st["calls"] += 1
+        st["elements"] += self.elements
+        st["total_s"] += elapsed
+        st["min_s"] = min(st["min_s"], elapsed)
+        st["max_s"] = max(st["max_s"], elapsed)
+        if _track_allocations and _alloc_stack and _alloc_stack[-1] is self:
+            _alloc_stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], self.inner_peak)
+            st["peak_alloc_mb"] = max(st["peak_alloc_mb"], (peak - self.base) / 1e6)
+            # tracemalloc has a single peak counter: hand ours to the parent
+            if _alloc_stack:
+                parent = _alloc_stack[-1]
+                parent.inner_peak = max(parent.inner_peak, peak, self.outer_peak)
+        return False
+
+
+def stage(name, elements=0):
+    """Context manager timing a named stage; a no-op while disabled."""
+    if not _enabled:
+        return _NULL
+    return _Stage(name, elements)
+
+
+def _wrap(name, fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return fn(*args, **kwargs)
+        st = _Stage(name)
+        with st:
+            result = fn(*args, **kwargs)
+            st.elements = _count_elements(args, kwargs, result)
+        return result
+    wrapper.__wrapped_original__ = fn
+    return wrapper
+
+
+def enable(track_allocations=False, targets=TARGETS):
+    """Wraps the target functions everywhere they are referenced."""
+    global _enabled, _track_allocations, _started_tracemalloc
+    if _enabled:
+        return
+    import importlib
+
+    _track_allocations = track_allocations
+    if track_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+
+    for module_name, attr in targets:
+        module = importlib.import_module(module_name)
+        original = getattr(module, attr)
+        wrapper = _wrap(f"{module_name.rsplit('.', 1)[-1]}.{attr}", original)
+        # Rebind in every module that imported the function by name
+        holders = [m for n, m in list(sys.modules.items())
+                   if m is not None and (n == "tgu" or n.startswith("tgu.") or n == "__main__")]
+        for holder in holders:
+            for name, value in list(vars(holder).items()):
+                if value is original:
+                    _originals[(holder, name)] = original
+                    setattr(holder, name, wrapper)
+    _enabled = True
+
+
+def disable():
+    """Restores the original functions and stops allocation tracking."""
+    global _enabled, _started_tracemalloc
+    for (holder, name), original in _originals.items():
+        setattr(holder, name, original)
+    _originals.clear()
+    _alloc_stack.clear()
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Clears the collected statistics."""
+    _stats.clear()
+
+
+def report():
+    """Per-stage statistics, with mean time and throughput filled in."""
+    out = {}
+    for name, st in _stats.items():
+        row = dict(st)
+        row["mean_s"] = st["total_s"] / st["calls"] if st["calls"] else 0.0
+        row["elements_per_s"] = st["elements"] / st["total_s"] if st["total_s"] else 0.0
+        if row["min_s"] == float("inf"):
+            row["min_s"] = 0.0
+        out[name] = row
+    return out
+
+
+def export_trace(path, run=None):
+    """Writes the current report as a per-run JSON trace."""
+    trace = {
+        "run": run or time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "track_allocations": _track_allocations,
+        "stages": report(),
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(trace, fh, indent=2)
+    return trace
+
+
+@contextlib.contextmanager
+def session(track_allocations=False, targets=TARGETS):
+    """Enables instrumentation for a block and yields the live report dict."""
+    reset()
+    enable(track_allocations, targets)
+    try:
+        yield _stats
+    finally:
+        disable()
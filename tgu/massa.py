@@ -0,0 +1,185 @@
+"""
+TGU - Modelos de massa com vários componentes (disco, bojo, gás, perfis tabelados)
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Cada componente devolve a massa encerrada M(r) numa grade de raios:
+
+    DiscoExponencial   M(r) = M [1 - (1 + r/R_d) e^(-r/R_d)]
+    BojoHernquist      M(r) = M r² / (r + a)²
+    DiscoGas           disco exponencial de gás (HI × fator de hélio)
+    PerfilTabelado     Σ(r) arbitrário: M(r) = ∫ 2π r' Σ(r') dr', por uma
+                       única soma cumulativa (trapézios) sobre a grade
+    MassaTabelada      M(r) já integrada (ex. de outro código), interpolada
+
+`ModeloMassa` soma os componentes com razões massa-luz (escalas) e guarda
+por galáxia a tabela (componente × raio) de cada grade já vista. Avaliações
+repetidas de `velocidade_tgu` durante um ajuste — mesmas grades, escalas ou
+k diferentes — só recombinam as linhas da tabela, sem refazer a integração.
+
+    modelo = ModeloMassa(DiscoExponencial(5e10, 3.0), BojoHernquist(1e10, 0.5),
+                         DiscoGas(8e9, 6.0))
+    v = modelo.velocidade(r_kpc)
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from .galaxy import (
+    K_TGU,
+    N_COHERENCE,
+    R_S_INFO,
+    massa_disco_exponencial,
+    velocidade_newtoniana,
+    velocidade_tgu,
+)
+
+FATOR_HELIO = 1.33       # Massa de gás = 1.33 × M_HI (hélio primordial)
+TABELAS_POR_MODELO = 8   # Grades guardadas por galáxia (LRU)
+
+
+# ============================================================
+# COMPONENTES
+# ============================================================
+
+class DiscoExponencial:
+    """Disco estelar exponencial (massa total M em M☉, escala R_d em kpc)."""
+
+    def __init__(self, M, R_d):
+        self.M = M
+        self.R_d = R_d
+
+    def massa(self, r_kpc):
+        return massa_disco_exponencial(r_kpc, self.M, self.R_d)
+
+
+class DiscoGas(DiscoExponencial):
+    """Disco de gás exponencial; M_HI é multiplicado pelo fator de hélio."""
+
+    def __init__(self, M_HI, R_g, fator_helio=FATOR_HELIO):
+        super().__init__(M_HI * fator_helio, R_g)
+
+
+class BojoHernquist:
+    """Bojo esférico de Hernquist (massa total M em M☉, raio de escala a em kpc)."""
+
+    def __init__(self, M, a):
+        self.M = M
+        self.a = a
+
+    def massa(self, r_kpc):
+        r = np.asarray(r_kpc, dtype=np.float64)
+        return self.M * (r / (r + self.a)) ** 2
+
+
+class PerfilTabelado:
+    """
+    Densidade superficial tabelada Σ(r) (M☉/kpc²), ex. fotometria ou HI.
+
+    Σ é interpolado na grade de avaliação (constante antes do primeiro
+    ponto da tabela, nulo depois do último) e
+    M(r) = ∫_0^r 2π r' Σ(r') dr' sai de uma única soma cumulativa de
+    trapézios, começando em r = 0.
+    """
+
+    def __init__(self, r_kpc, sigma):
+        self.r = np.asarray(r_kpc, dtype=np.float64)
+        self.sigma = np.asarray(sigma, dtype=np.float64)
+        if self.r.shape != self.sigma.shape or self.r.ndim != 1:
+            raise ValueError("r_kpc e sigma devem ser vetores do mesmo tamanho")
+
+    def massa(self, r_kpc):
+        r = np.asarray(r_kpc, dtype=np.float64)
+        if r.ndim != 1 or np.any(np.diff(r) < 0):
+            raise ValueError("PerfilTabelado exige uma grade 1-D crescente")
+        integrando = np.interp(r, self.r, self.sigma, left=self.sigma[0], right=0.0)
+        integrando *= 2.0 * np.pi * r
+
+        # Trapézios [0, r0], [r0, r1], ...; em r = 0 o integrando é nulo
+        passos = np.empty_like(r)
+        passos[0] = 0.5 * r[0] * integrando[0]
+        np.add(integrando[1:], integrando[:-1], out=passos[1:])
+        passos[1:] *= 0.5 * np.diff(r)
+        return np.cumsum(passos, out=passos)
+
+
+class MassaTabelada:
+    """
+    Massa encerrada tabelada M(r) (M☉), interpolada linearmente em r a
+    partir de M(0) = 0 e constante depois do último ponto da tabela.
+    """
+
+    def __init__(self, r_kpc, M_r):
+        r = np.asarray(r_kpc, dtype=np.float64)
+        M = np.asarray(M_r, dtype=np.float64)
+        if r.shape != M.shape or r.ndim != 1 or np.any(np.diff(r) <= 0):
+            raise ValueError("r_kpc deve ser crescente e do mesmo tamanho de M_r")
+        self.r = np.concatenate([[0.0], r]) if r[0] > 0 else r
+        self.M = np.concatenate([[0.0], M]) if r[0] > 0 else M
+
+    def massa(self, r_kpc):
+        return np.interp(np.asarray(r_kpc, dtype=np.float64), self.r, self.M)
+
+
+# ============================================================
+# MODELO COMPOSTO
+# ============================================================
+
+class ModeloMassa:
+    """
+    Soma de componentes com escalas (razões massa-luz) por componente e
+    cache LRU das tabelas M(r) por grade de raios.
+
+    R_d : escala usada no gradiente informacional de `velocidade_tgu`;
+          por padrão, a do primeiro componente que tiver R_d.
+    """
+
+    def __init__(self, *componentes, escalas=None, R_d=None, max_tabelas=TABELAS_POR_MODELO):
+        if not componentes:
+            raise ValueError("ModeloMassa precisa de pelo menos um componente")
+        self.componentes = componentes
+        self.escalas = (np.ones(len(componentes)) if escalas is None
+                        else np.asarray(escalas, dtype=np.float64))
+        if R_d is None:
+            R_d = next((c.R_d for c in componentes if hasattr(c, "R_d")), None)
+            if R_d is None:
+                raise ValueError("informe R_d: nenhum componente de disco no modelo")
+        self.R_d = R_d
+        self.max_tabelas = max_tabelas
+        self._tabelas = OrderedDict()
+        self.integracoes = 0
+
+    def tabela(self, r_kpc):
+        """Massa encerrada de cada componente, forma (n_componentes,) + r.shape."""
+        r = np.asarray(r_kpc, dtype=np.float64)
+        chave = (r.shape, r.tobytes())
+        tab = self._tabelas.get(chave)
+        if tab is not None:
+            self._tabelas.move_to_end(chave)
+            return tab
+
+        tab = np.empty((len(self.componentes),) + r.shape)
+        for i, componente in enumerate(self.componentes):
+            tab[i] = componente.massa(r)
+        tab.setflags(write=False)
+        self.integracoes += 1
+
+        self._tabelas[chave] = tab
+        if len(self._tabelas) > self.max_tabelas:
+            self._tabelas.popitem(last=False)
+        return tab
+
+    def massa(self, r_kpc, escalas=None):
+        """M(r) total em M☉, Σ_i escala_i · M_i(r)."""
+        escalas = self.escalas if escalas is None else np.asarray(escalas, dtype=np.float64)
+        return np.tensordot(escalas, self.tabela(r_kpc), axes=1)
+
+    def velocidade_newtoniana(self, r_kpc, escalas=None):
+        return velocidade_newtoniana(r_kpc, self.massa(r_kpc, escalas))
+
+    def velocidade(self, r_kpc, k=K_TGU, n=N_COHERENCE, rs=R_S_INFO, escalas=None):
+        """Curva de rotação TGU com a massa encerrada do modelo completo."""
+        return velocidade_tgu(r_kpc, self.massa(r_kpc, escalas), self.R_d, k, n, rs)
+
+    def limpar_cache(self):
+        self._tabelas.clear()
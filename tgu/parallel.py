@@ -0,0 +1,317 @@
+"""
+TGU MASTER - Zero-copy shared-memory sharding across worker processes
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Input and output columns live in multiprocessing.shared_memory blocks.
+Workers attach to them by name for the duration of one slice and process
+that disjoint [start, stop) slice in place, writing through the `out=`
+buffers of the kernels, so nothing but the slice bounds is ever pickled.
+
+    with SharedExecutor(processes=8) as ex:
+        out = ex.correction(a, e)              # dict of NumPy arrays
+
+    # Fully zero-copy: fill shared inputs yourself, read outputs in place
+    with SharedExecutor(8) as ex, ex.allocate(n, ("a", "e")) as cols:
+        cols["a"][:] = ...; cols["e"][:] = ...
+        with ex.run("correction", cols) as res:
+            res["total_correction"].mean()
+
+`scaling_report` times a kernel at several worker counts and reports
+speed-up and parallel efficiency T1 / (p * Tp):
+
+    python -m tgu.parallel --kernel correction --size 20000000 --processes 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .core import K, N, OUTPUT_FIELDS, RS_INFORMATIONAL, correction
+from .sgra import calcular_precessao_sgr_a
+
+BLOCK = 65536              # rows per inner step (bounds kernel temporaries)
+TASKS_PER_WORKER = 4
+
+
+# ============================================================
+# SHARED COLUMNS
+# ============================================================
+
+class SharedColumns:
+    """Named 1-D columns backed by shared memory, owned by this process."""
+
+    def __init__(self, size, names, dtype=np.float64):
+        self.size = int(size)
+        self.dtype = np.dtype(dtype)
+        self._blocks = {}
+        self.arrays = {}
+        try:
+            for name in names:
+                shm = shared_memory.SharedMemory(create=True,
+                                                 size=max(self.size * self.dtype.itemsize, 1))
+                self._blocks[name] = shm
+                self.arrays[name] = np.ndarray(self.size, dtype=self.dtype, buffer=shm.buf)
+        except BaseException:
+            self.close()
+            raise
+
+    @classmethod
+    def from_arrays(cls, columns, dtype=np.float64):
+        """Copies ordinary arrays (broadcast to a common length) into shared memory."""
+        columns = {k: np.asarray(v, dtype=dtype) for k, v in columns.items()}
+        size = np.broadcast_shapes(*(v.shape for v in columns.values()))
+        shared = cls(int(np.prod(size)), columns, dtype)
+        for name, value in columns.items():
+            shared.arrays[name][:] = np.broadcast_to(value, size).ravel()
+        return shared
+
+    def specs(self):
+        """Picklable (shm name, dtype, size) per column."""
+        return {k: (shm.name, self.dtype.str, self.size) for k, shm in self._blocks.items()}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __iter__(self):
+        return iter(self.arrays)
+
+    def copy(self):
+        """Private copies of every column."""
+        return {k: v.copy() for k, v in self.arrays.items()}
+
+    def close(self):
+        self.arrays.clear()
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# ============================================================
+# WORKER SIDE
+# ============================================================
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers; pool workers share the parent's
+        # resource tracker, so this is a no-op there and the owner unlinks
+        return shared_memory.SharedMemory(name=name)
+
+
+def _views(specs, handles):
+    """Arrays over the named blocks; the opened handles go into `handles`."""
+    views = {}
+    for k, (name, dtype, size) in specs.items():
+        shm = _attach(name)
+        handles.append(shm)
+        views[k] = np.ndarray(size, dtype=dtype, buffer=shm.buf)
+    return views
+
+
+def _kernel_correction(inputs, outputs, params):
+    correction(inputs["a"], inputs["e"], out=tuple(outputs[f] for f in OUTPUT_FIELDS), **params)
+
+
+def _kernel_precession(inputs, outputs, params):
+    res = calcular_precessao_sgr_a(inputs["massa_msun"], inputs["a_au"], inputs["e"])
+    for name, column in outputs.items():
+        column[...] = res[name]
+
+
+KERNELS = {
+    "correction": (("a", "e"), OUTPUT_FIELDS, _kernel_correction),
+    "precession": (("massa_msun", "a_au", "e"),
+                   ("gr_arcmin", "tgu_arcmin", "alpha", "fator_coerencia", "desvio_percentual"),
+                   _kernel_precession),
+}
+
+
+def _run_rows(kernel, inputs, outputs, start, stop, params, block):
+    """Runs `kernel` over rows [start, stop) in steps of `block` rows."""
+    fn = KERNELS[kernel][2]
+    for lo in range(start, stop, block):
+        hi = min(lo + block, stop)
+        fn({k: v[lo:hi] for k, v in inputs.items()},
+           {k: v[lo:hi] for k, v in outputs.items()}, params)
+    return stop - start
+
+
+def _run_slice(args):
+    """
+    Worker entry point: attach to the shared columns, run one slice and
+    unmap them again, so no mapping outlives the run (the owner unlinks
+    the blocks on close and the OS only frees them once every map is gone).
+    """
+    kernel, in_specs, out_specs, start, stop, params, block = args
+    handles = []
+    try:
+        inputs = _views(in_specs, handles)
+        outputs = _views(out_specs, handles)
+        done = _run_rows(kernel, inputs, outputs, start, stop, params, block)
+        del inputs, outputs
+        return done
+    finally:
+        for shm in handles:
+            # A kernel error keeps views alive in its traceback; the handle
+            # is then closed by SharedMemory.__del__ once that is dropped
+            with contextlib.suppress(BufferError):
+                shm.close()
+
+
+# ============================================================
+# EXECUTOR
+# ============================================================
+
+class SharedExecutor:
+    """
+    Persistent worker pool over shared-memory columns. processes=1 runs in
+    the calling process (same slicing, no pool). Workers are started in
+    the constructor, so create the executor before allocating columns
+    that will be freed while it is alive.
+    """
+
+    def __init__(self, processes=None, block=BLOCK, tasks_per_worker=TASKS_PER_WORKER):
+        self.processes = processes or os.cpu_count() or 1
+        self.block = block
+        self.tasks_per_worker = tasks_per_worker
+        self._pool = None
+        if self.processes > 1:
+            # Workers must share this process's resource tracker (see
+            # _attach), and are started now: forked later, they would
+            # inherit (and pin until they exit) every block held by then
+            resource_tracker.ensure_running()
+            self._pool = ProcessPoolExecutor(self.processes)
+            self._pool.submit(int).result()
+
+    def allocate(self, size, names, dtype=np.float64):
+        return SharedColumns(size, names, dtype)
+
+    def _slices(self, size):
+        parts = max(min(self.processes * self.tasks_per_worker, -(-size // self.block)), 1)
+        bounds = np.linspace(0, size, parts + 1).astype(np.int64)
+        return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    def run(self, kernel, inputs, out=None, **params):
+        """
+        Runs `kernel` ("correction" or "precession") over SharedColumns
+        `inputs`, writing into `out` (SharedColumns with the kernel's
+        output names) or into a new SharedColumns, which is returned and
+        must be closed by the caller (or used as a context manager).
+        """
+        in_names, out_names, _ = KERNELS[kernel]
+        missing = [n for n in in_names if n not in inputs.arrays]
+        if missing:
+            raise KeyError(f"{kernel}: missing input column(s) {missing}")
+        outputs = SharedColumns(inputs.size, out_names, inputs.dtype) if out is None else out
+        try:
+            if self._pool is None:
+                in_cols = {n: inputs[n] for n in in_names}
+                for start, stop in self._slices(inputs.size):
+                    _run_rows(kernel, in_cols, outputs.arrays, start, stop, params, self.block)
+            else:
+                in_specs = {n: spec for n, spec in inputs.specs().items() if n in in_names}
+                tasks = [(kernel, in_specs, outputs.specs(), start, stop, params, self.block)
+                         for start, stop in self._slices(inputs.size)]
+                for _ in self._pool.map(_run_slice, tasks):
+                    pass
+        except BaseException:
+            if out is None:
+                outputs.close()
+            raise
+        return outputs
+
+    def _run_arrays(self, kernel, columns, params):
+        with SharedColumns.from_arrays(columns) as inputs, self.run(kernel, inputs, **params) as out:
+            return out.copy()
+
+    def correction(self, a, e, k=K, n=N, rs=RS_INFORMATIONAL):
+        """Parallel `tgu.core.correction`; returns {field: array}."""
+        return self._run_arrays("correction", {"a": a, "e": e}, {"k": k, "n": n, "rs": rs})
+
+    def precession(self, massa_msun, a_au, e):
+        """Parallel `calcular_precessao_sgr_a`; returns {quantity: array}."""
+        return self._run_arrays("precession", {"massa_msun": massa_msun, "a_au": a_au, "e": e}, {})
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# ============================================================
+# SCALING
+# ============================================================
+
+def _random_inputs(kernel, size, seed=0):
+    rng = np.random.default_rng(seed)
+    if kernel == "correction":
+        return {"a": rng.uniform(0.005, 50.0, size), "e": rng.uniform(0.0, 0.95, size)}
+    return {"massa_msun": rng.normal(4.1e6, 0.034e6, size),
+            "a_au": rng.normal(1031.0, 8.0, size),
+            "e": rng.uniform(0.0, 0.95, size)}
+
+
+def scaling_report(kernel="correction", size=10**7, processes=(1, 2, 4, 8), repeats=3,
+                   block=BLOCK, log=print):
+    """
+    Times `kernel` over `size` rows for each worker count (best of
+    `repeats`, pool start-up and input copy excluded). Returns one row per
+    count with seconds, rows/s, speed-up and efficiency T1 / (p * Tp).
+    """
+    rows = []
+    with SharedColumns.from_arrays(_random_inputs(kernel, size)) as inputs, \
+            SharedColumns(size, KERNELS[kernel][1]) as outputs:
+        base = None
+        for p in processes:
+            with SharedExecutor(p, block=block) as ex:
+                ex.run(kernel, inputs, out=outputs)     # warm up workers and attachments
+                best = float("inf")
+                for _ in range(repeats):
+                    t0 = time.perf_counter()
+                    ex.run(kernel, inputs, out=outputs)
+                    best = min(best, time.perf_counter() - t0)
+            base = best if base is None else base
+            row = {"processes": p, "seconds": best, "rows_per_s": size / best,
+                   "speedup": base / best, "efficiency": base / (best * p) * processes[0]}
+            rows.append(row)
+            if log:
+                log(f"{p:3d} workers: {best * 1e3:9.2f} ms | {row['rows_per_s']:11.4g} rows/s | "
+                    f"speed-up {row['speedup']:5.2f} | efficiency {row['efficiency']:6.1%}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TGU shared-memory scaling report")
+    parser.add_argument("--kernel", choices=sorted(KERNELS), default="correction")
+    parser.add_argument("--size", type=int, default=10**7)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--block", type=int, default=BLOCK)
+    args = parser.parse_args(argv)
+    scaling_report(args.kernel, args.size, tuple(args.processes), args.repeats, args.block)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
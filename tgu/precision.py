@@ -0,0 +1,216 @@
+"""
+TGU MASTER - float32 / float64 precision policy and validation harness
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Two modes are supported by every array path that takes a `dtype`:
+
+    float64   reference (default everywhere)
+    float32   fast mode: half the memory and bandwidth on large grids and
+              catalogs; constants stay Python floats, so nothing is
+              silently promoted back to float64
+
+Covered: core.correction / core.coherence (the epsilon**(-N) factor),
+galaxy.massa_disco_exponencial / velocidade_newtoniana / velocidade_tgu /
+curvas_rotacao_lote, hercrb.gerar_campo_informacional (+ np.gradient) and
+hercrb.gerar_campo_em_blocos. Random draws stay float64 in both modes, so
+the two see the same realization and differ by rounding only.
+
+`validate` runs each case in both modes and reports, per output, the
+maximum relative error of float32 against float64 plus the time and peak
+memory of each mode:
+
+    python -m tgu precision --size 1000000 --grid 1024
+    python -m tgu precision --max-rel 1e-4    # exit status 1 above the bound
+
+Relative errors are |x32 - x64| / max(|x64|, FLOOR * max|x64|), so values
+that cross zero (the noisy field I) do not divide by ~0; max_scaled_error
+(max |x32 - x64| / max|x64|) is the error relative to the output's range.
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+REFERENCE = "float64"
+FLOOR = 1e-6
+REPEATS = 3
+
+
+def resolve(precision):
+    """np.dtype for "float32" / "float64" (or a dtype-like of either)."""
+    if isinstance(precision, str) and precision in PRECISIONS:
+        return np.dtype(PRECISIONS[precision])
+    dtype = np.dtype(precision)
+    if dtype.name not in PRECISIONS:
+        raise ValueError(f"unsupported precision {precision!r} (use {', '.join(PRECISIONS)})")
+    return dtype
+
+
+# ============================================================
+# CASES
+# ============================================================
+# Each case maps (size, dtype) to (callable returning {output: array},
+# elements processed per call).
+
+def _case_correction(size, dtype):
+    from .core import correction
+    rng = np.random.default_rng(0)
+    # log-uniform a, down to a few rs, so epsilon**(-N) is far from 1
+    a = (10 ** rng.uniform(-1.5, 3.5, size)).astype(dtype)
+    e = rng.uniform(0.0, 0.95, size).astype(dtype)
+
+    def run():
+        alpha, coherence_factor, total = correction(a, e, dtype=dtype)
+        return {"alpha": alpha, "coherence_factor": coherence_factor, "total_correction": total}
+    return run, size
+
+
+def _case_galaxy(size, dtype):
+    from .galaxy import massa_disco_exponencial, velocidade_newtoniana, velocidade_tgu
+    r = np.linspace(0.2, 30.0, size).astype(dtype)
+
+    def run():
+        M_r = massa_disco_exponencial(r, 5.0e10, 3.0, dtype=dtype)
+        return {"M_r": M_r, "v_newton": velocidade_newtoniana(r, M_r, dtype),
+                "v_tgu": velocidade_tgu(r, M_r, 3.0, dtype=dtype)}
+    return run, size
+
+
+def _case_rotation_batch(size, dtype):
+    from .galaxy import curvas_rotacao_lote
+    rng = np.random.default_rng(0)
+    r = np.linspace(0.2, 30.0, 400).astype(dtype)
+    n_gal = max(size // r.size, 1)
+    M_disk = (10 ** rng.uniform(9.0, 11.5, n_gal)).astype(dtype)
+    R_d = rng.uniform(1.0, 6.0, n_gal).astype(dtype)
+
+    def run():
+        M_r, v_newton, v_tgu = curvas_rotacao_lote(r, M_disk, R_d, dtype=dtype)
+        return {"M_r": M_r, "v_newton": v_newton, "v_tgu": v_tgu}
+    return run, n_gal * r.size
+
+
+def _case_campo(grid, dtype):
+    from .hercrb import gerar_campo_informacional
+    eixo = np.linspace(-2, 2, grid)
+    X, Y = (v.astype(dtype) for v in np.meshgrid(eixo, eixo))
+
+    def run():
+        campo_I = gerar_campo_informacional(X, Y, rng=np.random.default_rng(0), dtype=dtype)
+        dy, dx = np.gradient(campo_I)
+        return {"I": campo_I, "grad_I": np.sqrt(dx * dx + dy * dy)}
+    return run, grid * grid
+
+
+def _case_campo_blocos(grid, dtype):
+    from .hercrb import gerar_campo_em_blocos
+
+    def run():
+        campo_I, grad = gerar_campo_em_blocos((grid, grid), 0, dtype)
+        return {"I": campo_I, "grad_I": grad}
+    return run, grid * grid
+
+
+CASES = {
+    "correction": (_case_correction, "size"),
+    "galaxy": (_case_galaxy, "size"),
+    "rotation_batch": (_case_rotation_batch, "size"),
+    "campo": (_case_campo, "grid"),
+    "campo_blocos": (_case_campo_blocos, "grid"),
+}
+
+
+# ============================================================
+# VALIDATION
+# ============================================================
+
+def error_stats(value, reference, floor=FLOOR):
+    """
+    Errors of `value` against `reference`: max_rel_error and
+    mean_rel_error of |value - reference| / max(|reference|, floor *
+    max|reference|), and max_scaled_error = max|value - reference| /
+    max|reference|.
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    diff = np.abs(np.asarray(value, dtype=np.float64) - reference)
+    scale = np.abs(reference)
+    top = scale.max(initial=0.0)
+    np.maximum(scale, floor * top, out=scale)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rel = np.where(scale > 0, diff / scale, np.where(diff > 0, np.inf, 0.0))
+    return {"max_rel_error": float(rel.max(initial=0.0)),
+            "mean_rel_error": float(rel.mean()) if rel.size else 0.0,
+            "max_scaled_error": float(diff.max(initial=0.0) / top) if top > 0 else 0.0}
+
+
+def validate(size=10**6, grid=512, only=None, repeats=REPEATS, floor=FLOOR, log=print):
+    """
+    Runs every case (or those in `only`) in float64 and float32. Returns
+    one row per output: case, output, the `error_stats` of float32
+    against float64, float32 epsilon and, per mode, median seconds and
+    peak traced MB. Inputs are generated in float64 and cast once per
+    mode outside the timed call, as a float32 pipeline would hold them.
+    The result cache is off while the cases run.
+    """
+    from .bench import measure
+    from .cache import disabled
+
+    rows = []
+    for name, (setup, kind) in CASES.items():
+        if only and name not in only:
+            continue
+        n = grid if kind == "grid" else size
+        results = {}
+        with disabled():
+            for precision in (REFERENCE, "float32"):
+                fn, elements = setup(n, resolve(precision))
+                timing = measure(fn, elements, repeats)
+                results[precision] = (fn(), timing)
+        (ref, t64), (fast, t32) = results[REFERENCE], results["float32"]
+        for output, reference in ref.items():
+            value = fast[output]
+            if value.dtype != np.float32:
+                raise TypeError(f"{name}.{output}: float32 mode returned {value.dtype}")
+            row = {"case": name, "output": output, **error_stats(value, reference, floor),
+                   "float32_eps": float(np.finfo(np.float32).eps),
+                   "seconds_float64": t64["latency_ms"]["p50"] / 1e3,
+                   "seconds_float32": t32["latency_ms"]["p50"] / 1e3,
+                   "peak_mb_float64": t64["peak_mb"],
+                   "peak_mb_float32": t32["peak_mb"]}
+            rows.append(row)
+            if log:
+                log(f"{name + '.' + output:<26} max rel {row['max_rel_error']:9.2e} | "
+                    f"max scaled {row['max_scaled_error']:9.2e} | "
+                    f"time {row['seconds_float32'] / row['seconds_float64']:5.2f}x | "
+                    f"peak {row['peak_mb_float32']:8.1f} / {row['peak_mb_float64']:8.1f} MB")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TGU float32 vs. float64 validation")
+    parser.add_argument("--size", type=int, default=10**6, help="elements of the 1-D cases")
+    parser.add_argument("--grid", type=int, default=512, help="cells per axis of the field cases")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), help="cases to run")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--max-rel", type=float, default=None,
+                        help="fail (exit status 1) if any output exceeds this relative error")
+    parser.add_argument("--json", metavar="PATH", help="also write the rows as JSON")
+    args = parser.parse_args(argv)
+
+    rows = validate(args.size, args.grid, args.only, args.repeats)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+    if args.max_rel is not None:
+        worst = [r for r in rows if not r["max_rel_error"] <= args.max_rel]
+        for r in worst:
+            print(f"ABOVE BOUND {r['case']}.{r['output']}: {r['max_rel_error']:.3g} > {args.max_rel:g}")
+        return 1 if worst else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
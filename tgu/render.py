@@ -0,0 +1,179 @@
+"""
+TGU - Estágio de renderização (headless)
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Separado do cálculo: matplotlib só é importado quando uma figura é pedida,
+sempre com o backend não interativo "Agg", e nenhuma função chama
+`plt.show()`. `renderizar_lote` distribui milhares de figuras por um pool
+de processos, cada processo importando matplotlib uma única vez.
+
+Uma tarefa de lote é um par (tipo, kwargs), com tipo em RENDERIZADORES.
+
+Com TGU_CACHE_DIR definido, cada figura é guardada no cache de resultados
+(tgu.cache) pela chave dos seus dados: se o PNG já existe com o mesmo
+conteúdo nada é refeito, e se só o arquivo sumiu ele é copiado do cache
+sem importar matplotlib.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+
+from .cache import default_cache, make_key
+
+CORES_PRECESSAO = ['gray', 'lightblue', 'darkblue']
+
+
+def _pyplot():
+    """Importa matplotlib.pyplot sob demanda com backend não interativo."""
+    if "matplotlib.pyplot" not in sys.modules:
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _com_cache(renderizador):
+    """Pula a renderização quando a figura com os mesmos dados já existe."""
+    @wraps(renderizador)
+    def wrapper(caminho, *args, **kwargs):
+        cache = default_cache()
+        if cache is None:
+            return renderizador(caminho, *args, **kwargs)
+
+        chave = make_key(f"render.{renderizador.__name__}", *args, **kwargs)
+        png = cache.get_bytes(chave)
+        if png is not None:
+            if os.path.exists(caminho):
+                with open(caminho, "rb") as fh:
+                    if fh.read() == png:
+                        return caminho
+            with open(caminho, "wb") as fh:
+                fh.write(png)
+            return caminho
+
+        renderizador(caminho, *args, **kwargs)
+        with open(caminho, "rb") as fh:
+            cache.put(chave, meta={"arquivo": os.path.basename(caminho)}, blob=fh.read())
+        return caminho
+    return wrapper
+
+
+# ============================================================
+# FIGURAS
+# ============================================================
+
+@_com_cache
+def renderizar_precessao(caminho, labels, valores, titulo, ylabel, referencia,
+                         rotulo_referencia, formato_valor=None, deslocamento=0.0,
+                         grade_alpha=0.7, fontsize_titulo=None, fontsize_ylabel=None,
+                         fontsize_valor=10):
+    """
+    Gráfico de barras comparativo RG vs. TGU (alpha) vs. TGU MASTER usado
+    pelos scripts de Mercúrio, Vênus, Terra, Marte e Ícaro.
+
+    formato_valor : ex. "{:.2f}" para escrever o valor acima de cada barra
+    """
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(labels, valores, color=CORES_PRECESSAO)
+    ax.set_title(titulo, fontsize=fontsize_titulo)
+    ax.set_ylabel(ylabel, fontsize=fontsize_ylabel)
+    ax.grid(axis='y', linestyle='--', alpha=grade_alpha)
+
+    if formato_valor is not None:
+        for bar in bars:
+            yval = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2.0, yval + deslocamento,
+                    formato_valor.format(yval), ha='center', va='bottom',
+                    fontsize=fontsize_valor)
+
+    # Linha de referência GR
+    ax.axhline(referencia, color='gray', linestyle='--', alpha=0.7, label=rotulo_referencia)
+
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(caminho)
+    plt.close(fig)
+    return caminho
+
+
+@_com_cache
+def renderizar_curva_rotacao(caminho, r_vals, v_newton, v_tgu, v_obs=None):
+    """Curva de rotação galáctica — TGU vs Newton."""
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    ax.plot(r_vals, v_newton, 'r--', label='Newton (matéria visível)')
+    ax.plot(r_vals, v_tgu, 'b-', linewidth=2, label='TGU (gradiente de coerência)')
+    if v_obs is not None:
+        ax.plot(r_vals, v_obs, 'k:', linewidth=2, label='Observado (mock)')
+
+    ax.set_xlabel('Raio galáctico (kpc)')
+    ax.set_ylabel('Velocidade circular (km/s)')
+    ax.set_title('Curva de Rotação Galáctica — TGU vs Newton')
+    ax.legend()
+    ax.grid(True)
+
+    fig.tight_layout()
+    fig.savefig(caminho)
+    plt.close(fig)
+    return caminho
+
+
+@_com_cache
+def renderizar_hercrb(caminho, x_range, y_range, campo_I, z_escala, tamanho_cdm, tamanho_tgu):
+    """Painéis do campo de coerência Her-CrB e da evolução das estruturas."""
+    plt = _pyplot()
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    # Gráfico do Campo de Coerência
+    cont = ax1.contourf(x_range, y_range, campo_I, cmap='inferno')
+    ax1.set_title('Campo de Coerência Informacional (I)\nSimulação Her-CrB GW')
+    fig.colorbar(cont, ax=ax1, label='Densidade de Coerência')
+
+    # Gráfico da Linha do Tempo
+    ax2.plot(z_escala, tamanho_cdm, 'r--', label='Modelo Padrão (ΛCDM)')
+    ax2.plot(z_escala, tamanho_tgu, 'b-', label='TGU (Coerência)')
+    ax2.axvline(x=2.0, color='k', linestyle=':', label='Her-CrB GW (z~2)')
+    ax2.invert_xaxis()  # Redshift maior = passado
+    ax2.set_title('Evolução do Tamanho das Estruturas')
+    ax2.set_xlabel('Redshift (z)')
+    ax2.set_ylabel('Escala da Estrutura (Normalizada)')
+    ax2.legend()
+    ax2.grid(True)
+
+    fig.tight_layout()
+    fig.savefig(caminho)
+    plt.close(fig)
+    return caminho
+
+
+RENDERIZADORES = {
+    "precessao": renderizar_precessao,
+    "curva_rotacao": renderizar_curva_rotacao,
+    "hercrb": renderizar_hercrb,
+}
+
+
+# ============================================================
+# LOTE
+# ============================================================
+
+def _renderizar_tarefa(tarefa):
+    tipo, kwargs = tarefa
+    return RENDERIZADORES[tipo](**kwargs)
+
+
+def renderizar_lote(tarefas, processos=None, chunksize=16):
+    """
+    Renderiza uma lista de tarefas (tipo, kwargs) num pool de processos
+    (processos=1 roda no processo atual). Retorna os caminhos gravados,
+    na ordem das tarefas.
+    """
+    tarefas = list(tarefas)
+    if processos == 1:
+        return [_renderizar_tarefa(t) for t in tarefas]
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        return list(pool.map(_renderizar_tarefa, tarefas, chunksize=chunksize))
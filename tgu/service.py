@@ -0,0 +1,345 @@
+"""
+TGU MASTER - Local prediction service with micro-batching
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Long-running asyncio HTTP/JSON server around the vectorized engine, so
+downstream tools pay the NumPy import once instead of once per query.
+
+    python -m tgu.service --port 8765 --window-ms 2
+
+    POST /correction  {"a": 0.387, "e": 0.2056, "gr": 42.98}
+                      -> alpha, coherence_factor, total_correction[, precession]
+    POST /sgra        {"massa_msun": 4.1e6, "a_au": 1031.0, "e": 0.8839}
+                      -> gr_arcmin, tgu_arcmin, alpha, fator_coerencia, desvio_percentual
+    POST /velocity    {"r_kpc": [2, 8, 20], "M_disk": 5e10, "R_d": 3.0}
+                      -> M_r, v_newton, v_tgu
+    GET  /stats       latency p50/p99, throughput, batch sizes
+    GET  /health
+
+Fields may be scalars or lists (broadcast against each other); a request
+with only scalars gets scalars back. Responses are strict JSON: a
+non-finite result (e.g. e >= 1) is returned as null, and NaN / Infinity
+literals in a request are rejected with 400. Requests arriving within the latency
+window of the first pending one (or until `max_batch` objects are queued)
+are concatenated into one column per field, computed in a single
+vectorized call and split back per request. The parameters k, n and rs are
+per-object columns too, so requests with different parameters share a
+batch.
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import time
+
+import numpy as np
+
+from .core import K, N, RS_INFORMATIONAL, correction
+from .galaxy import K_TGU, N_COHERENCE, massa_disco_exponencial, velocidade_newtoniana, velocidade_tgu
+from .sgra import calcular_precessao_sgr_a
+
+HOST = "127.0.0.1"
+PORT = 8765
+WINDOW_MS = 2.0
+MAX_BATCH = 65536
+LATENCY_SAMPLES = 10000
+MAX_BODY = 64 * 1024**2
+
+
+# ============================================================
+# ENDPOINTS
+# ============================================================
+
+def _correction(a, e, k, n, rs, gr):
+    alpha, coherence_factor, total = correction(a, e, k=k, n=n, rs=rs)
+    return {"alpha": alpha, "coherence_factor": coherence_factor,
+            "total_correction": total, "precession": gr * total}
+
+
+def _velocity(r_kpc, M_disk, R_d, k, n):
+    M_r = massa_disco_exponencial(r_kpc, M_disk, R_d)
+    return {"M_r": M_r, "v_newton": velocidade_newtoniana(r_kpc, M_r),
+            "v_tgu": velocidade_tgu(r_kpc, M_r, R_d, k=k, n=n)}
+
+
+class Endpoint:
+    """
+    One batched computation: required fields, optional fields with
+    defaults, and outputs that are only returned when a given input was
+    sent (`conditional`: output -> input).
+    """
+
+    def __init__(self, fn, required, optional=None, conditional=None):
+        self.fn = fn
+        self.required = tuple(required)
+        self.optional = dict(optional or {})
+        self.conditional = dict(conditional or {})
+
+    def columns(self, payload):
+        """Validates a JSON payload into flat float64 columns of equal length."""
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        missing = [f for f in self.required if f not in payload]
+        if missing:
+            raise ValueError(f"missing field(s): {', '.join(missing)}")
+        unknown = set(payload) - set(self.required) - set(self.optional)
+        if unknown:
+            raise ValueError(f"unknown field(s): {', '.join(sorted(unknown))}")
+
+        values = {f: np.asarray(payload.get(f, self.optional.get(f)), dtype=np.float64)
+                  for f in self.required + tuple(self.optional)}
+        shape = np.broadcast_shapes(*(v.shape for v in values.values()))
+        if len(shape) > 1:
+            raise ValueError("fields must be scalars or flat lists")
+        scalar = shape == ()
+        cols = {f: np.broadcast_to(v, shape).reshape(-1) for f, v in values.items()}
+        return cols, scalar, {f for f in self.optional if f in payload}
+
+    def response(self, result, scalar, sent):
+        out = {}
+        for name, value in result.items():
+            needs = self.conditional.get(name)
+            if needs is not None and needs not in sent:
+                continue
+            # Non-finite values have no JSON encoding: send null
+            value = np.where(np.isfinite(value), value.astype(object), None)
+            out[name] = value[0] if scalar else value.tolist()
+        return out
+
+
+def _reject_constant(name):
+    raise ValueError(f"{name} is not a valid JSON number")
+
+
+ENDPOINTS = {
+    "/correction": Endpoint(_correction, ("a", "e"),
+                            {"k": K, "n": N, "rs": RS_INFORMATIONAL, "gr": np.nan},
+                            {"precession": "gr"}),
+    "/sgra": Endpoint(calcular_precessao_sgr_a, ("massa_msun", "a_au", "e")),
+    "/velocity": Endpoint(_velocity, ("r_kpc", "M_disk", "R_d"), {"k": K_TGU, "n": N_COHERENCE}),
+}
+
+
+# ============================================================
+# MICRO-BATCHING
+# ============================================================
+
+class MicroBatcher:
+    """Coalesces concurrent submissions into one vectorized call."""
+
+    def __init__(self, fn, window_s, max_batch, stats):
+        self.fn = fn
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.stats = stats
+        self._pending = []
+        self._queued = 0
+        self._timer = None
+
+    async def submit(self, columns):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        size = len(next(iter(columns.values())))
+        self._pending.append((columns, size, future))
+        self._queued += size
+        if self._queued >= self.max_batch or self.window_s <= 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._queued = self._pending, [], 0
+        if not pending:
+            return
+
+        try:
+            names = pending[0][0].keys()
+            batch = {f: np.concatenate([cols[f] for cols, _, _ in pending]) for f in names}
+            result = self.fn(**batch)
+        except Exception as exc:            # one bad batch fails its own requests only
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.stats.batch(len(pending), sum(size for _, size, _ in pending))
+        start = 0
+        for _, size, future in pending:
+            if not future.done():
+                future.set_result({k: np.asarray(v)[start:start + size] for k, v in result.items()})
+            start += size
+
+
+class ServiceStats:
+    """Request latency percentiles and throughput since start."""
+
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.started = time.perf_counter()
+        self.latencies = collections.deque(maxlen=samples)
+        self.requests = 0
+        self.errors = 0
+        self.objects = 0
+        self.batches = 0
+        self.batched_requests = 0
+
+    def request(self, latency_s, ok=True):
+        self.requests += 1
+        self.errors += not ok
+        self.latencies.append(latency_s)
+
+    def batch(self, n_requests, n_objects):
+        self.batches += 1
+        self.batched_requests += n_requests
+        self.objects += n_objects
+
+    def report(self):
+        uptime = time.perf_counter() - self.started
+        lat = np.array(self.latencies) * 1e3
+        p50, p99 = np.percentile(lat, (50, 99)) if lat.size else (0.0, 0.0)
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "objects": self.objects,
+            "mean_batch_requests": self.batched_requests / self.batches if self.batches else 0.0,
+            "latency_ms": {"p50": float(p50), "p99": float(p99), "samples": int(lat.size)},
+            "requests_per_s": self.requests / uptime if uptime else 0.0,
+            "objects_per_s": self.objects / uptime if uptime else 0.0,
+        }
+
+
+# ============================================================
+# HTTP
+# ============================================================
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class PredictionService:
+    """HTTP/1.1 JSON front end; one MicroBatcher per endpoint."""
+
+    def __init__(self, window_ms=WINDOW_MS, max_batch=MAX_BATCH):
+        self.stats = ServiceStats()
+        self.batchers = {path: MicroBatcher(ep.fn, window_ms / 1e3, max_batch, self.stats)
+                         for path, ep in ENDPOINTS.items()}
+
+    async def handle(self, method, path, body):
+        """Returns (status, JSON-serializable body)."""
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.stats.report()
+        endpoint = ENDPOINTS.get(path)
+        if endpoint is None:
+            return 404, {"error": f"unknown endpoint {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        t0 = time.perf_counter()
+        try:
+            columns, scalar, sent = endpoint.columns(
+                json.loads(body or b"{}", parse_constant=_reject_constant))
+        except (ValueError, TypeError) as exc:
+            self.stats.request(time.perf_counter() - t0, ok=False)
+            return 400, {"error": str(exc)}
+        try:
+            result = await self.batchers[path].submit(columns)
+        except Exception as exc:
+            self.stats.request(time.perf_counter() - t0, ok=False)
+            return 500, {"error": str(exc)}
+        self.stats.request(time.perf_counter() - t0)
+        return 200, endpoint.response(result, scalar, sent)
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    # Without a usable length the body cannot be framed: close
+                    await self._send(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+                if length > MAX_BODY:
+                    await self._send(writer, 413, {"error": "body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.handle(method, target.split("?", 1)[0], body)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, status, payload, keep_alive):
+        data = json.dumps(payload, allow_nan=False).encode()
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def start(self, host=HOST, port=PORT):
+        """Starts listening; returns the asyncio server."""
+        return await asyncio.start_server(self._connection, host, port)
+
+
+async def serve(host=HOST, port=PORT, window_ms=WINDOW_MS, max_batch=MAX_BATCH):
+    service = PredictionService(window_ms, max_batch)
+    server = await service.start(host, port)
+    addr = server.sockets[0].getsockname()
+    print(f"TGU service on http://{addr[0]}:{addr[1]} "
+          f"(window {window_ms} ms, max batch {max_batch})", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TGU local prediction service")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--window-ms", type=float, default=WINDOW_MS,
+                        help="how long the first request of a batch waits for others")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH,
+                        help="objects that trigger an immediate flush")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.window_ms, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
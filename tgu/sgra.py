@@ -0,0 +1,221 @@
+"""
+TGU - Precessão orbital em torno de Sagitário A* (RG vs. TGU)
+Author: Henry Matuchaki (@MatuchakiSilva)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import memoize
+from .core import C, K, N, RS_INFORMATIONAL, coherence, gr_precession
+
+# --- CONSTANTES FÍSICAS ---
+c = C                    # Velocidade da luz (m/s)
+RAD_TO_ARCMIN = (180/np.pi) * 60  # Conversão de radianos para minutos de arco
+
+# --- PARÂMETROS TGU (MATUCHAKI, 2025) ---
+K_MATUCHAKI = K                # Parâmetro de eficiência de coerência
+N_COHERENCE = N                # Expoente de resistência harmônica
+RS_INFO = RS_INFORMATIONAL     # Raio informacional (em AU)
+
+
+def calcular_precessao_sgr_a(massa_msun, a_au, e):
+    """
+    Calcula a precessão orbital comparando Relatividade Geral (RG) e TGU.
+    """
+    # 1. Cálculo da Precessão de Schwarzschild (Relatividade Geral)
+    # Delta_Phi = (6 * pi * G * M) / (c^2 * a * (1 - e^2)), ver tgu.core
+    phi_gr_rad = gr_precession(massa_msun, a_au, e)
+
+    # 2. Aplicação do Framework MASTER TGU
+    # Fator Alpha: Correção por assimetria/excentricidade
+    alpha = 1.0 + K_MATUCHAKI * (e / a_au)
+
+    # Fator de Resistência de Coerência (Atenuação em campos fortes/próximos)
+    # epsilon = 1 + (rs/r)^2, avaliado como exp(-n * log1p((rs/r)^2))
+    fator_coerencia = coherence(a_au, RS_INFO, N_COHERENCE)
+
+    # Resultado TGU
+    phi_tgu_rad = phi_gr_rad * alpha * fator_coerencia
+
+    return {
+        "gr_arcmin": phi_gr_rad * RAD_TO_ARCMIN,
+        "tgu_arcmin": phi_tgu_rad * RAD_TO_ARCMIN,
+        "alpha": alpha,
+        "fator_coerencia": fator_coerencia,
+        "desvio_percentual": ((phi_tgu_rad / phi_gr_rad) - 1) * 100
+    }
+
+
+# --- AGLOMERADO DE ESTRELAS S ---
+# Elementos aproximados (Gillessen et al. 2017, R0 ≈ 8.3 kpc); S2 segue o
+# valor usado em TGU_Sagitário_A.py. Incertezas 1σ.
+MASSA_SGR_A = 4.1e6          # massas solares
+SIGMA_MASSA_SGR_A = 0.034e6
+
+ESTRELAS_S = [
+    {"nome": "S2", "a_au": 1031.0, "e": 0.8839, "sigma_a_au": 8.0, "sigma_e": 0.0019},
+    {"nome": "S38", "a_au": 1178.0, "e": 0.8201, "sigma_a_au": 12.0, "sigma_e": 0.0064},
+    {"nome": "S55", "a_au": 897.0, "e": 0.7209, "sigma_a_au": 14.0, "sigma_e": 0.0077},
+]
+
+QUANTIDADES = ("gr_arcmin", "tgu_arcmin", "desvio_percentual")
+PERCENTIS = (2.5, 16.0, 50.0, 84.0, 97.5)
+TAMANHO_LOTE = 1_000_000
+BLOCO_AMOSTRAS = 1 << 16     # amostras por fluxo aleatório e por parcela da redução
+BINS = 1 << 14
+
+
+@memoize("sgra.precessao_aglomerado")
+def precessao_aglomerado(estrelas, massa_msun=MASSA_SGR_A):
+    """
+    Precessão RG e TGU de um aglomerado inteiro numa única passagem
+    vetorizada. `estrelas` segue o formato de ESTRELAS_S; devolve o mesmo
+    dict de `calcular_precessao_sgr_a`, com um array por chave.
+    """
+    a_au = np.array([s["a_au"] for s in estrelas], dtype=np.float64)
+    e = np.array([s["e"] for s in estrelas], dtype=np.float64)
+    return calcular_precessao_sgr_a(np.float64(massa_msun), a_au, e)
+
+
+# --- MONTE CARLO EM LOTES ---
+def _amostrar(parametros, semente, bloco, tamanho):
+    """Sorteia (massa, a, e) do bloco `bloco` com um fluxo próprio."""
+    massa, a_au, e, sigma_massa, sigma_a, sigma_e = parametros
+    rng = np.random.Generator(np.random.Philox(np.random.SeedSequence(semente, spawn_key=(bloco,))))
+    m = rng.normal(massa, sigma_massa, tamanho)
+    a = rng.normal(a_au, sigma_a, tamanho)
+    ex = rng.normal(e, sigma_e, tamanho)
+    # Órbita ligada: 0 ≤ e < 1
+    np.clip(ex, 0.0, np.nextafter(1.0, 0.0), out=ex)
+    return m, a, ex
+
+
+def _lote_monte_carlo(args):
+    """
+    Um lote de blocos de amostras → histogramas fixos somados + (n, média,
+    M2) por bloco e quantidade. As amostras são descartadas aqui; só os
+    resumos voltam ao processo pai.
+    """
+    parametros, semente, blocos, n_amostras, faixas, bins = args
+    contagens = np.zeros((len(QUANTIDADES), bins + 2), dtype=np.int64)
+    tamanhos = []
+    momentos = np.zeros((len(blocos), len(QUANTIDADES), 2))
+    for j, bloco in enumerate(blocos):
+        tamanho = min(BLOCO_AMOSTRAS, n_amostras - bloco * BLOCO_AMOSTRAS)
+        res = calcular_precessao_sgr_a(*_amostrar(parametros, semente, bloco, tamanho))
+        for i, q in enumerate(QUANTIDADES):
+            v = res[q]
+            lo, hi = faixas[i]
+            # bin 0 = abaixo da faixa, bin bins+1 = acima
+            idx = np.floor((v - lo) * (bins / (hi - lo))).astype(np.int64)
+            np.clip(idx + 1, 0, bins + 1, out=idx)
+            contagens[i] += np.bincount(idx, minlength=bins + 2)
+            momentos[j, i] = v.mean(), np.sum((v - v.mean())**2)
+        tamanhos.append(tamanho)
+    return tamanhos, contagens, momentos
+
+
+def _faixas_piloto(parametros, semente, tamanho=65536):
+    """Faixa de cada histograma a partir de um lote piloto determinístico."""
+    res = calcular_precessao_sgr_a(*_amostrar(parametros, (semente, 1), 0, tamanho))
+    faixas = []
+    for q in QUANTIDADES:
+        lo, hi = float(res[q].min()), float(res[q].max())
+        margem = 0.5 * (hi - lo) + 1e-12 * max(abs(lo), abs(hi), 1.0)
+        faixas.append((lo - margem, hi + margem))
+    return np.array(faixas)
+
+
+def _percentis_histograma(contagens, faixa, percentis):
+    """Percentis por interpolação linear dentro do bin do histograma."""
+    bins = len(contagens) - 2
+    lo, hi = faixa
+    largura = (hi - lo) / bins
+    acumulado = np.cumsum(contagens)
+    total = acumulado[-1]
+    saida = []
+    for p in percentis:
+        alvo = p / 100.0 * total
+        k = int(np.searchsorted(acumulado, alvo))
+        if k == 0:
+            saida.append(lo)
+            continue
+        if k == bins + 1:
+            saida.append(hi)
+            continue
+        antes = acumulado[k - 1]
+        fracao = (alvo - antes) / contagens[k] if contagens[k] else 0.0
+        saida.append(float(lo + (k - 1 + fracao) * largura))
+    return saida
+
+
+@memoize("sgra.monte_carlo_precessao", ignore=("processos",))
+def monte_carlo_precessao(massa_msun, a_au, e, sigma_massa, sigma_a_au, sigma_e,
+                          n_amostras=10_000_000, tamanho_lote=TAMANHO_LOTE, semente=0,
+                          processos=None, percentis=PERCENTIS, bins=BINS):
+    """
+    Propaga as incertezas de (massa, a, e) para a precessão RG/TGU por
+    Monte Carlo, em lotes de `tamanho_lote` amostras distribuídos por um pool
+    de processos (processos=1 roda no processo atual).
+
+    As amostras são sorteadas em blocos de BLOCO_AMOSTRAS, cada um com um
+    fluxo próprio, e a memória fica limitada a um bloco por processo. Cada
+    bloco vira um histograma de `bins` posições e um (n, média, M2),
+    reduzidos em ordem de bloco; o lote (arredondado para blocos inteiros)
+    só agrupa blocos por tarefa. O resultado é idêntico para qualquer
+    `processos` e `tamanho_lote`, e os percentis têm resolução de
+    (faixa / bins).
+
+    Retorna {quantidade: {"media", "desvio_padrao", "percentis", "fora_da_faixa"}}.
+    """
+    parametros = (massa_msun, a_au, e, sigma_massa, sigma_a_au, sigma_e)
+    faixas = _faixas_piloto(parametros, semente)
+    n_blocos = -(-n_amostras // BLOCO_AMOSTRAS)
+    por_lote = max(tamanho_lote // BLOCO_AMOSTRAS, 1)
+    tarefas = ((parametros, semente, range(j, min(j + por_lote, n_blocos)), n_amostras, faixas, bins)
+               for j in range(0, n_blocos, por_lote))
+
+    contagens = np.zeros((len(QUANTIDADES), bins + 2), dtype=np.int64)
+    n_total = 0
+    media = np.zeros(len(QUANTIDADES))
+    m2 = np.zeros(len(QUANTIDADES))
+
+    def reduzir(resultados):
+        nonlocal n_total, media, m2
+        for tamanhos, cont, momentos in resultados:
+            contagens[:] += cont
+            for n, mom in zip(tamanhos, momentos):
+                # Combinação de Chan et al. para (n, média, M2)
+                delta = mom[:, 0] - media
+                novo = n_total + n
+                media = media + delta * (n / novo)
+                m2 = m2 + mom[:, 1] + delta**2 * (n_total * n / novo)
+                n_total = novo
+
+    if processos == 1:
+        reduzir(map(_lote_monte_carlo, tarefas))
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            reduzir(pool.map(_lote_monte_carlo, tarefas))
+
+    resumo = {"n_amostras": n_total}
+    for i, q in enumerate(QUANTIDADES):
+        resumo[q] = {
+            "media": float(media[i]),
+            "desvio_padrao": float(np.sqrt(m2[i] / max(n_total - 1, 1))),
+            "percentis": dict(zip(percentis, _percentis_histograma(contagens[i], faixas[i], percentis))),
+            "fora_da_faixa": int(contagens[i, 0] + contagens[i, -1]),
+        }
+    return resumo
+
+
+def monte_carlo_aglomerado(estrelas=ESTRELAS_S, massa_msun=MASSA_SGR_A,
+                           sigma_massa=SIGMA_MASSA_SGR_A, **kwargs):
+    """`monte_carlo_precessao` para cada estrela do aglomerado, por nome."""
+    return {
+        s["nome"]: monte_carlo_precessao(massa_msun, s["a_au"], s["e"], sigma_massa,
+                                         s["sigma_a_au"], s["sigma_e"], **kwargs)
+        for s in estrelas
+    }
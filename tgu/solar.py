@@ -0,0 +1,86 @@
+"""
+TGU MASTER - Table-driven solar-system precession run
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Computes, for any number of bodies in one vectorized pass:
+
+    gr  = gr_precession(M, a, e) * (100 / P) * ARCSEC_PER_RAD   (arcsec/century)
+    tgu = gr * alpha * coherence_factor
+
+with the orbital period from Kepler's third law, P = sqrt(a^3 / M) years
+(a in AU, M in solar masses). The GR baseline is the same Schwarzschild
+formula `calcular_precessao_sgr_a` applies to S2, so nothing is entered
+by hand. NEO and asteroid lists are streamed with the tgu.catalog readers.
+"""
+
+import numpy as np
+
+from .cache import memoize
+from .catalog import DEFAULT_CHUNK_SIZE, iter_catalog
+from .core import K, N, RS_INFORMATIONAL, correction, gr_precession
+
+ARCSEC_PER_RAD = 180.0 / np.pi * 3600.0
+
+# Elements used by the TGU_Prediction_*.py scripts
+BODIES = {
+    "mercury": {"a": 0.387, "e": 0.206},
+    "venus": {"a": 0.723, "e": 0.0068},
+    "earth": {"a": 1.000, "e": 0.0167},
+    "mars": {"a": 1.523679, "e": 0.0934},
+    "icarus": {"a": 1.077, "e": 0.827},
+}
+
+FIELDS = ("period_yr", "gr", "alpha", "coherence_factor", "total_correction", "tgu", "delta")
+
+
+def orbital_period(a_au, mass_msun=1.0):
+    """Kepler's third law, P = sqrt(a^3 / M) in years."""
+    a_au = np.asarray(a_au, dtype=np.float64)
+    return np.sqrt(a_au**3 / mass_msun)
+
+
+def gr_precession_century(a_au, e, mass_msun=1.0):
+    """Schwarzschild perihelion advance in arcsec per century."""
+    a_au = np.asarray(a_au, dtype=np.float64)
+    gr = gr_precession(mass_msun, a_au, np.asarray(e, dtype=np.float64))
+    gr *= (100.0 * ARCSEC_PER_RAD) / orbital_period(a_au, mass_msun)
+    return gr
+
+
+@memoize("solar.precession_table")
+def precession_table(a_au, e, mass_msun=1.0, k=K, n=N, rs=RS_INFORMATIONAL):
+    """
+    GR baseline and TGU-corrected precession (arcsec/century) for arrays of
+    bodies. Returns {field: array} for every name in FIELDS.
+    """
+    a_au = np.asarray(a_au, dtype=np.float64)
+    e = np.asarray(e, dtype=np.float64)
+    gr = gr_precession_century(a_au, e, mass_msun)
+    alpha, coherence_factor, total = correction(a_au, e, k=k, n=n, rs=rs)
+    tgu = gr * total
+    return {"period_yr": orbital_period(a_au, mass_msun), "gr": gr, "alpha": alpha,
+            "coherence_factor": coherence_factor, "total_correction": total,
+            "tgu": tgu, "delta": tgu - gr}
+
+
+def solar_system(names=None, bodies=BODIES, **kwargs):
+    """Runs `precession_table` over named bodies (default: all of BODIES)."""
+    names = list(bodies) if names is None else [name.lower() for name in names]
+    unknown = [name for name in names if name not in bodies]
+    if unknown:
+        raise KeyError(f"unknown body: {', '.join(unknown)} (known: {', '.join(bodies)})")
+    a = np.array([bodies[name]["a"] for name in names])
+    e = np.array([bodies[name]["e"] for name in names])
+    return dict(name=np.array(names), a=a, e=e, **precession_table(a, e, **kwargs))
+
+
+def precession_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, mass_msun=1.0, **reader_kwargs):
+    """
+    Streams a catalog (see tgu.catalog.iter_catalog) and yields, per chunk,
+    the chunk columns merged with its `precession_table`.
+    """
+    for chunk in iter_catalog(path, chunk_size=chunk_size, **reader_kwargs):
+        table = {"name": chunk["name"]} if "name" in chunk else {}
+        table.update(a=chunk["a"], e=chunk["e"])
+        table.update(precession_table(chunk["a"], chunk["e"], mass_msun))
+        yield table
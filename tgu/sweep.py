@@ -0,0 +1,184 @@
+"""
+TGU MASTER - Parameter sweep over (K, N, RS_INFORMATIONAL)
+Author: Henry Matuchaki (@MatuchakiSilva)
+
+Evaluates the total correction for every body under every combination of
+the Matuchaki parameter k, the harmonic exponent n and the coherence
+radius rs as one (body x k x n x rs) tensor:
+
+    total[b, k, n, r] = (1 + k * e_b/a_b) * exp(-n * log1p((rs_r / a_b)^2))
+
+The partial terms are cached: e/a depends only on the body, alpha only on
+(body, k) and the log1p term only on (body, rs), so the coherence factor
+(body x n x rs) never depends on k. The final broadcast product is written
+chunk by chunk along the largest axis, and `extend` recomputes only the
+slice added to one axis. Every term lives in a buffer whose capacity
+doubles along the axis being extended, so a series of extensions copies
+each element O(1) times on average instead of re-concatenating the whole
+tensor; the attributes are views of the filled part. With TGU_CACHE_DIR
+set, the partial terms and the tensor of a sweep already computed are read
+back memory-mapped.
+"""
+
+import numpy as np
+
+from .cache import default_cache, make_key
+from .core import K, N, RS_INFORMATIONAL
+
+AXES = ("body", "k", "n", "rs")
+TERMS = ("e_a", "alpha", "log_eps", "coherence", "total")
+CHUNK_ELEMENTS = 1 << 22
+
+# Axes of every stored array
+FIELDS = {
+    "a": ("body",), "e": ("body",), "e_a": ("body",),
+    "k": ("k",), "n": ("n",), "rs": ("rs",),
+    "alpha": ("body", "k"),
+    "log_eps": ("body", "rs"),
+    "coherence": ("body", "n", "rs"),
+    "total": ("body", "k", "n", "rs"),
+}
+
+
+def _column(values):
+    return np.atleast_1d(np.asarray(values, dtype=np.float64))
+
+
+def _filled(name):
+    """Property: view of the filled part of a growable buffer."""
+    def get(self):
+        return self._buffers[name][tuple(slice(0, self._sizes[d]) for d in FIELDS[name])]
+    return property(get, doc=f"{name} {FIELDS[name]}")
+
+
+class Sweep:
+    """
+    Sweep tensor with cached partial terms.
+
+    a, e : orbital elements of the bodies (AU)
+    k_values, n_values, rs_values : parameter grids (default: MASTER values)
+    """
+
+    a, e, e_a, k, n, rs = (_filled(name) for name in ("a", "e", "e_a", "k", "n", "rs"))
+    alpha, log_eps, coherence, total = (_filled(name) for name in TERMS[1:])
+
+    def __init__(self, a, e, k_values=(K,), n_values=(N,), rs_values=(RS_INFORMATIONAL,),
+                 chunk_elements=CHUNK_ELEMENTS):
+        a = _column(a)
+        b = {"a": a, "e": np.broadcast_to(_column(e), a.shape).copy(),
+             "k": _column(k_values), "n": _column(n_values), "rs": _column(rs_values)}
+        self._buffers = b
+        self._sizes = {"body": a.size, "k": b["k"].size, "n": b["n"].size, "rs": b["rs"].size}
+        self.chunk_elements = chunk_elements
+
+        cache = default_cache()
+        key = make_key("sweep.Sweep", b["a"], b["e"], b["k"], b["n"], b["rs"]) if cache else None
+        hit = cache.get(key) if cache else None
+        if hit is not None:
+            # Read-only memmaps: the first extension of an axis copies them out
+            b.update((name, hit[0][name]) for name in TERMS)
+            return
+
+        b["e_a"] = b["e"] / a                                   # (body,)
+        b["alpha"] = self._alpha(b["e_a"], b["k"])              # (body, k)
+        b["log_eps"] = self._log_eps(a, b["rs"])                # (body, rs)
+        b["coherence"] = self._coherence(b["n"], b["log_eps"])  # (body, n, rs)
+        b["total"] = self._product(b["alpha"], b["coherence"])  # (body, k, n, rs)
+        if cache:
+            cache.put(key, {name: b[name] for name in TERMS}, {"namespace": "sweep.Sweep"})
+
+    @property
+    def shape(self):
+        return self.total.shape
+
+    # --- partial terms ---
+    @staticmethod
+    def _alpha(e_a, k):
+        return 1.0 + np.multiply.outer(e_a, k)
+
+    @staticmethod
+    def _log_eps(a, rs):
+        x = np.divide.outer(1.0, a)[:, None] * rs[None, :]
+        np.square(x, out=x)
+        return np.log1p(x, out=x)
+
+    @staticmethod
+    def _coherence(n, log_eps):
+        c = log_eps[:, None, :] * -n[None, :, None]
+        return np.exp(c, out=c)
+
+    def _product(self, alpha, coherence):
+        """alpha (B, K) x coherence (B, N, R), chunked along the largest axis."""
+        shape = (alpha.shape[0], alpha.shape[1], coherence.shape[1], coherence.shape[2])
+        out = np.empty(shape)
+        axis = int(np.argmax(shape))
+        per_slice = max(int(np.prod(shape)) // max(shape[axis], 1), 1)
+        step = max(self.chunk_elements // per_slice, 1)
+        for start in range(0, shape[axis], step):
+            sl = slice(start, start + step)
+            a_part = alpha[sl] if axis == 0 else alpha[:, sl] if axis == 1 else alpha
+            c_part = (coherence[sl] if axis == 0 else coherence[:, sl] if axis == 2
+                      else coherence[:, :, sl] if axis == 3 else coherence)
+            index = [slice(None)] * 4
+            index[axis] = sl
+            np.multiply(a_part[:, :, None, None], c_part[:, None, :, :], out=out[tuple(index)])
+        return out
+
+    # --- incremental extension ---
+    def _append(self, name, axis, block):
+        """Writes `block` after the filled part of `name` along `axis`, growing x2 if full."""
+        dims = FIELDS[name]
+        i = dims.index(axis)
+        buf = self._buffers[name]
+        used = [self._sizes[d] for d in dims]
+        need = used[i] + block.shape[i]
+        if need > buf.shape[i] or not buf.flags.writeable:
+            shape = list(buf.shape)
+            shape[i] = max(need, 2 * buf.shape[i])
+            grown = np.empty(shape)
+            filled = tuple(slice(0, u) for u in used)
+            grown[filled] = buf[filled]
+            self._buffers[name] = buf = grown
+        index = [slice(0, u) for u in used]
+        index[i] = slice(used[i], need)
+        buf[tuple(index)] = block
+
+    def extend(self, axis, values, e=None):
+        """
+        Appends new points to one axis ("body", "k", "n" or "rs") and
+        computes only the new slice of the tensor. For "body", `values`
+        are the new semi-major axes and `e` their eccentricities.
+        """
+        if axis not in AXES:
+            raise ValueError(f"axis must be one of {AXES}, got {axis!r}")
+        values = _column(values)
+
+        if axis == "body":
+            e_new = np.broadcast_to(_column(e), values.shape)
+            e_a = e_new / values
+            alpha = self._alpha(e_a, self.k)
+            log_eps = self._log_eps(values, self.rs)
+            coherence = self._coherence(self.n, log_eps)
+            new = {"a": values, "e": e_new, "e_a": e_a, "alpha": alpha, "log_eps": log_eps,
+                   "coherence": coherence, "total": self._product(alpha, coherence)}
+        elif axis == "k":
+            alpha = self._alpha(self.e_a, values)
+            new = {"k": values, "alpha": alpha, "total": self._product(alpha, self.coherence)}
+        elif axis == "n":
+            coherence = self._coherence(values, self.log_eps)
+            new = {"n": values, "coherence": coherence,
+                   "total": self._product(self.alpha, coherence)}
+        else:
+            log_eps = self._log_eps(self.a, values)
+            coherence = self._coherence(self.n, log_eps)
+            new = {"rs": values, "log_eps": log_eps, "coherence": coherence,
+                   "total": self._product(self.alpha, coherence)}
+
+        for name, block in new.items():
+            self._append(name, axis, block)
+        self._sizes[axis] += values.size
+        return self
+
+    def precession(self, gr_precession):
+        """Corrected precession tensor for per-body GR baselines."""
+        return _column(gr_precession)[:, None, None, None] * self.total